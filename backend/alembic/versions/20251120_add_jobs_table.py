@@ -0,0 +1,52 @@
+"""add jobs table keyed on a content hash
+
+Revision ID: 20251120_add_jobs_table
+Revises: 20251110_fix_metrics
+Create Date: 2025-11-20 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20251120_add_jobs_table"
+down_revision: str | None = "20251110_fix_metrics"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("source", sa.String(length=100), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("company", sa.String(length=255), nullable=False),
+        sa.Column("location", sa.String(length=255), nullable=True),
+        sa.Column("salary_low", sa.Float(), nullable=True),
+        sa.Column("salary_high", sa.Float(), nullable=True),
+        sa.Column("currency", sa.String(length=8), nullable=True),
+        sa.Column("job_type", sa.String(length=50), nullable=True),
+        sa.Column("experience_level", sa.String(length=50), nullable=True),
+        sa.Column("industry", sa.String(length=100), nullable=True),
+        sa.Column("education_level", sa.String(length=100), nullable=True),
+        sa.Column("work_mode", sa.String(length=50), nullable=True),
+        sa.Column("posted_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("apply_url", sa.String(length=1024), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("alternate_sources", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.UniqueConstraint("content_hash", name="uq_jobs_content_hash"),
+    )
+    op.create_index(op.f("ix_jobs_source"), "jobs", ["source"], unique=False)
+    op.create_index(op.f("ix_jobs_posted_date"), "jobs", ["posted_date"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_jobs_posted_date"), table_name="jobs")
+    op.drop_index(op.f("ix_jobs_source"), table_name="jobs")
+    op.drop_table("jobs")
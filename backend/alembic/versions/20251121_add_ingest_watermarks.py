@@ -0,0 +1,30 @@
+"""add per-source ingest watermarks
+
+Revision ID: 20251121_add_ingest_watermarks
+Revises: 20251120_add_jobs_table
+Create Date: 2025-11-21 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20251121_add_ingest_watermarks"
+down_revision: str | None = "20251120_add_jobs_table"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingest_watermarks",
+        sa.Column("source", sa.String(length=100), primary_key=True),
+        sa.Column("last_posted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ingest_watermarks")
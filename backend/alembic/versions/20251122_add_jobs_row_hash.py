@@ -0,0 +1,28 @@
+"""add row hash to jobs
+
+Revision ID: 20251122_add_jobs_row_hash
+Revises: 20251121_add_ingest_watermarks
+Create Date: 2025-11-22 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20251122_add_jobs_row_hash"
+down_revision: str | None = "20251121_add_ingest_watermarks"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing rows keep a NULL hash until ingest next rewrites them.
+    op.add_column("jobs", sa.Column("row_hash", sa.String(length=64), nullable=True))
+    op.create_index(op.f("ix_jobs_row_hash"), "jobs", ["row_hash"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_jobs_row_hash"), table_name="jobs")
+    op.drop_column("jobs", "row_hash")
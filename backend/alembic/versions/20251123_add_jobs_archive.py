@@ -0,0 +1,55 @@
+"""add jobs archive table
+
+Revision ID: 20251123_add_jobs_archive
+Revises: 20251122_add_jobs_row_hash
+Create Date: 2025-11-23 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20251123_add_jobs_archive"
+down_revision: str | None = "20251122_add_jobs_row_hash"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs_archive",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("row_hash", sa.String(length=64), nullable=True),
+        sa.Column("source", sa.String(length=100), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("company", sa.String(length=255), nullable=False),
+        sa.Column("location", sa.String(length=255), nullable=True),
+        sa.Column("salary_low", sa.Float(), nullable=True),
+        sa.Column("salary_high", sa.Float(), nullable=True),
+        sa.Column("currency", sa.String(length=8), nullable=True),
+        sa.Column("job_type", sa.String(length=50), nullable=True),
+        sa.Column("experience_level", sa.String(length=50), nullable=True),
+        sa.Column("industry", sa.String(length=100), nullable=True),
+        sa.Column("education_level", sa.String(length=100), nullable=True),
+        sa.Column("work_mode", sa.String(length=50), nullable=True),
+        sa.Column("posted_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("apply_url", sa.String(length=1024), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("alternate_sources", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archive_reason", sa.String(length=20), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index(op.f("ix_jobs_archive_content_hash"), "jobs_archive", ["content_hash"], unique=False)
+    op.create_index(op.f("ix_jobs_archive_archived_at"), "jobs_archive", ["archived_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_jobs_archive_archived_at"), table_name="jobs_archive")
+    op.drop_index(op.f("ix_jobs_archive_content_hash"), table_name="jobs_archive")
+    op.drop_table("jobs_archive")
@@ -1,10 +1,13 @@
 # backend/app/api/deps.py
 from __future__ import annotations
 
+import secrets
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from ..core.config import settings
 from ..core.db import get_db
 from ..core.security import InvalidTokenError, decode_token
 from ..models import User
@@ -40,3 +43,11 @@ def get_current_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
     return user
+
+
+def require_ingest_token(credentials: HTTPAuthorizationCredentials | None = Depends(http_bearer)) -> None:
+    """Machine-to-machine auth for ingest: a bearer token equal to INGEST_API_TOKEN."""
+    if not settings.INGEST_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Bulk ingest is disabled")
+    if credentials is None or not secrets.compare_digest(credentials.credentials, settings.INGEST_API_TOKEN):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid ingest token")
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import APIRouter, Depends
 from redis.asyncio import Redis
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from ..core.cache import get_redis
+from ..services.ingest.scheduler import ingest_status
 from .deps import require_db
 
 router = APIRouter(tags=["Health"])
@@ -20,7 +23,7 @@ async def healthz() -> dict[str, bool]:
 async def readyz(
     db: Session = Depends(require_db),
     redis: Redis = Depends(get_redis),
-) -> dict[str, bool]:
+) -> dict[str, Any]:
     db.execute(text("SELECT 1"))
     await redis.ping()
-    return {"ok": True}
+    return {"ok": True, "ingest": await ingest_status(redis)}
@@ -2,88 +2,410 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict, Iterable
+import base64
+import bisect
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from sqlalchemy.orm import Session, sessionmaker
 
-from ..api.deps import get_current_user, require_db
+from ..api.deps import get_current_user, require_db, require_ingest_token
+from ..core.cache import get_redis
+from ..core.config import settings
 from ..celery_app import celery_app
-from ..models import Application, ApplicationStatus, User
+from ..models import User
 from ..schemas import (
+    BulkIngestLineOut,
+    BulkIngestResponse,
+    JobIngestIn,
     JobAutomationRequest,
     JobAutomationResponse,
     JobFilters,
     JobOut,
+    JobRecommendationOut,
+    JobSearchResponse,
+    JobSourceOut,
     JobState,
+    RecommendationRequest,
+    SkillMatchOut,
+    SourceStatusOut,
+    SuggestionOut,
 )
 from ..services.adapters import ADAPTERS
 from ..services.automation.runner import AutomationPlatform, queue_job_automation
+from ..services.ingest.dedupe import job_deduplicator
+from ..services.ingest.lifecycle import max_age_cutoff
+from ..services.ingest.pipeline import Chunk, ingest_chunks
+from ..services.ingest.store import posted_at
+from ..services.keywords import extract_keywords
+from ..services.resume_parser import parse_resume_text
+from ..services.search import job_index, job_key
+from ..services.search.adapter_cache import AdapterResultCache
+from ..services.search.autocomplete import SUGGESTION_KINDS
+from ..services.search.fanout import SourceReport, SourceStatus, request_deadline
+from ..services.search.ranking import rank_jobs
+from ..services.search.recommend import recommend_jobs
+from ..services.search.state_map import normalize_key, user_state_cache
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+STREAM_CHUNK_SIZE = 100
+MAX_SUGGESTIONS = 20
 
-def _normalize_key(title: str | None, company: str | None) -> str:
-    return f"{(title or '').strip().lower()}::{(company or '').strip().lower()}"
 
+def _to_job_out(data: Dict[str, Any], *, fallback_id: str, state_map: Dict[str, JobState]) -> JobOut:
+    source = data.get("source")
+    identifier = data.get("id") or data.get("apply_url") or fallback_id
+    key = normalize_key(data.get("title"), data.get("company"))
+    return JobOut(
+        id=str(identifier),
+        title=data.get("title") or "Untitled role",
+        company=data.get("company") or "Unknown company",
+        location=data.get("location"),
+        salary_low=data.get("salary_low"),
+        salary_high=data.get("salary_high"),
+        currency=data.get("currency"),
+        job_type=data.get("job_type"),
+        experience_level=data.get("experience_level"),
+        industry=data.get("industry"),
+        education_level=data.get("education_level"),
+        work_mode=data.get("work_mode"),
+        posted_date=data.get("posted_date"),
+        apply_url=data.get("apply_url"),
+        description=data.get("description"),
+        source=source,
+        state=state_map.get(key, JobState.recommended),
+        alternate_sources=[JobSourceOut(**alt) for alt in data.get("alternate_sources") or ()],
+    )
+
+
+async def _iter_adapter_batches(
+    cache: AdapterResultCache,
+    query: str,
+    location: str,
+    reports: list[SourceReport] | None = None,
+) -> AsyncIterator[list[int]]:
+    """Index each adapter's postings as soon as it answers and yield their doc ids."""
+    deadline = request_deadline()
+    tasks = [
+        asyncio.ensure_future(cache.fetch(adapter, query=query, location=location, deadline=deadline))
+        for adapter in ADAPTERS
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            items, report = await next_done
+            if reports is not None:
+                reports.append(report)
+            postings = [{**item, "source": item.get("source") or report.source} for item in items]
+            yield job_index.upsert_many(job_deduplicator.collapse(postings))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _index_is_fed() -> bool:
+    """Whether ingest keeps the index filled. Until it does, each search fans out to the
+    adapters with its own query, so the postings a first search indexed do not shadow the rest.
+    """
+    return settings.INGEST_SCHEDULER_ENABLED and bool(job_index)
+
+
+async def _index_from_adapters(cache: AdapterResultCache, query: str, location: str) -> list[SourceReport]:
+    """Fan out to every adapter once and index what they return."""
+    reports: list[SourceReport] = []
+    async for _ in _iter_adapter_batches(cache, query, location, reports):
+        pass
+    return reports
+
+
+def _encode_cursor(doc_id: int, score: float) -> str:
+    # Document ids change on re-index and compaction; the posting's key does not.
+    data = job_index.get(doc_id) or {}
+    raw = json.dumps({"after": job_key(data), "score": score}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str | None) -> tuple[float, str] | None:
+    """Return the ranking position ``(-score, job_key)`` the cursor points at."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        after, score = payload["after"], float(payload["score"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if not isinstance(after, str):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return -score, after
+
+
+def _page_start(ranked: list[tuple[int, float]], position: tuple[float, str] | None) -> int:
+    if position is None:
+        return 0
+    neg_score, key = position
+    first_indexed = job_index.order_column()
+    # A posting removed since the cursor was issued has no order left: resume at its
+    # score, repeating postings tied with it rather than skipping any.
+    after = job_index.order_of(key)
+    return bisect.bisect_right(
+        [(-score, first_indexed[doc_id]) for doc_id, score in ranked], (neg_score, -1 if after is None else after)
+    )
+
+
+def _wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _job_for_doc(doc_id: int, state_map: Dict[str, JobState], score: float | None = None) -> JobOut | None:
+    data = job_index.get(doc_id)
+    if data is None:
+        return None
+    job = _to_job_out(data, fallback_id=f"{data.get('source')}-{doc_id}", state_map=state_map)
+    job.score = score
+    return job
+
+
+def _rank(filters: JobFilters, doc_ids: list[int], user: User) -> list[tuple[int, float]]:
+    return rank_jobs(job_index, doc_ids, query=filters.q, skills=user.resume_skills)
+
+
+async def _stream_jobs(
+    cache: AdapterResultCache,
+    filters: JobFilters,
+    user: User,
+    state_map: Dict[str, JobState],
+    position: tuple[float, str] | None,
+    limit: int | None,
+) -> AsyncIterator[str]:
+    query_filters = filters.model_dump(exclude={"q"}, exclude_none=True)
+
+    if not _index_is_fed() and (position is not None or limit is not None):
+        # A resumed or limited stream needs the full ranking to find its place or hand out
+        # the next cursor: fan out first, then rank.
+        await _index_from_adapters(cache, filters.q or "", filters.location or "Dubai")
+    elif not _index_is_fed():
+        # Emit each adapter's matches as soon as that adapter answers.
+        # A duplicate folded into an already emitted posting is not sent again.
+        emitted: set[int] = set()
+        async for doc_ids in _iter_adapter_batches(cache, filters.q or "", filters.location or "Dubai"):
+            matched = set(job_index.query(filters.q, query_filters).ids)
+            lines = []
+            for doc_id in doc_ids:
+                if doc_id in emitted:
+                    continue
+                job = _job_for_doc(doc_id, state_map) if doc_id in matched else None
+                if job is not None:
+                    emitted.add(doc_id)
+                    lines.append(job.model_dump_json() + "\n")
+            if lines:
+                yield "".join(lines)
+        return
+
+    ranked = _rank(filters, job_index.query(filters.q, query_filters).ids, user)
+    remaining = limit if limit is not None else float("inf")
+    for offset in range(_page_start(ranked, position), len(ranked), STREAM_CHUNK_SIZE):
+        lines = []
+        for index, (doc_id, score) in enumerate(ranked[offset : offset + STREAM_CHUNK_SIZE], start=offset):
+            job = _job_for_doc(doc_id, state_map, score)
+            if job is None:
+                continue
+            lines.append(job.model_dump_json() + "\n")
+            remaining -= 1
+            if remaining <= 0:
+                # A stream cut short by ``limit`` ends with the cursor to resume from.
+                if index + 1 < len(ranked):
+                    lines.append(json.dumps({"next_cursor": _encode_cursor(doc_id, score)}) + "\n")
+                break
+        if lines:
+            yield "".join(lines)
+        if remaining <= 0:
+            return
 
-@router.post("/search", response_model=list[JobOut])
+
+@router.post(
+    "/search",
+    response_model=JobSearchResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
 async def search_jobs(
     filters: JobFilters,
+    request: Request,
+    limit: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(require_db),
+    redis: Redis = Depends(get_redis),
+):
+    state_map = user_state_cache.get(db, current_user.id)
+    position = _decode_cursor(cursor)
+    cache = AdapterResultCache(redis)
+
+    if _wants_ndjson(request):
+        return StreamingResponse(
+            _stream_jobs(cache, filters, current_user, state_map, position, limit),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    reports: list[SourceReport] = []
+    if not _index_is_fed():
+        reports = await _index_from_adapters(cache, filters.q or "", filters.location or "Dubai")
+
+    result = job_index.query(filters.q, filters.model_dump(exclude={"q"}, exclude_none=True))
+    ranked = _rank(filters, result.ids, current_user)
+    page_size = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    start = _page_start(ranked, position)
+    page = ranked[start : start + page_size]
+
+    jobs = [job for job in (_job_for_doc(doc_id, state_map, score) for doc_id, score in page) if job is not None]
+    next_cursor = None
+    if page and start + page_size < len(ranked):
+        next_cursor = _encode_cursor(*page[-1])
+
+    return JobSearchResponse(
+        items=jobs,
+        total=result.total,
+        facets=result.facets,
+        next_cursor=next_cursor,
+        partial=any(report.status != SourceStatus.ok for report in reports),
+        sources=[SourceStatusOut.model_validate(report) for report in reports],
+    )
+
+
+@router.get("/autocomplete", response_model=list[SuggestionOut])
+def autocomplete(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=MAX_SUGGESTIONS),
+    kind: list[str] | None = Query(default=None),
+    current_user: User = Depends(get_current_user),
+) -> list[SuggestionOut]:
+    if kind and not set(kind) <= set(SUGGESTION_KINDS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"kind must be one of: {', '.join(SUGGESTION_KINDS)}",
+        )
+    suggestions = job_index.suggestions.suggest(q, limit=limit, kinds=kind)
+    return [SuggestionOut.model_validate(suggestion) for suggestion in suggestions]
+
+
+@router.post("/recommendations", response_model=list[JobRecommendationOut])
+async def recommend(
+    payload: RecommendationRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(require_db),
-) -> list[JobOut]:
-    user_apps = db.scalars(select(Application).where(Application.user_id == current_user.id)).all()
-    state_map: Dict[str, JobState] = {}
-    for app in user_apps:
-        key = _normalize_key(app.title, app.company)
-        if app.status == ApplicationStatus.draft:
-            state_map[key] = JobState.saved
-        else:
-            state_map[key] = JobState.applied
-
-    async def _fetch_from_adapter(adapter, query: str, location: str) -> Iterable[Dict[str, Any]]:
-        try:
-            return await adapter.fetch(query=query, location=location)
-        except Exception:  # pragma: no cover - adapter failure should not crash API
-            return []
-
-    query_text = filters.q or ""
-    location = filters.location or "Dubai"
-    tasks = [_fetch_from_adapter(adapter, query=query_text, location=location) for adapter in ADAPTERS]
-    results_nested = await asyncio.gather(*tasks)
-
-    jobs: list[JobOut] = []
-    for adapter, items in zip(ADAPTERS, results_nested):
-        for idx, item in enumerate(items or []):
-            data = {**item}
-            source = data.get("source") or adapter.source
-            identifier = data.get("id") or data.get("apply_url") or f"{source}-{idx}"
-            key = _normalize_key(data.get("title"), data.get("company"))
-            state = state_map.get(key, JobState.recommended)
-            job = JobOut(
-                id=str(identifier),
-                title=data.get("title") or "Untitled role",
-                company=data.get("company") or "Unknown company",
-                location=data.get("location"),
-                salary_low=data.get("salary_low"),
-                salary_high=data.get("salary_high"),
-                currency=data.get("currency"),
-                job_type=data.get("job_type"),
-                experience_level=data.get("experience_level"),
-                industry=data.get("industry"),
-                education_level=data.get("education_level"),
-                work_mode=data.get("work_mode"),
-                posted_date=data.get("posted_date"),
-                apply_url=data.get("apply_url"),
-                description=data.get("description"),
-                source=source,
-                state=state,
+    redis: Redis = Depends(get_redis),
+) -> list[JobRecommendationOut]:
+    if payload.resume_text:
+        skills = parse_resume_text(payload.resume_text)["skills"] + extract_keywords(payload.resume_text)
+    else:
+        skills = list(current_user.resume_skills or [])
+    if not skills:
+        return []
+
+    if not _index_is_fed():
+        await _index_from_adapters(AdapterResultCache(redis), "", "Dubai")
+
+    state_map = user_state_cache.get(db, current_user.id)
+    out = []
+    for match in recommend_jobs(job_index, skills, limit=payload.limit):
+        job = _job_for_doc(match.doc_id, state_map, match.score)
+        if job is None:
+            continue
+        out.append(
+            JobRecommendationOut(
+                job=job,
+                score=match.score,
+                matched_skills=[SkillMatchOut.model_validate(skill) for skill in match.matched],
+                missing_skills=match.missing,
             )
-            jobs.append(job)
+        )
+    return out
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Split the request body into numbered lines as it arrives; oversized lines come back as None."""
+    limit = settings.INGEST_BULK_MAX_LINE_BYTES
+    buffer = b""
+    number = 0
+    discarding = False
+    async for data in request.stream():
+        lines = (buffer + data).split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            if discarding:
+                # Tail of an oversized line that was already reported.
+                discarding = False
+                continue
+            number += 1
+            yield number, (line if len(line) <= limit else None)
+        if discarding:
+            buffer = b""
+        elif len(buffer) > limit:
+            number += 1
+            yield number, None
+            buffer, discarding = b"", True
+    if buffer and not discarding:
+        yield number + 1, buffer
+
+
+def _line_error(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+@router.post("/ingest/bulk", response_model=BulkIngestResponse, dependencies=[Depends(require_ingest_token)])
+async def ingest_bulk(request: Request, db: Session = Depends(require_db)) -> BulkIngestResponse:
+    """Ingest an NDJSON stream of postings (one ``JobIngestIn`` per line).
+
+    Lines are validated as they arrive and valid postings flow in chunks through
+    the same normalize -> dedupe -> batched upsert pipeline as scheduled ingest.
+    Every non-blank line gets a result: accepted, skipped (already past the
+    max age) or rejected with the first validation error.
+    """
+    response = BulkIngestResponse()
+    cutoff = max_age_cutoff()
+
+    def _result(line: int, outcome: str, error: str | None = None) -> None:
+        setattr(response, outcome, getattr(response, outcome) + 1)
+        response.results.append(BulkIngestLineOut(line=line, status=outcome, error=error))
+
+    async def _chunks() -> AsyncIterator[Chunk]:
+        chunk: Chunk = []
+        async for number, raw in _ndjson_lines(request):
+            if raw is not None and not raw.strip():
+                continue
+            response.received += 1
+            if raw is None:
+                _result(number, "rejected", f"line exceeds {settings.INGEST_BULK_MAX_LINE_BYTES} bytes")
+                continue
+            try:
+                posting = JobIngestIn.model_validate_json(raw).model_dump()
+            except ValidationError as exc:
+                _result(number, "rejected", _line_error(exc))
+                continue
+            posted = posted_at(posting)
+            if posted is not None and posted < cutoff:
+                _result(number, "skipped", "posted before the max job age")
+                continue
+            _result(number, "accepted")
+            chunk.append(posting)
+            if len(chunk) >= settings.INGEST_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
 
-    return jobs
+    result = await ingest_chunks(_chunks(), source="api", session_factory=sessionmaker(bind=db.get_bind()))
+    response.written = result.written
+    return response
 
 
 @router.post("/run", response_model=JobAutomationResponse, status_code=status.HTTP_202_ACCEPTED)
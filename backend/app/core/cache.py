@@ -20,7 +20,8 @@ _redis_lock = asyncio.Lock()
 _redis_client: Redis | None = None
 
 
-async def get_redis() -> AsyncGenerator[Redis, None]:
+async def redis_client() -> Redis:
+    """Return the process-wide Redis client, creating it on first use."""
     global _redis_client
     if _redis_client is None:
         async with _redis_lock:
@@ -37,8 +38,13 @@ async def get_redis() -> AsyncGenerator[Redis, None]:
                         socket_timeout=5,
                         retry_on_timeout=True,
                     )
+    return _redis_client
+
+
+async def get_redis() -> AsyncGenerator[Redis, None]:
+    client = await redis_client()
     try:
-        yield _redis_client  # type: ignore[misc]
+        yield client
     finally:
         # Connection is shared; do not close per-request
         pass
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import List
+from typing import List, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -45,6 +45,65 @@ class Settings(BaseSettings):
     # CORS / API
     CORS_ALLOW_ORIGINS: List[str] | None = None
 
+    # Job search fan-out
+    SEARCH_DEADLINE_MS: int = Field(default=2500, ge=100)
+    ADAPTER_TIMEOUT_MS: int = Field(default=2000, ge=50)
+    ADAPTER_HEDGE_DELAY_MS: int = Field(default=800, ge=0)
+    ADAPTER_BREAKER_THRESHOLD: int = Field(default=5, ge=1)
+    ADAPTER_BREAKER_RESET_SECONDS: int = Field(default=30, ge=1)
+    ADAPTER_CACHE_TTL_SECONDS: int = Field(default=60, ge=1)
+    ADAPTER_CACHE_STALE_SECONDS: int = Field(default=300, ge=0)
+    # Outbound HTTP (JD pages, adapters): "record" archives every exchange to HTTP_ARCHIVE_PATH (.warc.gz),
+    # "replay" answers from it with no network, after a fixed or the originally recorded delay
+    HTTP_ARCHIVE_MODE: Literal["off", "record", "replay"] = "off"
+    HTTP_ARCHIVE_PATH: str = "data/http_archive.warc.gz"
+    HTTP_REPLAY_LATENCY_MS: float = Field(default=0.0, ge=0)
+    HTTP_REPLAY_RECORDED_LATENCY: bool = False
+    # Validators (ETag, Last-Modified, body hash) and extracted text of fetched JD pages; 0 disables the cache
+    JD_CACHE_TTL_SECONDS: int = Field(default=7 * 24 * 3600, ge=0)
+
+    # Job search ranking
+    RANK_SKILL_WEIGHT: float = Field(default=2.0, ge=0)
+    RANK_FRESHNESS_WEIGHT: float = Field(default=1.0, ge=0)
+    RANK_FRESHNESS_HALF_LIFE_DAYS: float = Field(default=14.0, gt=0)
+
+    # Ingest de-duplication (estimated Jaccard similarity of MinHash signatures)
+    DEDUPE_SIMILARITY_THRESHOLD: float = Field(default=0.8, gt=0, le=1)
+    # Ingest scheduling: every process schedules, one Redis lease holder ingests
+    INGEST_SCHEDULER_ENABLED: bool = False
+    # Starting poll interval per source; it then adapts to each source's new postings per poll
+    INGEST_INTERVAL_MINUTES: int = Field(default=10, ge=1)
+    INGEST_MIN_INTERVAL_MINUTES: int = Field(default=2, ge=1)
+    INGEST_MAX_INTERVAL_MINUTES: int = Field(default=120, ge=1)
+    INGEST_POLL_TARGET_NEW: int = Field(default=25, ge=1)
+    INGEST_POLL_JITTER: float = Field(default=0.1, ge=0, lt=1)
+    INGEST_MISFIRE_GRACE_SECONDS: int = Field(default=60, ge=1)
+    INGEST_LEADER_TTL_SECONDS: int = Field(default=30, ge=3)
+    INGEST_INDEX_SYNC_SECONDS: int = Field(default=60, ge=1)
+    # Bloom filter of stored postings that lets ingest skip DB lookups for new ones
+    INGEST_SEEN_FILTER_CAPACITY: int = Field(default=1_000_000, ge=1)
+    INGEST_SEEN_FILTER_ERROR_RATE: float = Field(default=0.01, gt=0, lt=1)
+    INGEST_SEEN_FILTER_PATH: str = "data/seen_postings.bloom"
+    # Shared secret for machine clients (the crawler) of POST /jobs/ingest/bulk; unset disables it
+    INGEST_API_TOKEN: str | None = None
+    INGEST_BULK_MAX_LINE_BYTES: int = Field(default=1_000_000, ge=1024)
+    # Job lifecycle: postings older than this, or gone from their source, move to jobs_archive
+    JOB_MAX_AGE_DAYS: int = Field(default=60, ge=1)
+    JOB_LIFECYCLE_INTERVAL_MINUTES: int = Field(default=60, ge=1)
+    JOB_ARCHIVE_BATCH_SIZE: int = Field(default=500, ge=1)
+    # Rebuild the in-memory search index once this share of its documents are tombstones
+    JOB_INDEX_COMPACT_RATIO: float = Field(default=0.25, gt=0, le=1)
+    # Rows per INSERT ... ON CONFLICT batch written by ingest
+    INGEST_BATCH_SIZE: int = Field(default=1000, ge=1)
+    # Search terms every ingest run asks each source for ("" = the source's default feed)
+    INGEST_QUERIES: List[str] = Field(default_factory=lambda: [""])
+    # Simultaneous adapter requests across all sources, and per source
+    INGEST_CONCURRENCY: int = Field(default=8, ge=1)
+    INGEST_SOURCE_CONCURRENCY: int = Field(default=2, ge=1)
+    # Postings per chunk passed between pipeline stages, and chunks buffered per stage
+    INGEST_CHUNK_SIZE: int = Field(default=500, ge=1)
+    INGEST_QUEUE_SIZE: int = Field(default=4, ge=1)
+
     # Observability
     SENTRY_DSN: str | None = None
 
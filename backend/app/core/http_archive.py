@@ -0,0 +1,276 @@
+"""Record and replay HTTP exchanges through an httpx transport.
+
+``record`` mode passes requests to the network and appends every exchange to
+a WARC/1.1 file with one gzip member per record (``.warc.gz``), so files
+from interrupted runs stay readable. ``replay`` mode serves the archived
+responses back with no network, optionally after an injected delay, which
+makes crawl and ingest benchmarks reproducible offline. A URL fetched
+several times is replayed in recorded order, and its last response repeats
+once the others are used up.
+
+This module only depends on httpx so the standalone crawler can load it
+without importing the backend app.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import gzip
+import hashlib
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (OFF, RECORD, REPLAY)
+
+# Bodies are stored decoded, so the headers that describe the wire encoding are dropped.
+_WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+_ELAPSED_HEADER = "WARC-X-Elapsed-Ms"
+
+
+def request_key(method: str, url: str, body: bytes = b"") -> str:
+    """Replay lookup key: method and URL, plus a body digest for requests that carry one."""
+    key = f"{method.upper()} {url}"
+    if body:
+        key += " " + hashlib.sha1(body).hexdigest()
+    return key
+
+
+def _http_block(start_line: str, headers: httpx.Headers, body: bytes) -> bytes:
+    lines = [start_line]
+    lines += [f"{name}: {value}" for name, value in headers.multi_items() if name.lower() not in _WIRE_HEADERS]
+    if body:
+        lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + body
+
+
+def _record_id() -> str:
+    return f"<urn:uuid:{uuid.uuid4()}>"
+
+
+def _warc_record(warc_type: str, record_id: str, url: str, block: bytes, extra: Dict[str, str]) -> bytes:
+    headers = {
+        "WARC-Type": warc_type,
+        "WARC-Record-ID": record_id,
+        "WARC-Date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "WARC-Target-URI": url,
+        "Content-Type": f"application/http;msgtype={warc_type}",
+        **extra,
+        "Content-Length": str(len(block)),
+    }
+    head = "WARC/1.1\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+    return gzip.compress(head.encode("utf-8") + block + b"\r\n\r\n")
+
+
+class ArchiveWriter:
+    """Appends request/response record pairs to a ``.warc.gz`` file; safe to share between threads."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, "ab")
+        self._lock = threading.Lock()
+
+    def write(self, request: httpx.Request, response: httpx.Response, body: bytes, elapsed: float) -> None:
+        url = str(request.url)
+        request_block = _http_block(
+            f"{request.method} {request.url.raw_path.decode('ascii')} HTTP/1.1", request.headers, request.content
+        )
+        request_id = _record_id()
+        request_record = _warc_record("request", request_id, url, request_block, {})
+        reason = response.reason_phrase or ""
+        response_block = _http_block(f"HTTP/1.1 {response.status_code} {reason}".rstrip(), response.headers, body)
+        response_record = _warc_record(
+            "response",
+            _record_id(),
+            url,
+            response_block,
+            {"WARC-Concurrent-To": request_id, _ELAPSED_HEADER: f"{elapsed * 1000:.1f}"},
+        )
+        with self._lock:
+            self._fh.write(request_record + response_record)
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+def iter_records(path: str | Path) -> Iterator[Tuple[Dict[str, str], bytes]]:
+    """Yield ``(warc_headers, block)`` for every record of a ``.warc.gz`` file."""
+    with gzip.open(path, "rb") as fh:
+        while True:
+            line = fh.readline()
+            if not line:
+                return
+            if not line.strip():
+                continue
+            if not line.startswith(b"WARC/"):
+                raise ValueError(f"{path} is not a WARC file")
+            headers: Dict[str, str] = {}
+            while True:
+                line = fh.readline().rstrip(b"\r\n")
+                if not line:
+                    break
+                name, _, value = line.decode("utf-8").partition(":")
+                headers[name.strip()] = value.strip()
+            yield headers, fh.read(int(headers["Content-Length"]))
+
+
+def _parse_http(block: bytes) -> Tuple[str, List[Tuple[str, str]], bytes]:
+    head, _, body = block.partition(b"\r\n\r\n")
+    start_line, *header_lines = head.decode("utf-8").split("\r\n")
+    headers = [(name.strip(), value.strip()) for name, _, value in (line.partition(":") for line in header_lines)]
+    return start_line, headers, body
+
+
+class ReplayArchive:
+    """Archived responses by request key, in recorded order."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.exchanges: Dict[str, Deque[Tuple[int, List[Tuple[str, str]], bytes, float]]] = defaultdict(deque)
+        requests: Dict[str, str] = {}
+        for headers, block in iter_records(path):
+            if headers.get("WARC-Type") == "request":
+                start_line, _, body = _parse_http(block)
+                method = start_line.split(" ", 1)[0]
+                requests[headers["WARC-Record-ID"]] = request_key(method, headers["WARC-Target-URI"], body)
+            elif headers.get("WARC-Type") == "response":
+                key = requests.pop(headers.get("WARC-Concurrent-To", ""), None)
+                key = key or request_key("GET", headers["WARC-Target-URI"])
+                start_line, response_headers, body = _parse_http(block)
+                elapsed = float(headers.get(_ELAPSED_HEADER, 0)) / 1000
+                self.exchanges[key].append((int(start_line.split(" ", 2)[1]), response_headers, body, elapsed))
+
+    def __len__(self) -> int:
+        return sum(len(exchanges) for exchanges in self.exchanges.values())
+
+    def next(self, key: str) -> Optional[Tuple[int, List[Tuple[str, str]], bytes, float]]:
+        """The next recorded response for ``key``; the last one repeats once the others are used up."""
+        recorded = self.exchanges.get(key)
+        if not recorded:
+            return None
+        return recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Sends requests through ``transport`` and archives each exchange."""
+
+    def __init__(self, writer: ArchiveWriter, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self.writer = writer
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        wrapped = httpx.Response(response.status_code, headers=response.headers, stream=response.stream)
+        try:
+            # Decoded body, so the archive does not depend on the transfer encoding.
+            body = await wrapped.aread()
+        finally:
+            await wrapped.aclose()
+        elapsed = time.perf_counter() - started
+        headers = [item for item in response.headers.multi_items() if item[0].lower() not in _WIRE_HEADERS]
+        recorded = httpx.Response(
+            response.status_code, headers=headers, content=body, request=request, extensions=response.extensions
+        )
+        await asyncio.to_thread(self.writer.write, request, recorded, body, elapsed)
+        return recorded
+
+    async def aclose(self) -> None:
+        # The writer is shared with other clients; only the network side belongs to this transport.
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Answers requests from a ``ReplayArchive`` without touching the network.
+
+    ``latency_ms`` delays every response by a fixed amount; ``recorded_latency``
+    uses the time each exchange originally took instead. Requests that were
+    never recorded go to ``fallback``, or fail with ``httpx.ConnectError``.
+    """
+
+    def __init__(
+        self,
+        archive: ReplayArchive,
+        *,
+        latency_ms: float = 0.0,
+        recorded_latency: bool = False,
+        fallback: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.archive = archive
+        self.latency_ms = latency_ms
+        self.recorded_latency = recorded_latency
+        self.fallback = fallback
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        recorded = self.archive.next(request_key(request.method, str(request.url), body))
+        if recorded is None:
+            if self.fallback is not None:
+                return await self.fallback.handle_async_request(request)
+            raise httpx.ConnectError(f"{request.method} {request.url} is not in the archive", request=request)
+        status, headers, content, elapsed = recorded
+        delay = elapsed if self.recorded_latency else self.latency_ms / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return httpx.Response(status, headers=headers, content=content, request=request)
+
+    async def aclose(self) -> None:
+        if self.fallback is not None:
+            await self.fallback.aclose()
+
+
+# One writer and one loaded archive per file for the whole process, shared by every client.
+_writers: Dict[Path, ArchiveWriter] = {}
+_archives: Dict[Path, ReplayArchive] = {}
+_shared_lock = threading.Lock()
+
+
+def _writer(path: Path) -> ArchiveWriter:
+    with _shared_lock:
+        if path not in _writers:
+            _writers[path] = ArchiveWriter(path)
+            atexit.register(_writers[path].close)
+        return _writers[path]
+
+
+def _archive(path: Path) -> ReplayArchive:
+    with _shared_lock:
+        if path not in _archives:
+            _archives[path] = ReplayArchive(path)
+        return _archives[path]
+
+
+def archive_transport(
+    mode: str,
+    path: str | Path,
+    *,
+    latency_ms: float = 0.0,
+    recorded_latency: bool = False,
+    **transport_kwargs: Any,
+) -> Optional[httpx.AsyncBaseTransport]:
+    """Transport for ``mode``, or None for ``off`` (httpx then builds its usual one).
+
+    ``transport_kwargs`` (``http2``, ``limits``, ...) configure the network
+    transport, since httpx ignores them on the client once a transport is given.
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown HTTP archive mode {mode!r}; choose from {', '.join(MODES)}")
+    if mode == RECORD:
+        return RecordingTransport(_writer(Path(path).resolve()), httpx.AsyncHTTPTransport(**transport_kwargs))
+    if mode == REPLAY:
+        archive = _archive(Path(path).resolve())
+        return ReplayTransport(archive, latency_ms=latency_ms, recorded_latency=recorded_latency)
+    return None
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+
+from .config import settings
+from .http_archive import archive_transport
+
+
+def http_client(**kwargs: Any) -> httpx.AsyncClient:
+    """AsyncClient for outbound calls; records or replays its exchanges as HTTP_ARCHIVE_MODE says."""
+    transport = archive_transport(
+        settings.HTTP_ARCHIVE_MODE,
+        settings.HTTP_ARCHIVE_PATH,
+        latency_ms=settings.HTTP_REPLAY_LATENCY_MS,
+        recorded_latency=settings.HTTP_REPLAY_RECORDED_LATENCY,
+    )
+    return httpx.AsyncClient(transport=transport, **kwargs)
@@ -16,6 +16,7 @@ from .core.logging import configure_logging
 from .middleware import RequestContextMiddleware
 from .models import Application, User
 from .schemas import ApplicationOut, UserOut
+from .services.ingest.scheduler import start_scheduler, stop_scheduler, sync_index
 from starlette.middleware.base import BaseHTTPMiddleware
 import time
 import logging
@@ -85,6 +86,15 @@ async def list_applications(
     return db.scalars(select(Application).where(Application.user_id == current_user.id)).all()
 
 
+@app.on_event("startup")
+async def startup_event() -> None:
+    if settings.INGEST_SCHEDULER_ENABLED:
+        # Warm the search index from the jobs table before the first ingest run.
+        await sync_index()
+        start_scheduler()
+
+
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
+    await stop_scheduler()
     await close_redis()
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional
 
-from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Integer, JSON, String, func
+from sqlalchemy import DateTime, Enum as SAEnum, Float, ForeignKey, Integer, JSON, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.db import Base
@@ -72,3 +72,77 @@ class AuditEvent(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     user: Mapped[Optional[User]] = relationship()
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # sha256 of the normalized title, company and apply URL; ingest upserts on it.
+    content_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    # sha256 of every stored column; unchanged re-ingested postings are skipped on it.
+    row_hash: Mapped[Optional[str]] = mapped_column(String(64), index=True)
+    source: Mapped[Optional[str]] = mapped_column(String(100), index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    company: Mapped[str] = mapped_column(String(255), nullable=False)
+    location: Mapped[Optional[str]] = mapped_column(String(255))
+    salary_low: Mapped[Optional[float]] = mapped_column(Float)
+    salary_high: Mapped[Optional[float]] = mapped_column(Float)
+    currency: Mapped[Optional[str]] = mapped_column(String(8))
+    job_type: Mapped[Optional[str]] = mapped_column(String(50))
+    experience_level: Mapped[Optional[str]] = mapped_column(String(50))
+    industry: Mapped[Optional[str]] = mapped_column(String(100))
+    education_level: Mapped[Optional[str]] = mapped_column(String(100))
+    work_mode: Mapped[Optional[str]] = mapped_column(String(50))
+    posted_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), index=True)
+    apply_url: Mapped[Optional[str]] = mapped_column(String(1024))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    alternate_sources: Mapped[list[Dict[str, Any]]] = mapped_column(JSON, default=list)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class JobArchive(Base):
+    """Postings moved out of ``jobs`` once stale; same columns plus why and when."""
+
+    __tablename__ = "jobs_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Not unique: a posting can come back and be archived again.
+    content_hash: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    row_hash: Mapped[Optional[str]] = mapped_column(String(64))
+    source: Mapped[Optional[str]] = mapped_column(String(100))
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    company: Mapped[str] = mapped_column(String(255), nullable=False)
+    location: Mapped[Optional[str]] = mapped_column(String(255))
+    salary_low: Mapped[Optional[float]] = mapped_column(Float)
+    salary_high: Mapped[Optional[float]] = mapped_column(Float)
+    currency: Mapped[Optional[str]] = mapped_column(String(8))
+    job_type: Mapped[Optional[str]] = mapped_column(String(50))
+    experience_level: Mapped[Optional[str]] = mapped_column(String(50))
+    industry: Mapped[Optional[str]] = mapped_column(String(100))
+    education_level: Mapped[Optional[str]] = mapped_column(String(100))
+    work_mode: Mapped[Optional[str]] = mapped_column(String(50))
+    posted_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    apply_url: Mapped[Optional[str]] = mapped_column(String(1024))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    alternate_sources: Mapped[list[Dict[str, Any]]] = mapped_column(JSON, default=list)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # "expired" (older than JOB_MAX_AGE_DAYS) or "removed" (no longer listed by its source)
+    archive_reason: Mapped[str] = mapped_column(String(20), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class IngestWatermark(Base):
+    __tablename__ = "ingest_watermarks"
+
+    source: Mapped[str] = mapped_column(String(100), primary_key=True)
+    # Newest posted_date ingested from the source; later runs only ask for newer postings.
+    last_posted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
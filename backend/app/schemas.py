@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, HttpUrl
 
@@ -81,6 +81,11 @@ class JobState(str, Enum):
     applied = "applied"
 
 
+class JobSourceOut(BaseModel):
+    source: Optional[str] = None
+    apply_url: Optional[str] = None
+
+
 class JobOut(BaseModel):
     id: str
     title: str
@@ -99,6 +104,8 @@ class JobOut(BaseModel):
     description: Optional[str] = None
     source: Optional[str] = None
     state: JobState = JobState.recommended
+    score: Optional[float] = None
+    alternate_sources: list[JobSourceOut] = Field(default_factory=list)
 
 
 class JobFilters(BaseModel):
@@ -114,6 +121,89 @@ class JobFilters(BaseModel):
     q: Optional[str] = None
 
 
+class SourceStatusOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    source: str
+    status: str
+    elapsed_ms: float = 0.0
+    hedged: bool = False
+    cache: Optional[str] = None
+
+
+class JobSearchResponse(BaseModel):
+    items: list[JobOut]
+    total: int = 0
+    facets: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+    next_cursor: Optional[str] = None
+    partial: bool = False
+    sources: list[SourceStatusOut] = Field(default_factory=list)
+
+
+class SuggestionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    text: str
+    kind: str
+    count: int
+
+
+class RecommendationRequest(BaseModel):
+    resume_text: Optional[str] = None
+    limit: int = Field(default=20, ge=1, le=100)
+
+
+class SkillMatchOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    skill: str
+    weight: float
+
+
+class JobRecommendationOut(BaseModel):
+    job: JobOut
+    score: float
+    matched_skills: list[SkillMatchOut] = Field(default_factory=list)
+    missing_skills: list[str] = Field(default_factory=list)
+
+
+class JobIngestIn(BaseModel):
+    """One posting from a bulk ingest stream (a line of NDJSON)."""
+
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    source: str = Field(min_length=1, max_length=100)
+    title: str = Field(min_length=1, max_length=255)
+    company: Optional[str] = Field(default=None, max_length=255)
+    location: Optional[str] = Field(default=None, max_length=255)
+    salary_low: Optional[float] = Field(default=None, ge=0)
+    salary_high: Optional[float] = Field(default=None, ge=0)
+    currency: Optional[str] = Field(default=None, max_length=8)
+    job_type: Optional[str] = Field(default=None, max_length=50)
+    experience_level: Optional[str] = Field(default=None, max_length=50)
+    industry: Optional[str] = Field(default=None, max_length=100)
+    education_level: Optional[str] = Field(default=None, max_length=100)
+    work_mode: Optional[str] = Field(default=None, max_length=50)
+    posted_date: Optional[datetime] = None
+    apply_url: Optional[str] = Field(default=None, max_length=1024)
+    description: Optional[str] = None
+
+
+class BulkIngestLineOut(BaseModel):
+    line: int
+    status: Literal["accepted", "skipped", "rejected"]
+    error: Optional[str] = None
+
+
+class BulkIngestResponse(BaseModel):
+    received: int = 0
+    accepted: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    written: int = 0
+    results: list[BulkIngestLineOut] = Field(default_factory=list)
+
+
 class AutomationProfile(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
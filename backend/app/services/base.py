@@ -1,8 +1,16 @@
-from typing import List, Dict
+from typing import Any, List, Dict
+
+import httpx
+
+from ..core.http_client import http_client
 
 
 class BaseAdapter:
     source: str = "base"
 
+    def http_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        """Client for the source's API; use it so HTTP_ARCHIVE_MODE can record and replay the adapter."""
+        return http_client(**kwargs)
+
     async def fetch(self, query: str = "", location: str = "Dubai") -> List[Dict]:
         raise NotImplementedError
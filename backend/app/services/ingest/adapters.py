@@ -1,12 +1,16 @@
 # app/services/ingest/adapters.py
 from .base import BaseAdapter
 from datetime import datetime
+from typing import Optional
 
 
 class MockAdapter(BaseAdapter):
     source = "mock"
 
-    async def fetch(self, query: str = "", location: str = "Dubai"):
+    async def fetch(self, query: str = "", location: str = "Dubai", since: Optional[datetime] = None):
+        posted = datetime.utcnow()
+        if since is not None and posted < since.replace(tzinfo=None):
+            return []
         return [
             {
                 "title": "Data Engineer",
@@ -20,7 +24,7 @@ class MockAdapter(BaseAdapter):
                 "industry": "Tech",
                 "education_level": "Bachelor",
                 "work_mode": "Hybrid",
-                "posted_date": datetime.utcnow(),
+                "posted_date": posted,
                 "apply_url": "https://example.com/apply",
                 "description": "Snowflake, Python, SQL, ADF",
                 "source": self.source,
@@ -1,6 +1,35 @@
 # app/services/ingest/base.py
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set
+
+import httpx
+
+from ...core.http_client import http_client
+
+
 class BaseAdapter:
     source = "base"
+    # Upper bound on simultaneous requests to this source; None uses INGEST_SOURCE_CONCURRENCY.
+    max_concurrency: Optional[int] = None
 
-    async def fetch(self, query: str = "", location: str = "Dubai"):
+    def http_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        """Client for the source's API; use it so HTTP_ARCHIVE_MODE can record and replay the adapter."""
+        return http_client(**kwargs)
+
+    async def fetch(self, query: str = "", location: str = "Dubai", since: Optional[datetime] = None):
+        """Return postings; when ``since`` is given, only those posted at or after it."""
         raise NotImplementedError
+
+    async def stream(
+        self, query: str = "", location: str = "Dubai", since: Optional[datetime] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield postings page by page. Adapters over large feeds should override this."""
+        yield list(await self.fetch(query=query, location=location, since=since) or [])
+
+    async def removed(self, apply_urls: Sequence[str]) -> Set[str]:
+        """Return the postings among ``apply_urls`` this source no longer lists.
+
+        Lifecycle archives them. Adapters that cannot tell report none, which
+        leaves their postings to expire by age.
+        """
+        return set()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from ...core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"WZBLOOM1"
+
+
+def _key_hashes(keys: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Two independent 64-bit hashes per key for double hashing."""
+    digests = b"".join(hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest() for key in keys)
+    pairs = np.frombuffer(digests, dtype="<u8").reshape(-1, 2)
+    # An odd step keeps the probe sequence from cycling on a power-of-two factor of the size.
+    return pairs[:, 0], pairs[:, 1] | np.uint64(1)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, backed by a numpy bit array.
+
+    ``might_contain`` never returns a false negative: a key that was added is
+    always reported. Keys that were not added are reported with probability
+    ``false_positive_rate`` (``error_rate`` while ``entries <= capacity``).
+    There is no removal; rebuild the filter instead.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.size = max(int(math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.entries = 0
+        self._steps = np.arange(self.hash_count, dtype=np.uint64)
+
+    def _positions(self, keys: List[str]) -> np.ndarray:
+        first, second = _key_hashes(keys)
+        with np.errstate(over="ignore"):
+            probes = first[:, None] + self._steps[None, :] * second[:, None]
+        return probes % np.uint64(self.size)
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        positions = self._positions(keys).ravel()
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        # ``.at`` applies repeated byte indices one by one instead of keeping only the last write.
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), masks)
+        self.entries += len(keys)
+
+    def might_contain_many(self, keys: Iterable[str]) -> np.ndarray:
+        keys = list(keys)
+        if not keys:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(keys)
+        hits = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return hits.all(axis=1)
+
+    def might_contain(self, key: str) -> bool:
+        return bool(self.might_contain_many([key])[0])
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false-positive rate at the current number of entries."""
+        return (1 - math.exp(-self.hash_count * self.entries / self.size)) ** self.hash_count
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.bits.nbytes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": self.entries,
+            "capacity": self.capacity,
+            "bytes": self.nbytes,
+            "hash_count": self.hash_count,
+            "false_positive_rate": round(self.false_positive_rate, 6),
+        }
+
+    def save(self, path: str | Path, **meta: Any) -> None:
+        """Write the filter atomically; ``meta`` is stored alongside for staleness checks."""
+        header = json.dumps(
+            {"capacity": self.capacity, "error_rate": self.error_rate, "entries": self.entries, **meta},
+            default=str,
+        ).encode("utf-8")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(_MAGIC + len(header).to_bytes(4, "big") + header)
+            fh.write(self.bits.tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> tuple["BloomFilter", Dict[str, Any]]:
+        """Read a filter written by ``save``; raises ``ValueError`` on a foreign or truncated file."""
+        data = Path(path).read_bytes()
+        if not data.startswith(_MAGIC):
+            raise ValueError(f"{path} is not a Bloom filter snapshot")
+        offset = len(_MAGIC) + 4
+        header_len = int.from_bytes(data[len(_MAGIC) : offset], "big")
+        meta = json.loads(data[offset : offset + header_len])
+        bloom = cls(meta["capacity"], meta["error_rate"])
+        bits = np.frombuffer(data, dtype=np.uint8, offset=offset + header_len)
+        if bits.size != bloom.bits.size:
+            raise ValueError(f"{path} is truncated")
+        bloom.bits = bits.copy()
+        bloom.entries = int(meta["entries"])
+        return bloom, meta
+
+
+class SeenPostings:
+    """Bloom filter of the posting versions (row hashes) that are already stored.
+
+    Ingest asks it before touching the DB: a miss means the posting (in this
+    exact version) is new and can be written without a lookup; a hit may be
+    a false positive and falls through to the DB check. It is rebuilt from the
+    ``jobs`` table at startup unless a current snapshot exists on disk.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.bloom = BloomFilter(settings.INGEST_SEEN_FILTER_CAPACITY, settings.INGEST_SEEN_FILTER_ERROR_RATE)
+
+    @staticmethod
+    def _version_key(row_hash: str) -> str:
+        return f"v:{row_hash}"
+
+    def reset(self, expected_rows: int = 0) -> None:
+        # Leave room for growth so the false-positive rate holds until the next rebuild.
+        capacity = max(settings.INGEST_SEEN_FILTER_CAPACITY, 4 * expected_rows)
+        with self._lock:
+            self.bloom = BloomFilter(capacity, settings.INGEST_SEEN_FILTER_ERROR_RATE)
+
+    def add(self, rows: Iterable[Dict[str, Any]]) -> None:
+        keys = [self._version_key(row["row_hash"]) for row in rows]
+        with self._lock:
+            was_full = self.bloom.entries > self.bloom.capacity
+            self.bloom.add_many(keys)
+            if not was_full and self.bloom.entries > self.bloom.capacity:
+                # Still correct, just less selective until the next rebuild sizes it up.
+                logger.warning("seen_filter_over_capacity", extra=self.bloom.stats())
+
+    def might_contain(self, row_hashes: List[str]) -> np.ndarray:
+        with self._lock:
+            return self.bloom.might_contain_many(self._version_key(value) for value in row_hashes)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self.bloom.stats()
+
+    def save(self, **meta: Any) -> None:
+        path = settings.INGEST_SEEN_FILTER_PATH
+        if not path:
+            return
+        try:
+            with self._lock:
+                self.bloom.save(path, **meta)
+        except OSError:
+            logger.warning("seen_filter_save_failed", extra={"path": path}, exc_info=True)
+
+    def restore(self, **expected: Any) -> bool:
+        """Load the on-disk snapshot if its metadata matches ``expected``; True when loaded."""
+        path = settings.INGEST_SEEN_FILTER_PATH
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            bloom, meta = BloomFilter.load(path)
+        except (OSError, ValueError, KeyError):
+            logger.warning("seen_filter_load_failed", extra={"path": path}, exc_info=True)
+            return False
+        if any(meta.get(name) != json.loads(json.dumps(value, default=str)) for name, value in expected.items()):
+            return False
+        with self._lock:
+            self.bloom = bloom
+        return True
+
+
+seen_postings = SeenPostings()
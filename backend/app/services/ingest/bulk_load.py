@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from .pipeline import normalize_chunk
+from .store import UPDATABLE_COLUMNS, job_row, upsert_jobs
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+NDJSON_SUFFIX = ".ndjson.gz"
+PARQUET_SUFFIX = ".parquet"
+_STAGING = "jobs_load"
+_READ_SIZE = 1 << 20
+_COLUMNS: tuple[str, ...] = (
+    "content_hash",
+    "row_hash",
+    "source",
+    "title",
+    "company",
+    "location",
+    "salary_low",
+    "salary_high",
+    "currency",
+    "job_type",
+    "experience_level",
+    "industry",
+    "education_level",
+    "work_mode",
+    "posted_date",
+    "apply_url",
+    "description",
+    "alternate_sources",
+)
+
+
+@dataclass(slots=True)
+class LoadResult:
+    files: int = 0
+    read: int = 0
+    loaded: int = 0
+
+
+def posting_files(paths: Iterable[str | Path]) -> List[Path]:
+    """Expand directories to the sink files in them, oldest name first."""
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found = [*path.glob(f"*{NDJSON_SUFFIX}"), *path.glob(f"*{PARQUET_SUFFIX}")]
+            files.extend(sorted(found))
+        else:
+            files.append(path)
+    return files
+
+
+def _ndjson_lines(path: Path) -> Iterator[bytes]:
+    # Each crawl round is its own gzip member, and its lines are only yielded once the whole member is read:
+    # a crash mid-round leaves a truncated last member, which is skipped. Memory stays at one round.
+    decoder = zlib.decompressobj(wbits=31)
+    member: List[bytes] = []
+    with open(path, "rb") as fh:
+        while data := fh.read(_READ_SIZE):
+            while data:
+                try:
+                    member.append(decoder.decompress(data))
+                except zlib.error:
+                    logger.warning("posting_file_corrupt", extra={"path": str(path)})
+                    return
+                if not decoder.eof:
+                    break
+                yield from b"".join(member).splitlines()
+                member = []
+                data = decoder.unused_data
+                decoder = zlib.decompressobj(wbits=31)
+    if member:
+        logger.warning("posting_file_truncated", extra={"path": str(path)})
+
+
+def _plain_lines(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as fh:
+        yield from fh
+
+
+def iter_file_postings(path: Path, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Batches of postings from one NDJSON (gzip) or Parquet sink file."""
+    if path.name.endswith(PARQUET_SUFFIX):
+        if pq is None:
+            raise RuntimeError(f"{path} is Parquet but pyarrow is not installed")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pylist()
+        return
+    lines = _ndjson_lines(path) if path.name.endswith(".gz") else _plain_lines(path)
+    batch: List[Dict[str, Any]] = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            batch.append(json.loads(line))
+        except ValueError:
+            logger.warning("posting_line_invalid", extra={"path": str(path), "line": number})
+            continue
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return json.dumps(value)
+    return value
+
+
+def _csv_field(value: Any) -> str:
+    # COPY ... (FORMAT csv) reads an unquoted empty field as NULL and a quoted one as an empty string.
+    if value is None:
+        return ""
+    value = _copy_value(value)
+    text_value = value.isoformat() if isinstance(value, datetime) else str(value)
+    return '"' + text_value.replace('"', '""') + '"'
+
+
+def copy_payload(rows: Iterable[Dict[str, Any]]) -> str:
+    """``rows`` as the CSV that ``COPY jobs_load (...) FROM STDIN WITH (FORMAT csv)`` expects."""
+    return "".join(",".join(_csv_field(row[name]) for name in _COLUMNS) + "\n" for row in rows)
+
+
+def copy_jobs(db: Session, rows: Sequence[Dict[str, Any]]) -> int:
+    """Upsert rows on Postgres: COPY into a temp staging table, then one INSERT ... SELECT ... ON CONFLICT.
+
+    The caller commits. Returns the number of distinct postings written.
+    """
+    # A statement may not touch the same row twice; the last copy wins, as in upsert_jobs.
+    rows = list({row["content_hash"]: row for row in rows}.values())
+    columns = ", ".join(_COLUMNS)
+    # Same column types as jobs, without its constraints; lives as long as the connection.
+    db.execute(text(f"CREATE TEMP TABLE IF NOT EXISTS {_STAGING} AS SELECT {columns} FROM jobs WITH NO DATA"))
+    db.execute(text(f"TRUNCATE {_STAGING}"))
+    cursor = db.connection().connection.driver_connection.cursor()
+    try:
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(f"COPY {_STAGING} ({columns}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row([_copy_value(row[name]) for name in _COLUMNS])
+        else:  # psycopg2
+            buffer = io.StringIO(copy_payload(rows))
+            cursor.copy_expert(f"COPY {_STAGING} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+    updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in UPDATABLE_COLUMNS)
+    written = db.execute(
+        text(
+            f"INSERT INTO jobs ({columns}) SELECT {columns} FROM {_STAGING} "
+            f"ON CONFLICT (content_hash) DO UPDATE SET {updates}, updated_at = now()"
+        )
+    ).rowcount
+    db.execute(text(f"TRUNCATE {_STAGING}"))
+    return written
+
+
+def load_postings(
+    db: Session,
+    paths: Iterable[str | Path],
+    *,
+    batch_size: int | None = None,
+    source: str = "crawler",
+) -> LoadResult:
+    """Load crawler sink files into ``jobs``, committing once per batch.
+
+    Postings are normalized as by the ingest pipeline (postings past
+    JOB_MAX_AGE_DAYS are dropped) and upserted on ``content_hash``. Postgres
+    uses COPY; other databases the batched executemany of ``upsert_jobs``.
+    """
+    size = batch_size or settings.INGEST_BATCH_SIZE
+    postgres = db.get_bind().dialect.name == "postgresql"
+    result = LoadResult()
+    for path in posting_files(paths):
+        result.files += 1
+        for postings in iter_file_postings(path, size):
+            result.read += len(postings)
+            normalized = normalize_chunk(postings, source=source, since=None)
+            if postgres:
+                result.loaded += copy_jobs(db, [job_row(posting) for posting in normalized])
+            else:
+                result.loaded += upsert_jobs(db, normalized, batch_size=size)
+            db.commit()
+        logger.info("posting_file_loaded", extra={"path": str(path), "read": result.read, "loaded": result.loaded})
+    return result
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import threading
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Set
+
+import numpy as np
+
+from ...core.config import settings
+from ..search.index import job_key
+from ..search.text import tokenize
+
+NUM_PERM = 128
+NUM_BANDS = 16
+SHINGLE_SIZE = 3
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_SHINGLED_FIELDS: tuple[str, ...] = ("title", "company", "description")
+
+
+def shingles(posting: Mapping[str, Any], size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hash the word ``size``-grams of a posting's title, company and description."""
+    tokens: List[str] = []
+    for name in _SHINGLED_FIELDS:
+        tokens.extend(tokenize(posting.get(name)))
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)]
+    return {zlib.crc32(gram.encode("utf-8")) for gram in grams}
+
+
+class MinHasher:
+    """Universal-hash MinHash signatures of ``num_perm`` 32-bit values."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1) -> None:
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: Iterable[int]) -> np.ndarray:
+        values = np.fromiter(hashes, dtype=np.uint64)
+        if values.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        permuted = (np.outer(values, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+
+def similarity(left: np.ndarray, right: np.ndarray) -> float:
+    """Estimate the Jaccard similarity of two MinHash signatures."""
+    return float(np.count_nonzero(left == right)) / left.size
+
+
+class JobDeduplicator:
+    """Groups near-duplicate postings from different sources into one canonical job.
+
+    Each canonical posting's MinHash signature is split into ``bands`` bands and
+    every band is hashed into a bucket, so a new posting is only compared with
+    the canonicals it shares at least one bucket with rather than with every
+    posting seen so far. Candidates whose estimated similarity reaches the
+    threshold absorb the posting as an alternate source.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float | None = None,
+        num_perm: int = NUM_PERM,
+        bands: int = NUM_BANDS,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold if threshold is not None else settings.DEDUPE_SIMILARITY_THRESHOLD
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+        self._buckets: List[Dict[bytes, List[str]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._canonical: Dict[str, Dict[str, Any]] = {}
+        # posting key -> key of the canonical posting it was folded into
+        self._cluster_of: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def clear(self) -> None:
+        with self._lock:
+            for buckets in self._buckets:
+                buckets.clear()
+            self._signatures.clear()
+            self._canonical.clear()
+            self._cluster_of.clear()
+
+    def forget(self, keys: Iterable[str]) -> int:
+        """Drop canonical postings (and the duplicates folded into them); returns how many were dropped."""
+        with self._lock:
+            gone = {key for key in keys if key in self._canonical}
+            for key in gone:
+                signature = self._signatures.pop(key)
+                del self._canonical[key]
+                for band, buckets in zip(self._band_keys(signature), self._buckets):
+                    bucket = buckets.get(band)
+                    if bucket is not None:
+                        bucket.remove(key)
+                        if not bucket:
+                            del buckets[band]
+            if gone:
+                self._cluster_of = {key: value for key, value in self._cluster_of.items() if value not in gone}
+            return len(gone)
+
+    def canonical_key(self, key: str) -> str | None:
+        with self._lock:
+            return self._cluster_of.get(key)
+
+    def collapse(self, postings: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Fold ``postings`` into their clusters and return the touched canonical postings.
+
+        Canonical postings carry an ``alternate_sources`` list with the source and
+        apply URL of every duplicate folded into them. The result is ordered by
+        first appearance and holds each canonical posting once.
+        """
+        touched: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for posting in postings:
+                canonical_key = self._collapse_locked(dict(posting))
+                touched[canonical_key] = self._canonical[canonical_key]
+        return list(touched.values())
+
+    def _collapse_locked(self, posting: Dict[str, Any]) -> str:
+        key = job_key(posting)
+        canonical_key = self._cluster_of.get(key)
+        if canonical_key == key:
+            # A refreshed copy of a canonical posting keeps the duplicates found so far.
+            posting["alternate_sources"] = self._canonical[key].get("alternate_sources", [])
+            self._canonical[key] = posting
+            return key
+        if canonical_key is not None:
+            return canonical_key
+
+        signature = self._hasher.signature(shingles(posting))
+        match = self._best_match(signature, source=posting.get("source"))
+        if match is not None:
+            canonical = self._canonical[match]
+            canonical.setdefault("alternate_sources", []).append(
+                {"source": posting.get("source"), "apply_url": posting.get("apply_url")}
+            )
+            self._cluster_of[key] = match
+            return match
+
+        posting.setdefault("alternate_sources", [])
+        self._canonical[key] = posting
+        self._signatures[key] = signature
+        self._cluster_of[key] = key
+        for band, buckets in zip(self._band_keys(signature), self._buckets):
+            buckets[band].append(key)
+        return key
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows : (i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _best_match(self, signature: np.ndarray, *, source: str | None) -> str | None:
+        candidates: Set[str] = set()
+        for band, buckets in zip(self._band_keys(signature), self._buckets):
+            candidates.update(buckets.get(band, ()))
+        best, best_score = None, self.threshold
+        for candidate in candidates:
+            if self._canonical[candidate].get("source") == source:
+                # One source never lists the same job twice on purpose; keep both.
+                continue
+            score = similarity(signature, self._signatures[candidate])
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+
+# A single deduplicator instance for the process
+job_deduplicator = JobDeduplicator()
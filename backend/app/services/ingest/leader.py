@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import uuid
+
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+logger = logging.getLogger(__name__)
+
+
+def _owner_token() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLease:
+    """Redis lease that elects one process out of many.
+
+    The first process to ``SET key token NX EX ttl`` leads. The leader renews
+    the lease well before it expires; if it stops (crash, network partition,
+    shutdown) the key expires and the next ``acquire`` from another process
+    wins. Renewal and release only touch the key while it still holds this
+    process' token, checked under ``WATCH`` so an expired lease that another
+    process has since taken is never extended or deleted.
+    """
+
+    def __init__(self, redis: Redis, key: str, ttl: int, token: str | None = None) -> None:
+        self.redis = redis
+        self.key = key
+        self.ttl = ttl
+        self.token = token or _owner_token()
+
+    async def acquire(self) -> bool:
+        """Take the lease if it is free, or renew it if this process holds it."""
+        if await self.redis.set(self.key, self.token, nx=True, ex=self.ttl):
+            return True
+        return await self._if_owner(lambda pipe: pipe.expire(self.key, self.ttl))
+
+    async def release(self) -> bool:
+        return await self._if_owner(lambda pipe: pipe.delete(self.key))
+
+    async def holder(self) -> str | None:
+        return await self.redis.get(self.key)
+
+    async def _if_owner(self, command) -> bool:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(self.key)
+                if await pipe.get(self.key) != self.token:
+                    await pipe.unwatch()
+                    return False
+                pipe.multi()
+                command(pipe)
+                await pipe.execute()
+                return True
+            except WatchError:
+                # The key changed between GET and EXEC: someone else took over.
+                logger.info("leader_lease_lost", extra={"key": self.key})
+                return False
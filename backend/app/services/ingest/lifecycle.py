@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from ...models import Job
+from ..search import job_index
+from ..search.index import job_key
+from .dedupe import job_deduplicator
+from .store import archive_jobs
+
+logger = logging.getLogger(__name__)
+
+EXPIRED = "expired"
+REMOVED = "removed"
+
+
+@dataclass(slots=True)
+class LifecycleResult:
+    expired: int = 0
+    removed: int = 0
+    compacted: int = 0
+
+
+def max_age_cutoff(now: datetime | None = None) -> datetime:
+    """Postings posted (or, if undated, first stored) before this are stale."""
+    return (now or datetime.now(tz=timezone.utc)) - timedelta(days=settings.JOB_MAX_AGE_DAYS)
+
+
+def forget_postings(postings: Iterable[Mapping[str, Any]]) -> None:
+    """Drop archived postings from this process' search index and deduplicator."""
+    keys = [job_key(posting) for posting in postings]
+    for key in keys:
+        job_index.remove(key)
+    job_deduplicator.forget(keys)
+
+
+def compact_index() -> int:
+    """Rebuild the search index once tombstones make up JOB_INDEX_COMPACT_RATIO of it."""
+    slots = len(job_index) + job_index.tombstones
+    if not slots or job_index.tombstones / slots < settings.JOB_INDEX_COMPACT_RATIO:
+        return 0
+    reclaimed = job_index.compact()
+    logger.info("job_index_compacted", extra={"reclaimed": reclaimed, "live": len(job_index)})
+    return reclaimed
+
+
+def _archive_expired_batch(session_factory: Callable[[], Session], cutoff: datetime) -> List[Dict[str, Any]]:
+    with session_factory() as db:
+        stale = or_(Job.posted_date < cutoff, and_(Job.posted_date.is_(None), Job.created_at < cutoff))
+        ids = list(db.scalars(select(Job.id).where(stale).order_by(Job.id).limit(settings.JOB_ARCHIVE_BATCH_SIZE)))
+        archived = archive_jobs(db, ids, EXPIRED)
+        db.commit()
+    return archived
+
+
+def _listed_batch(
+    session_factory: Callable[[], Session], source: str, after_id: int
+) -> List[Tuple[int, str]]:
+    with session_factory() as db:
+        stmt = (
+            select(Job.id, Job.apply_url)
+            .where(Job.source == source, Job.id > after_id, Job.apply_url.is_not(None))
+            .order_by(Job.id)
+            .limit(settings.JOB_ARCHIVE_BATCH_SIZE)
+        )
+        return [(job_id, url) for job_id, url in db.execute(stmt)]
+
+
+def _archive_removed_batch(session_factory: Callable[[], Session], job_ids: List[int]) -> List[Dict[str, Any]]:
+    with session_factory() as db:
+        archived = archive_jobs(db, job_ids, REMOVED)
+        db.commit()
+    return archived
+
+
+async def archive_expired(session_factory: Callable[[], Session], *, now: datetime | None = None) -> int:
+    """Archive postings older than JOB_MAX_AGE_DAYS, one JOB_ARCHIVE_BATCH_SIZE batch per transaction."""
+    cutoff = max_age_cutoff(now)
+    total = 0
+    while True:
+        archived = await asyncio.to_thread(_archive_expired_batch, session_factory, cutoff)
+        if not archived:
+            return total
+        forget_postings(archived)
+        total += len(archived)
+
+
+async def archive_removed(session_factory: Callable[[], Session], adapters: Sequence[Any]) -> int:
+    """Ask each adapter which of its stored postings it no longer lists, batch by batch, and archive those."""
+    total = 0
+    for adapter in adapters:
+        after_id = 0
+        while True:
+            listed = await asyncio.to_thread(_listed_batch, session_factory, adapter.source, after_id)
+            if not listed:
+                break
+            after_id = listed[-1][0]
+            gone = await adapter.removed([url for _, url in listed])
+            ids = [job_id for job_id, url in listed if url in gone]
+            if ids:
+                archived = await asyncio.to_thread(_archive_removed_batch, session_factory, ids)
+                forget_postings(archived)
+                total += len(archived)
+    return total
+
+
+async def run_lifecycle(
+    session_factory: Callable[[], Session],
+    adapters: Sequence[Any],
+    *,
+    now: datetime | None = None,
+) -> LifecycleResult:
+    """Move stale postings out of ``jobs`` and compact the in-memory search structures."""
+    result = LifecycleResult()
+    result.expired = await archive_expired(session_factory, now=now)
+    for adapter in adapters:
+        try:
+            result.removed += await archive_removed(session_factory, [adapter])
+        except Exception:
+            # A source that cannot answer keeps its postings until they expire.
+            logger.warning("lifecycle_removed_check_failed", extra={"source": adapter.source}, exc_info=True)
+    result.compacted = compact_index()
+    return result
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from ..keywords import extract_keywords
+from ..search import job_index
+from .bloom import seen_postings
+from .dedupe import job_deduplicator
+from .lifecycle import max_age_cutoff
+from .store import posted_at, upsert_jobs
+
+Chunk = List[Dict[str, Any]]
+
+_DONE = object()
+_TEXT_FIELDS: tuple[str, ...] = ("title", "company", "location", "currency", "apply_url", "description")
+_SALARY_FIELDS: tuple[str, ...] = ("salary_low", "salary_high")
+
+
+@dataclass(slots=True)
+class _Failure:
+    error: BaseException
+
+
+@dataclass(slots=True)
+class PipelineResult:
+    written: int = 0
+    newest: Optional[datetime] = None
+
+
+async def _drain(queue: asyncio.Queue, task: asyncio.Task) -> AsyncIterator[Any]:
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        task.cancel()
+
+
+async def buffered(stage: AsyncIterator[Any], maxsize: int | None = None) -> AsyncIterator[Any]:
+    """Run ``stage`` in its own task behind a bounded queue.
+
+    The producer blocks once ``maxsize`` items are waiting, so a slow consumer
+    throttles every stage upstream of it instead of letting them pile up data.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize or settings.INGEST_QUEUE_SIZE)
+
+    async def _produce() -> None:
+        try:
+            async for item in stage:
+                await queue.put(item)
+        except Exception as exc:
+            await queue.put(_Failure(exc))
+        else:
+            await queue.put(_DONE)
+
+    async for item in _drain(queue, asyncio.create_task(_produce())):
+        yield item
+
+
+def _chunks(items: List[Dict[str, Any]], size: int) -> List[Chunk]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+async def fetch_stage(
+    adapter: Any,
+    *,
+    since: Optional[datetime],
+    limits: List[asyncio.Semaphore],
+) -> AsyncIterator[Chunk]:
+    """Stream every configured query from ``adapter`` as chunks of raw postings.
+
+    Queries run concurrently under ``limits`` (per source, then overall) and
+    share one bounded queue, so a fast query cannot run ahead of the writer.
+    """
+    size = settings.INGEST_CHUNK_SIZE
+    queue: asyncio.Queue = asyncio.Queue(settings.INGEST_QUEUE_SIZE)
+
+    async def _query(query: str) -> None:
+        async with AsyncExitStack() as stack:
+            for limit in limits:
+                await stack.enter_async_context(limit)
+            async for page in adapter.stream(query=query, since=since):
+                for chunk in _chunks(list(page or []), size):
+                    await queue.put(chunk)
+
+    async def _run_queries() -> None:
+        try:
+            await asyncio.gather(*(_query(query) for query in settings.INGEST_QUERIES))
+        except Exception as exc:
+            await queue.put(_Failure(exc))
+        else:
+            await queue.put(_DONE)
+
+    async for chunk in _drain(queue, asyncio.create_task(_run_queries())):
+        yield chunk
+
+
+def normalize_chunk(chunk: Chunk, *, source: str, since: Optional[datetime]) -> Chunk:
+    cutoff = max_age_cutoff()
+    out = []
+    for item in chunk:
+        posting = dict(item)
+        for name in _TEXT_FIELDS:
+            if isinstance(posting.get(name), str):
+                posting[name] = posting[name].strip() or None
+        if not posting.get("title"):
+            continue
+        for name in _SALARY_FIELDS:
+            try:
+                posting[name] = float(posting[name]) if posting.get(name) not in (None, "") else None
+            except (TypeError, ValueError):
+                posting[name] = None
+        posting["posted_date"] = posted_at(posting)
+        if since is not None and posting["posted_date"] is not None and posting["posted_date"] < since:
+            # The adapter ignored the watermark; skip what an earlier run already wrote.
+            continue
+        if posting["posted_date"] is not None and posting["posted_date"] < cutoff:
+            # Lifecycle would archive it straight away.
+            continue
+        posting["source"] = posting.get("source") or source
+        out.append(posting)
+    return out
+
+
+def keyword_chunk(chunk: Chunk) -> Chunk:
+    for posting in chunk:
+        posting["keywords"] = extract_keywords(posting.get("description") or "")
+    return chunk
+
+
+async def normalize_stage(
+    chunks: AsyncIterator[Chunk],
+    *,
+    source: str,
+    since: Optional[datetime],
+    result: PipelineResult,
+) -> AsyncIterator[Chunk]:
+    # CPU-bound stages run in worker threads so the event loop keeps serving network waits.
+    async for chunk in chunks:
+        normalized = await asyncio.to_thread(normalize_chunk, chunk, source=source, since=since)
+        # Tracked before dedupe, which may hand back another source's canonical posting.
+        for posting in normalized:
+            posted = posting["posted_date"]
+            if posted is not None and (result.newest is None or posted > result.newest):
+                result.newest = posted
+        if normalized:
+            yield normalized
+
+
+async def keyword_stage(chunks: AsyncIterator[Chunk]) -> AsyncIterator[Chunk]:
+    async for chunk in chunks:
+        yield await asyncio.to_thread(keyword_chunk, chunk)
+
+
+async def dedupe_stage(chunks: AsyncIterator[Chunk]) -> AsyncIterator[Chunk]:
+    async for chunk in chunks:
+        # Near-duplicates from other sources fold into one canonical posting.
+        yield await asyncio.to_thread(job_deduplicator.collapse, chunk)
+
+
+def _write_batch(session_factory: Callable[[], Session], batch: Chunk) -> int:
+    with session_factory() as db:
+        written = upsert_jobs(db, batch, seen=seen_postings)
+        db.commit()
+    return written
+
+
+async def write_stage(
+    chunks: AsyncIterator[Chunk],
+    *,
+    session_factory: Callable[[], Session],
+    result: PipelineResult,
+) -> PipelineResult:
+    """Index postings as they arrive and write them in INGEST_BATCH_SIZE batches."""
+    batch: Chunk = []
+
+    async def _flush() -> None:
+        nonlocal batch
+        if batch:
+            pending, batch = batch, []
+            result.written += await asyncio.to_thread(_write_batch, session_factory, pending)
+
+    async for chunk in chunks:
+        await asyncio.to_thread(job_index.upsert_many, chunk)
+        batch.extend(chunk)
+        if len(batch) >= settings.INGEST_BATCH_SIZE:
+            await _flush()
+    await _flush()
+    return result
+
+
+async def ingest_chunks(
+    chunks: AsyncIterator[Chunk],
+    *,
+    source: str,
+    since: Optional[datetime] = None,
+    session_factory: Callable[[], Session],
+) -> PipelineResult:
+    """normalize -> keyword-extract -> dedupe -> batched write over chunks of raw postings."""
+    result = PipelineResult()
+    chunks = buffered(normalize_stage(chunks, source=source, since=since, result=result))
+    chunks = buffered(keyword_stage(chunks))
+    chunks = buffered(dedupe_stage(chunks))
+    return await write_stage(chunks, session_factory=session_factory, result=result)
+
+
+async def run_pipeline(
+    adapter: Any,
+    *,
+    since: Optional[datetime],
+    limits: List[asyncio.Semaphore],
+    session_factory: Callable[[], Session],
+) -> PipelineResult:
+    """fetch -> normalize -> keyword-extract -> dedupe -> batched write, with a bounded queue per hop."""
+    return await ingest_chunks(
+        fetch_stage(adapter, since=since, limits=limits),
+        source=getattr(adapter, "source", "unknown"),
+        since=since,
+        session_factory=session_factory,
+    )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ...core.config import settings
+
+# How far one poll may move a source's interval, so a single burst or lull
+# cannot swing it from one bound to the other.
+_MIN_STEP = 0.5
+_MAX_STEP = 2.0
+
+
+@dataclass(slots=True)
+class SourcePolling:
+    interval: float
+    rate: Optional[float] = None
+    failures: int = 0
+
+
+class AdaptivePollPolicy:
+    """Per-source poll intervals driven by each source's observed change rate.
+
+    ``rate`` is an exponentially smoothed count of new postings per poll. The
+    next interval aims for ``INGEST_POLL_TARGET_NEW`` new postings per poll:
+    busy boards are polled more often, quiet ones back off, both within
+    ``INGEST_MIN_INTERVAL_MINUTES`` and ``INGEST_MAX_INTERVAL_MINUTES``.
+    Failed polls back off as well rather than hammering a broken upstream.
+    """
+
+    def __init__(self, smoothing: float = 0.5) -> None:
+        self.smoothing = smoothing
+        self._sources: Dict[str, SourcePolling] = {}
+
+    def _state(self, source: str) -> SourcePolling:
+        state = self._sources.get(source)
+        if state is None:
+            state = self._sources[source] = SourcePolling(interval=settings.INGEST_INTERVAL_MINUTES * 60.0)
+        return state
+
+    def _clamp(self, seconds: float) -> float:
+        low = settings.INGEST_MIN_INTERVAL_MINUTES * 60.0
+        high = max(settings.INGEST_MAX_INTERVAL_MINUTES * 60.0, low)
+        return min(max(seconds, low), high)
+
+    def interval(self, source: str) -> float:
+        """Seconds until ``source`` should be polled again."""
+        return self._clamp(self._state(source).interval)
+
+    def observe(self, source: str, new_postings: int) -> float:
+        """Record a successful poll and return the next interval in seconds."""
+        state = self._state(source)
+        if state.rate is None:
+            state.rate = float(new_postings)
+        else:
+            state.rate = self.smoothing * new_postings + (1 - self.smoothing) * state.rate
+        state.failures = 0
+
+        step = settings.INGEST_POLL_TARGET_NEW / state.rate if state.rate > 0 else _MAX_STEP
+        state.interval = self._clamp(state.interval * min(max(step, _MIN_STEP), _MAX_STEP))
+        return state.interval
+
+    def failed(self, source: str) -> float:
+        """Record a failed poll and return the backed-off interval in seconds."""
+        state = self._state(source)
+        state.failures += 1
+        state.interval = self._clamp(state.interval * _MAX_STEP)
+        return state.interval
+
+    def reset(self, source: str, seconds: float) -> None:
+        self._sources[source] = SourcePolling(interval=seconds)
+
+    def snapshot(self, source: str) -> Dict[str, float | int | None]:
+        state = self._state(source)
+        return {"interval_s": round(self.interval(source), 1), "rate": state.rate, "failures": state.failures}
+
+    def clear(self) -> None:
+        self._sources.clear()
+
+
+poll_policy = AdaptivePollPolicy()
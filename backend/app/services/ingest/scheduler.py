@@ -1,51 +1,350 @@
-from sqlalchemy import select
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from apscheduler.events import EVENT_JOB_MISSED, JobExecutionEvent
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+from redis.asyncio import Redis
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
-from ...core.db import AsyncSessionLocal
-from ...models import Job
+from ...core.cache import redis_client
+from ...core.config import settings
+from ...core.db import SessionLocal
+from ...models import Job, JobArchive
+from ..search import job_index
 from .adapters import ADAPTERS
+from .bloom import seen_postings
+from .dedupe import job_deduplicator
+from .leader import LeaderLease
+from .lifecycle import compact_index, forget_postings, run_lifecycle
+from .pipeline import run_pipeline
+from .polling import poll_policy
+from .store import iter_archived, iter_jobs, iter_seen_rows, jobs_snapshot, load_watermarks, save_watermark
 
+logger = logging.getLogger(__name__)
+
+# Per-source request limits, shared by every run in this process.
+_source_limits: Dict[str, asyncio.Semaphore] = {}
+_overall: Optional[asyncio.Semaphore] = None
+
+
+def _source_limit(adapter: Any) -> asyncio.Semaphore:
+    source = getattr(adapter, "source", "unknown")
+    limit = _source_limits.get(source)
+    if limit is None:
+        size = getattr(adapter, "max_concurrency", None) or settings.INGEST_SOURCE_CONCURRENCY
+        limit = _source_limits[source] = asyncio.Semaphore(size)
+    return limit
+
+
+def _overall_limit() -> asyncio.Semaphore:
+    global _overall
+    if _overall is None:
+        _overall = asyncio.Semaphore(settings.INGEST_CONCURRENCY)
+    return _overall
 
-async def ingest_once() -> None:
-    """
-    Fetch jobs from all adapters and upsert new ones.
-    """
-    async with AsyncSessionLocal() as db:
-        for adapter in ADAPTERS:
-            jobs = await adapter.fetch()
 
-            for j in jobs:
-                # Check if a job with same title/company/url already exists
-                res = await db.execute(
-                    select(Job.id).where(
-                        Job.title == j["title"],
-                        Job.company == j["company"],
-                        Job.apply_url == j["apply_url"],
-                    )
-                )
+def _load_watermarks() -> Dict[str, datetime]:
+    with SessionLocal() as db:
+        return load_watermarks(db)
 
-                if res.scalar() is not None:
-                    continue
 
-                db.add(Job(**j))
+def _save_watermark(source: str, newest: datetime) -> None:
+    with SessionLocal() as db:
+        save_watermark(db, source, newest)
+        db.commit()
+
+
+async def _ingest_source(adapter: Any, since: Optional[datetime], overall: asyncio.Semaphore) -> int:
+    result = await run_pipeline(
+        adapter,
+        since=since,
+        limits=[_source_limit(adapter), overall],
+        session_factory=SessionLocal,
+    )
+    # Only move the watermark once everything up to it has been written.
+    if result.newest is not None and result.newest != since:
+        await asyncio.to_thread(_save_watermark, adapter.source, result.newest)
+    return result.written
+
+
+async def ingest_once() -> Dict[str, Any]:
+    """
+    Stream new postings from all adapters concurrently through the ingest pipeline,
+    which indexes them and upserts them in batches. Each source only returns postings
+    newer than its persisted watermark, and a failing source does not hold up the others.
+    Returns the rows written per source, or the error message for sources that failed.
+    """
+    watermarks = await asyncio.to_thread(_load_watermarks)
+    overall = asyncio.Semaphore(settings.INGEST_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_ingest_source(adapter, watermarks.get(adapter.source), overall) for adapter in ADAPTERS),
+        return_exceptions=True,
+    )
+    summary: Dict[str, Any] = {}
+    for adapter, result in zip(ADAPTERS, results):
+        if isinstance(result, BaseException):
+            logger.warning(
+                "ingest_source_failed",
+                extra={"source": adapter.source, "error": str(result)},
+                exc_info=result,
+            )
+            summary[adapter.source] = f"error: {result}"
+        else:
+            summary[adapter.source] = result
+    return summary
 
-        await db.commit()
 
+# --------------------------------------------------------------------------------------
+#                          Leader election and index sync
+# --------------------------------------------------------------------------------------
+LEADER_KEY = "jobs:ingest:leader"
+STATUS_KEY = "jobs:ingest:status"
 
 # A single scheduler instance for the process
 scheduler = AsyncIOScheduler()
+_lease: Optional[LeaderLease] = None
+_synced_until: Optional[datetime] = None
+_archived_until: Optional[datetime] = None
 
 
-def start_scheduler(interval_min: int = 10) -> None:
+async def _get_lease() -> LeaderLease:
+    global _lease
+    if _lease is None:
+        _lease = LeaderLease(await redis_client(), LEADER_KEY, settings.INGEST_LEADER_TTL_SECONDS)
+    return _lease
+
+
+async def _renew_lease() -> None:
+    lease = await _get_lease()
+    try:
+        await lease.acquire()
+    except Exception:  # pragma: no cover - Redis outages only delay failover
+        logger.warning("leader_lease_renew_failed", exc_info=True)
+
+
+async def _record_status(redis: Redis, *path: str, **fields: Any) -> None:
+    try:
+        raw = await redis.get(STATUS_KEY)
+        status = json.loads(raw) if raw else {}
+        section = status
+        for name in path:
+            section = section.setdefault(name, {})
+        section.update(fields)
+        await redis.set(STATUS_KEY, json.dumps(status, default=str))
+    except Exception:  # pragma: no cover - status is informational
+        logger.warning("ingest_status_write_failed", exc_info=True)
+
+
+def _job_id(source: str) -> str:
+    return f"jobs_ingest:{source}"
+
+
+def _schedule_source(source: str, seconds: float) -> None:
+    # Jitter keeps replicas and sources with equal intervals from polling in lockstep.
+    trigger = IntervalTrigger(seconds=seconds, jitter=seconds * settings.INGEST_POLL_JITTER)
+    if scheduler.get_job(_job_id(source)) is not None:
+        scheduler.reschedule_job(_job_id(source), trigger=trigger)
+        return
+    scheduler.add_job(
+        poll_source,
+        trigger=trigger,
+        args=[source],
+        id=_job_id(source),
+        replace_existing=True,
+        # A late poll (a stalled loop, a suspended container) runs once rather than in a burst.
+        coalesce=True,
+        max_instances=1,
+        misfire_grace_time=settings.INGEST_MISFIRE_GRACE_SECONDS,
+    )
+
+
+async def poll_source(source: str) -> bool:
     """
-    Start or refresh the ingest job on a fixed interval.
-    If the job already exists, it will be replaced.
+    Ingest one source if this process holds (or can take) the lease, then
+    reschedule it from the change rate it showed. Followers keep polling the
+    lease on their current interval so they can take over when it expires.
     """
+    lease = await _get_lease()
+    if not await lease.acquire():
+        return False
+    adapter = next(adapter for adapter in ADAPTERS if adapter.source == source)
+
+    started = time.time()
+    await _record_status(lease.redis, "sources", source, leader=lease.token, last_started_at=started, running=True)
+    try:
+        watermarks = await asyncio.to_thread(_load_watermarks)
+        written = await _ingest_source(adapter, watermarks.get(source), _overall_limit())
+    except Exception as exc:
+        logger.warning("ingest_source_failed", extra={"source": source, "error": str(exc)}, exc_info=exc)
+        interval, written, error = poll_policy.failed(source), None, str(exc)
+    else:
+        interval, error = poll_policy.observe(source, written), None
+    if scheduler.running:
+        _schedule_source(source, interval)
+    await asyncio.to_thread(_save_seen)
+    await _record_status(
+        lease.redis,
+        "sources",
+        source,
+        leader=lease.token,
+        running=False,
+        last_finished_at=time.time(),
+        last_duration_ms=round((time.time() - started) * 1000, 1),
+        written=written,
+        last_error=error,
+        **poll_policy.snapshot(source),
+    )
+    return True
+
+
+async def run_lifecycle_if_leader() -> bool:
+    """Archive stale postings and compact the index, on the lease holder only."""
+    lease = await _get_lease()
+    if not await lease.acquire():
+        return False
+    started = time.time()
+    try:
+        result = await run_lifecycle(SessionLocal, ADAPTERS)
+    except Exception as exc:
+        logger.warning("job_lifecycle_failed", extra={"error": str(exc)}, exc_info=exc)
+        await _record_status(lease.redis, "lifecycle", last_finished_at=time.time(), last_error=str(exc))
+        return True
+    await _record_status(
+        lease.redis,
+        "lifecycle",
+        last_finished_at=time.time(),
+        last_duration_ms=round((time.time() - started) * 1000, 1),
+        last_error=None,
+        expired=result.expired,
+        removed=result.removed,
+        compacted=result.compacted,
+    )
+    return True
+
+
+def _on_missed(event: JobExecutionEvent) -> None:
+    logger.warning(
+        "ingest_poll_missed",
+        extra={"job_id": event.job_id, "scheduled_at": str(event.scheduled_run_time)},
+    )
+
+
+scheduler.add_listener(_on_missed, EVENT_JOB_MISSED)
+
+
+def _rebuild_seen(db: Session) -> None:
+    snapshot = jobs_snapshot(db)
+    if seen_postings.restore(**snapshot):
+        return
+    seen_postings.reset(snapshot["rows"])
+    for rows in iter_seen_rows(db):
+        seen_postings.add(rows)
+    logger.info("seen_filter_rebuilt", extra=seen_postings.stats())
+
+
+def _save_seen() -> None:
+    with SessionLocal() as db:
+        snapshot = jobs_snapshot(db)
+    seen_postings.save(**snapshot)
+
+
+def _load_index(
+    updated_after: Optional[datetime], archived_after: Optional[datetime]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    with SessionLocal() as db:
+        newest = db.scalar(select(func.max(Job.updated_at)))
+        newest_archived = db.scalar(select(func.max(JobArchive.archived_at)))
+        if updated_after is None:
+            _rebuild_seen(db)
+        else:
+            # Drop what the leader archived since the last sync before loading new rows.
+            for archived in iter_archived(db, archived_after=archived_after):
+                forget_postings(archived)
+            # Followers keep their filter current too, in case they take over.
+            for rows in iter_seen_rows(db, updated_after=updated_after):
+                seen_postings.add(rows)
+        for postings in iter_jobs(db, updated_after=updated_after):
+            job_index.upsert_many(job_deduplicator.collapse(postings))
+    return newest, newest_archived
+
+
+async def sync_index() -> None:
+    """Bring this process' index in line with the jobs table: load new rows, drop archived ones."""
+    global _synced_until, _archived_until
+    # The leader runs it too: bulk loads and other workers write rows it did not ingest, and
+    # re-reading its own postings leaves them in place.
+    newest, newest_archived = await asyncio.to_thread(_load_index, _synced_until, _archived_until)
+    _synced_until = newest or _synced_until
+    _archived_until = newest_archived or _archived_until
+    compact_index()
+
+
+async def ingest_status(redis: Redis) -> Dict[str, Any]:
+    """Ingest state for readiness probes: this process' role, the lease holder and the last run."""
+    holder = await redis.get(LEADER_KEY)
+    raw = await redis.get(STATUS_KEY)
+    if not scheduler.running:
+        role = "disabled"
+    else:
+        role = "leader" if _lease is not None and holder == _lease.token else "follower"
+    return {
+        "role": role,
+        "leader": holder,
+        "last_run": json.loads(raw) if raw else None,
+        "seen_filter": seen_postings.stats(),
+    }
+
+
+def start_scheduler(interval_min: int | None = None) -> None:
+    """
+    Start or refresh the ingest jobs: one poll per source, each on its own
+    adaptive interval. Every process schedules them, but only the lease holder
+    ingests; the others keep their search index in sync from the DB.
+    ``interval_min`` overrides the starting interval; existing jobs are replaced.
+    """
+    for adapter in ADAPTERS:
+        if interval_min is not None:
+            poll_policy.reset(adapter.source, interval_min * 60.0)
+        _schedule_source(adapter.source, poll_policy.interval(adapter.source))
+    # Renew well within the TTL so a slow ingest run never loses the lease.
     scheduler.add_job(
-        ingest_once,
+        _renew_lease,
         trigger="interval",
-        minutes=interval_min,
-        id="jobs_ingest",
+        seconds=max(settings.INGEST_LEADER_TTL_SECONDS // 3, 1),
+        id="jobs_ingest_lease",
         replace_existing=True,
     )
-    scheduler.start()
+    scheduler.add_job(
+        run_lifecycle_if_leader,
+        trigger="interval",
+        minutes=settings.JOB_LIFECYCLE_INTERVAL_MINUTES,
+        id="jobs_lifecycle",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+    scheduler.add_job(
+        sync_index,
+        trigger="interval",
+        seconds=settings.INGEST_INDEX_SYNC_SECONDS,
+        id="jobs_index_sync",
+        replace_existing=True,
+    )
+    if not scheduler.running:
+        scheduler.start()
+
+
+async def stop_scheduler() -> None:
+    """Stop scheduling and hand the lease over so another process can take it at once."""
+    global _lease
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    if _lease is not None:
+        await _lease.release()
+        _lease = None
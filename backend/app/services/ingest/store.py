@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from ...models import IngestWatermark, Job, JobArchive
+from ..search.text import normalize_text
+
+if TYPE_CHECKING:
+    from .bloom import SeenPostings
+
+# Columns refreshed when a posting with a known content hash is ingested again.
+UPDATABLE_COLUMNS: tuple[str, ...] = (
+    "source",
+    "location",
+    "salary_low",
+    "salary_high",
+    "currency",
+    "job_type",
+    "experience_level",
+    "industry",
+    "education_level",
+    "work_mode",
+    "posted_date",
+    "description",
+    "alternate_sources",
+    "row_hash",
+)
+# Enough of a posting to find it again in the search index and deduplicator.
+_KEY_COLUMNS: tuple[str, ...] = ("source", "apply_url", "title", "company")
+_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def content_hash(posting: Mapping[str, Any]) -> str:
+    """Identity of a posting across runs: its normalized title, company and apply URL."""
+    parts = (
+        normalize_text(posting.get("title")),
+        normalize_text(posting.get("company")),
+        (posting.get("apply_url") or "").strip(),
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _datetime(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, str) and value:
+        try:
+            return _datetime(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            return None
+    return None
+
+
+def row_hash(row: Mapping[str, Any]) -> str:
+    """Version of a ``jobs`` row: changes whenever any stored column does."""
+    payload = json.dumps([[name, row[name]] for name in sorted(row) if name != "row_hash"], default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def job_row(posting: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map an adapter posting onto ``jobs`` columns."""
+    row = {
+        "content_hash": content_hash(posting),
+        "source": posting.get("source"),
+        "title": posting.get("title") or "Untitled role",
+        "company": posting.get("company") or "Unknown company",
+        "location": posting.get("location"),
+        "salary_low": posting.get("salary_low"),
+        "salary_high": posting.get("salary_high"),
+        "currency": posting.get("currency"),
+        "job_type": posting.get("job_type"),
+        "experience_level": posting.get("experience_level"),
+        "industry": posting.get("industry"),
+        "education_level": posting.get("education_level"),
+        "work_mode": posting.get("work_mode"),
+        "posted_date": posted_at(posting),
+        "apply_url": posting.get("apply_url"),
+        "description": posting.get("description"),
+        "alternate_sources": list(posting.get("alternate_sources") or []),
+    }
+    row["row_hash"] = row_hash(row)
+    return row
+
+
+def posted_at(posting: Mapping[str, Any]) -> datetime | None:
+    return _datetime(posting.get("posted_date"))
+
+
+def _dialect_insert(db: Session) -> Any:
+    dialect = db.get_bind().dialect.name
+    insert = _INSERTS.get(dialect)
+    if insert is None:
+        raise RuntimeError(f"Upserts are not supported on {dialect}")
+    return insert
+
+
+def job_posting(job: Job) -> Dict[str, Any]:
+    """Turn a ``jobs`` row back into the posting dict the search index expects."""
+    columns = ("title", "company", "apply_url", *(name for name in UPDATABLE_COLUMNS if name != "row_hash"))
+    posting = {name: getattr(job, name) for name in columns}
+    posting["alternate_sources"] = list(job.alternate_sources or [])
+    return posting
+
+
+def iter_jobs(
+    db: Session,
+    *,
+    updated_after: datetime | None = None,
+    batch_size: int | None = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Stream stored postings in batches, optionally only those written since ``updated_after``."""
+    size = batch_size or settings.INGEST_BATCH_SIZE
+    stmt = select(Job).order_by(Job.id).execution_options(yield_per=size)
+    if updated_after is not None:
+        # Timestamps may be stored at whole-second resolution; re-reading a row is harmless.
+        stmt = stmt.where(Job.updated_at >= updated_after - timedelta(seconds=1))
+    for jobs in db.scalars(stmt).partitions(size):
+        yield [job_posting(job) for job in jobs]
+
+
+def iter_seen_rows(
+    db: Session,
+    *,
+    updated_after: datetime | None = None,
+    batch_size: int | None = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Stream the row hash of stored postings, for filling ``SeenPostings``."""
+    size = batch_size or settings.INGEST_BATCH_SIZE
+    stmt = (
+        select(Job.row_hash)
+        .where(Job.row_hash.is_not(None))
+        .order_by(Job.id)
+        .execution_options(yield_per=size)
+    )
+    if updated_after is not None:
+        stmt = stmt.where(Job.updated_at >= updated_after - timedelta(seconds=1))
+    for rows in db.execute(stmt).partitions(size):
+        yield [{"row_hash": value} for (value,) in rows]
+
+
+def jobs_snapshot(db: Session) -> Dict[str, Any]:
+    """Row count and newest write, enough to tell whether a saved ``SeenPostings`` is current."""
+    rows, newest = db.execute(select(func.count(Job.id), func.max(Job.updated_at))).one()
+    return {"rows": rows, "newest": newest}
+
+
+def upsert_jobs(
+    db: Session,
+    postings: Iterable[Mapping[str, Any]],
+    *,
+    batch_size: int | None = None,
+    seen: SeenPostings | None = None,
+) -> int:
+    """Write postings with one ``INSERT ... ON CONFLICT DO UPDATE`` executemany per batch.
+
+    Rows are keyed on ``content_hash``; the caller commits. With ``seen``, rows
+    already stored in the same version are skipped: only postings the filter
+    may have seen are looked up, all others are written straight away.
+    Returns the number of rows sent.
+    """
+    insert = _dialect_insert(db)
+    size = batch_size or settings.INGEST_BATCH_SIZE
+
+    written = 0
+    batch: Dict[str, Dict[str, Any]] = {}
+    for posting in postings:
+        row = job_row(posting)
+        # A statement may not touch the same row twice; the last copy wins.
+        batch[row["content_hash"]] = row
+        if len(batch) >= size:
+            written += _write_batch(db, insert, list(batch.values()), seen)
+            batch = {}
+    if batch:
+        written += _write_batch(db, insert, list(batch.values()), seen)
+    return written
+
+
+def _unchanged(db: Session, rows: List[Dict[str, Any]], seen: SeenPostings) -> set[str]:
+    hashes = [row["row_hash"] for row in rows]
+    maybe = [value for value, hit in zip(hashes, seen.might_contain(hashes)) if hit]
+    if not maybe:
+        return set()
+    return set(db.scalars(select(Job.row_hash).where(Job.row_hash.in_(maybe))))
+
+
+def _write_batch(db: Session, insert: Any, rows: List[Dict[str, Any]], seen: SeenPostings | None = None) -> int:
+    if seen is not None:
+        unchanged = _unchanged(db, rows, seen)
+        rows = [row for row in rows if row["row_hash"] not in unchanged]
+        if not rows:
+            return 0
+    stmt = insert(Job)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Job.content_hash],
+        set_={name: getattr(stmt.excluded, name) for name in UPDATABLE_COLUMNS} | {"updated_at": func.now()},
+    )
+    # One executemany per batch: the statement compiles once (and stays cached) and
+    # the driver batches the parameter sets instead of one round trip per row.
+    db.execute(stmt, rows)
+    if seen is not None:
+        # Added before commit: a rollback only leaves false positives, which the lookup catches.
+        seen.add(rows)
+    return len(rows)
+
+
+def archive_jobs(db: Session, job_ids: List[int], reason: str) -> List[Dict[str, Any]]:
+    """Move ``jobs`` rows into ``jobs_archive`` with one INSERT ... SELECT and one DELETE.
+
+    The caller commits. Returns the archived postings' key fields so they can
+    be dropped from the in-memory search structures.
+    """
+    if not job_ids:
+        return []
+    key_columns = [getattr(Job, name) for name in _KEY_COLUMNS]
+    archived = [dict(zip(_KEY_COLUMNS, row)) for row in db.execute(select(*key_columns).where(Job.id.in_(job_ids)))]
+    copied = ["content_hash", "title", "company", "apply_url", "created_at", "updated_at", *UPDATABLE_COLUMNS]
+    rows = select(Job.id, *(getattr(Job, name) for name in copied), literal(reason)).where(Job.id.in_(job_ids))
+    db.execute(insert(JobArchive).from_select(["job_id", *copied, "archive_reason"], rows))
+    db.execute(delete(Job).where(Job.id.in_(job_ids)).execution_options(synchronize_session=False))
+    return archived
+
+
+def iter_archived(
+    db: Session,
+    *,
+    archived_after: datetime | None = None,
+    batch_size: int | None = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Stream key fields of postings archived since ``archived_after``, for replicas to drop them too."""
+    size = batch_size or settings.INGEST_BATCH_SIZE
+    stmt = select(*(getattr(JobArchive, name) for name in _KEY_COLUMNS)).order_by(JobArchive.id)
+    if archived_after is not None:
+        stmt = stmt.where(JobArchive.archived_at >= archived_after - timedelta(seconds=1))
+    for rows in db.execute(stmt.execution_options(yield_per=size)).partitions(size):
+        yield [dict(zip(_KEY_COLUMNS, row)) for row in rows]
+
+
+def load_watermarks(db: Session) -> Dict[str, datetime]:
+    rows = db.execute(select(IngestWatermark.source, IngestWatermark.last_posted_at))
+    return {source: _datetime(value) for source, value in rows if value is not None}
+
+
+def save_watermark(db: Session, source: str, last_posted_at: datetime) -> None:
+    """Record the newest posting ingested from ``source``; the caller commits."""
+    stmt = _dialect_insert(db)(IngestWatermark).values(source=source, last_posted_at=last_posted_at)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IngestWatermark.source],
+        set_={"last_posted_at": stmt.excluded.last_posted_at, "updated_at": func.now()},
+    )
+    db.execute(stmt)
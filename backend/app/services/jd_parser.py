@@ -1,21 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
 import httpx
 from bs4 import BeautifulSoup
+from redis.asyncio import Redis
 
+from ..core.cache import redis_client
+from ..core.config import settings
+from ..core.http_client import http_client
 
-async def fetch_and_parse_jd(url: str) -> str:
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get(url, follow_redirects=True, headers={"User-Agent": "Mozilla/5.0"})
-        r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-    for sel in [
-        "div#content",
-        "div#job",
-        "div.content",
-        "div.body",
-        "section",
-        "article",
-    ]:
+try:
+    import lxml  # noqa: F401  (C tree builder for BeautifulSoup)
+except ImportError:  # pragma: no cover - optional dependency
+    HTML_FEATURES = "html.parser"
+else:
+    HTML_FEATURES = "lxml"
+
+logger = logging.getLogger(__name__)
+
+_PAGE_KEY = "jd:page:{digest}"
+_SELECTORS = ["div#content", "div#job", "div.content", "div.body", "section", "article"]
+
+
+def extract_jd_text(html: str) -> str:
+    soup = BeautifulSoup(html, HTML_FEATURES)
+    for sel in _SELECTORS:
         node = soup.select_one(sel)
         if node and len(node.get_text(strip=True)) > 200:
             return node.get_text("\n", strip=True)
     return soup.get_text("\n", strip=True)
+
+
+def _body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+async def _read(redis: Redis, key: str) -> Optional[Dict[str, Any]]:
+    try:
+        raw = await redis.get(key)
+    except Exception:  # pragma: no cover - cache is best-effort
+        logger.warning("jd_cache_read_failed", extra={"key": key}, exc_info=True)
+        return None
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+async def _write(redis: Redis, key: str, entry: Dict[str, Any]) -> None:
+    try:
+        await redis.setex(key, settings.JD_CACHE_TTL_SECONDS, json.dumps(entry))
+    except Exception:  # pragma: no cover - cache is best-effort
+        logger.warning("jd_cache_write_failed", extra={"key": key}, exc_info=True)
+
+
+async def fetch_and_parse_jd(
+    url: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+    redis: Redis | None = None,
+) -> str:
+    """Fetch a job page and return its JD text.
+
+    The page's ETag, Last-Modified and body hash are cached in Redis with the
+    extracted text, so a repeat fetch is a conditional GET: a 304, or a 200
+    with the same body, returns the cached text without parsing the page.
+    """
+    if redis is None and settings.JD_CACHE_TTL_SECONDS:
+        redis = await redis_client()
+    key = _PAGE_KEY.format(digest=hashlib.sha1(url.encode("utf-8")).hexdigest())
+    cached = await _read(redis, key) if redis is not None else None
+
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    if client is None:
+        async with http_client(timeout=20) as own_client:
+            r = await own_client.get(url, follow_redirects=True, headers=headers)
+    else:
+        r = await client.get(url, follow_redirects=True, headers=headers)
+
+    etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    if cached and r.status_code == 304:
+        text = cached["text"]
+        body_hash = cached["body_hash"]
+        # A 304 may carry fresh validators; keep the old ones otherwise.
+        etag = etag or cached.get("etag")
+        last_modified = last_modified or cached.get("last_modified")
+    else:
+        r.raise_for_status()
+        body_hash = _body_hash(r.content)
+        text = cached["text"] if cached and cached.get("body_hash") == body_hash else extract_jd_text(r.text)
+
+    if redis is not None:
+        entry = {"etag": etag, "last_modified": last_modified, "body_hash": body_hash, "text": text}
+        await _write(redis, key, entry)
+    return text
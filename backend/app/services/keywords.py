@@ -0,0 +1,45 @@
+import re
+from typing import Any, List, Mapping
+
+
+def extract_keywords(job_text: str) -> List[str]:
+    tokens = re.findall(r"[A-Za-z][A-Za-z0-9+\-#\.]{2,}", job_text)
+    seen, out = set(), []
+    signals = [
+        "sql",
+        "python",
+        "snowflake",
+        "azure",
+        "aws",
+        "gcp",
+        "power",
+        "tableau",
+        "dbt",
+        "spark",
+        "bi",
+        "etl",
+        "api",
+        "databricks",
+        "fabric",
+        "airflow",
+        "kafka",
+    ]
+    for t in tokens:
+        k = t.strip(",.;:()[]{}").strip()
+        kl = k.lower()
+        if kl in seen:
+            continue
+        if k.isupper() or any(s in kl for s in signals):
+            out.append(k)
+            seen.add(kl)
+        if len(out) >= 40:
+            break
+    return out
+
+
+def posting_keywords(posting: Mapping[str, Any]) -> List[str]:
+    """Keywords of a posting's description, reusing the ones ingest already extracted."""
+    keywords = posting.get("keywords")
+    if keywords is None:
+        keywords = extract_keywords(posting.get("description") or "")
+    return list(keywords)
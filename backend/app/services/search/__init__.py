@@ -0,0 +1,7 @@
+"""In-process search structures backing the job search endpoints."""
+
+from .facets import FACET_FIELDS, FacetIndex
+from .index import JobIndex, SearchResult, job_index, job_key
+from .text import tokenize
+
+__all__ = ["FACET_FIELDS", "FacetIndex", "JobIndex", "SearchResult", "job_index", "job_key", "tokenize"]
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from redis.asyncio import Redis
+
+from ...core.config import settings
+from .fanout import SourceReport, SourceStatus, fetch_adapter
+from .text import tokenize
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_KEY = "jobs:adapter:{source}:{digest}"
+_LOCK_KEY = "jobs:adapter:lock:{source}:{digest}"
+_WAIT_STEP_SECONDS = 0.05
+
+# Misses currently being fetched by this process, keyed by cache key. The tasks
+# belong to no single caller, so one caller's cancellation cannot fail the others.
+_inflight: Dict[str, asyncio.Task] = {}
+# Strong references so background refreshes are not garbage collected mid-flight.
+_background: Set[asyncio.Task] = set()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def normalize_request(query: str | None, location: str | None) -> str:
+    return " ".join(tokenize(query)) + "|" + " ".join(tokenize(location))
+
+
+def _digest(query: str | None, location: str | None) -> str:
+    return hashlib.sha1(normalize_request(query, location).encode("utf-8")).hexdigest()
+
+
+def _forget(key: str, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        # Retrieved here so a failure every waiter gave up on is not logged as unhandled.
+        task.exception()
+
+
+class AdapterResultCache:
+    """Shared cache of adapter results with stale-while-revalidate and request coalescing.
+
+    Entries live in Redis for ``ttl + stale_ttl`` seconds. Fresh entries are
+    served as-is, stale ones are served while one worker refreshes them in the
+    background, and concurrent misses for the same key share one upstream call:
+    in-process through a shared task, across workers through a short Redis lock.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        ttl: int | None = None,
+        stale_ttl: int | None = None,
+    ) -> None:
+        self.redis = redis
+        self.ttl = ttl if ttl is not None else settings.ADAPTER_CACHE_TTL_SECONDS
+        self.stale_ttl = stale_ttl if stale_ttl is not None else settings.ADAPTER_CACHE_STALE_SECONDS
+        self.lock_ttl = max(int(settings.ADAPTER_TIMEOUT_MS / 1000) + 1, 1)
+
+    async def fetch(
+        self,
+        adapter: Any,
+        *,
+        query: str,
+        location: str,
+        deadline: float,
+    ) -> Tuple[List[Dict[str, Any]], SourceReport]:
+        source = getattr(adapter, "source", "unknown")
+        digest = _digest(query, location)
+        key = _ENTRY_KEY.format(source=source, digest=digest)
+
+        entry = await self._read(key)
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age <= self.ttl:
+                return entry["items"], SourceReport(source=source, status=SourceStatus.ok, cache="hit")
+            if await self._acquire_lock(source, digest):
+                self._spawn_refresh(adapter, key, query=query, location=location)
+            return entry["items"], SourceReport(source=source, status=SourceStatus.ok, cache="stale")
+
+        task = _inflight.get(key)
+        if task is not None:
+            items, report = await asyncio.shield(task)
+            return items, SourceReport(source=source, status=report.status, cache="coalesced")
+
+        task = asyncio.get_running_loop().create_task(
+            self._load_miss(adapter, key, digest, query=query, location=location, deadline=deadline)
+        )
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _forget(key, done))
+        return await asyncio.shield(task)
+
+    async def _load_miss(
+        self,
+        adapter: Any,
+        key: str,
+        digest: str,
+        *,
+        query: str,
+        location: str,
+        deadline: float,
+    ) -> Tuple[List[Dict[str, Any]], SourceReport]:
+        source = getattr(adapter, "source", "unknown")
+        if not await self._acquire_lock(source, digest):
+            # Another worker is fetching the same key; give it until the deadline.
+            loop = asyncio.get_running_loop()
+            while loop.time() + _WAIT_STEP_SECONDS < deadline:
+                await asyncio.sleep(_WAIT_STEP_SECONDS)
+                entry = await self._read(key)
+                if entry is not None:
+                    return entry["items"], SourceReport(source=source, status=SourceStatus.ok, cache="coalesced")
+            # The source was never queried here, so this says nothing about it to the breaker.
+            return [], SourceReport(source=source, status=SourceStatus.timeout, cache="coalesced")
+
+        try:
+            items, report = await fetch_adapter(adapter, query=query, location=location, deadline=deadline)
+            report.cache = "miss"
+            if report.status == SourceStatus.ok:
+                await self._write(key, items)
+            return items, report
+        finally:
+            await self._release_lock(source, digest)
+
+    def _spawn_refresh(self, adapter: Any, key: str, *, query: str, location: str) -> None:
+        async def _refresh() -> None:
+            source = getattr(adapter, "source", "unknown")
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.ADAPTER_TIMEOUT_MS / 1000
+            items, report = await fetch_adapter(adapter, query=query, location=location, deadline=deadline)
+            if report.status == SourceStatus.ok:
+                await self._write(key, items)
+            await self._release_lock(source, _digest(query, location))
+
+        task = asyncio.get_running_loop().create_task(_refresh())
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+
+    async def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self.redis.get(key)
+        except Exception:  # pragma: no cover - cache is best-effort
+            logger.warning("adapter_cache_read_failed", extra={"key": key}, exc_info=True)
+            return None
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    async def _write(self, key: str, items: List[Dict[str, Any]]) -> None:
+        payload = json.dumps({"fetched_at": time.time(), "items": items}, default=_json_default)
+        try:
+            await self.redis.setex(key, self.ttl + self.stale_ttl, payload)
+        except Exception:  # pragma: no cover - cache is best-effort
+            logger.warning("adapter_cache_write_failed", extra={"key": key}, exc_info=True)
+
+    async def _acquire_lock(self, source: str, digest: str) -> bool:
+        try:
+            return bool(
+                await self.redis.set(_LOCK_KEY.format(source=source, digest=digest), "1", nx=True, ex=self.lock_ttl)
+            )
+        except Exception:  # pragma: no cover - cache is best-effort
+            logger.warning("adapter_cache_lock_failed", extra={"source": source}, exc_info=True)
+            return True
+
+    async def _release_lock(self, source: str, digest: str) -> None:
+        try:
+            await self.redis.delete(_LOCK_KEY.format(source=source, digest=digest))
+        except Exception:  # pragma: no cover - cache is best-effort
+            logger.warning("adapter_cache_unlock_failed", extra={"source": source}, exc_info=True)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+from ..keywords import posting_keywords
+from .text import normalize_text
+
+SUGGESTION_KINDS: tuple[str, ...] = ("title", "company", "skill")
+_KIND_CODES = {kind: code for code, kind in enumerate(SUGGESTION_KINDS)}
+# Sorts after every character a normalized key can contain.
+_PREFIX_END = "\uffff"
+
+
+@dataclass(slots=True)
+class Suggestion:
+    text: str
+    kind: str
+    count: int
+
+
+def _phrases(job: Mapping[str, Any]) -> Iterable[Tuple[str, str]]:
+    if job.get("title"):
+        yield "title", job["title"]
+    if job.get("company"):
+        yield "company", job["company"]
+    for keyword in dict.fromkeys(posting_keywords(job)):
+        yield "skill", keyword
+
+
+@dataclass(frozen=True, slots=True)
+class _Snapshot:
+    """What ``suggest`` reads: replaced as a whole by ``compile``, never modified in place
+    (except ``counts``, which ``add``/``remove`` update for phrases it already holds)."""
+
+    keys: List[str]
+    entry_of: np.ndarray
+    texts: List[str]
+    kinds: np.ndarray
+    counts: np.ndarray
+
+
+_EMPTY = _Snapshot([], np.zeros(0, dtype=np.int64), [], np.zeros(0, dtype=np.uint8), np.zeros(0, dtype=np.int64))
+
+
+class Autocomplete:
+    """Frequency-ranked prefix lookup over titles, companies and skills.
+
+    Every phrase is keyed by its normalized form and by each of its word
+    suffixes, so "data eng" and "eng" both reach "Data Engineer". The keys
+    live in one sorted list: a prefix maps to a contiguous slice found with
+    two binary searches, and the counts behind that slice are ranked with
+    argpartition. Counts are updated in place. New phrases only become
+    visible once ``compile`` re-sorts the keys, which writers call after a
+    batch of postings; ``suggest`` reads the last compiled snapshot without
+    taking the lock or copying it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (kind, normalized phrase) -> entry position
+        self._positions: Dict[Tuple[str, str], int] = {}
+        self._texts: List[str] = []
+        self._kinds = array("B")
+        # Grown by doubling; only the first len(self._texts) slots are entries.
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._snapshot = _EMPTY
+        self._dirty = False
+
+    def add(self, job: Mapping[str, Any]) -> None:
+        with self._lock:
+            for kind, phrase in _phrases(job):
+                normalized = normalize_text(phrase)
+                if not normalized:
+                    continue
+                position = self._positions.get((kind, normalized))
+                if position is None:
+                    position = self._positions[(kind, normalized)] = len(self._texts)
+                    self._texts.append(phrase.strip())
+                    self._kinds.append(_KIND_CODES[kind])
+                    if position == self._counts.size:
+                        self._counts = np.concatenate([self._counts, np.zeros(max(position, 64), dtype=np.int64)])
+                    self._dirty = True
+                self._counts[position] += 1
+
+    def remove(self, job: Mapping[str, Any]) -> None:
+        with self._lock:
+            for kind, phrase in _phrases(job):
+                position = self._positions.get((kind, normalize_text(phrase)))
+                if position is not None and self._counts[position] > 0:
+                    # Phrases that drop to zero are skipped and pruned on the next compile.
+                    self._counts[position] -= 1
+
+    def compile(self) -> None:
+        """Publish phrases added since the last compile; a no-op when there are none."""
+        with self._lock:
+            if self._dirty:
+                self._compile_locked()
+
+    def suggest(self, prefix: str, *, limit: int = 10, kinds: Iterable[str] | None = None) -> List[Suggestion]:
+        """Return up to ``limit`` phrases starting with ``prefix``, most frequent first."""
+        needle = normalize_text(prefix)
+        if not needle or limit <= 0:
+            return []
+        snapshot = self._snapshot
+        start = bisect.bisect_left(snapshot.keys, needle)
+        stop = bisect.bisect_left(snapshot.keys, needle + _PREFIX_END, lo=start)
+        if start == stop:
+            return []
+        entries = snapshot.entry_of[start:stop]
+        if kinds:
+            codes = [_KIND_CODES[kind] for kind in kinds if kind in _KIND_CODES]
+            entries = entries[np.isin(snapshot.kinds[entries], codes)]
+        counts = snapshot.counts[entries]
+        live = counts > 0
+        entries, counts = entries[live], counts[live]
+        top = self._top_entries(entries, counts, limit)
+        return [
+            Suggestion(text=snapshot.texts[entry], kind=SUGGESTION_KINDS[snapshot.kinds[entry]], count=int(count))
+            for entry, count in top
+        ]
+
+    @staticmethod
+    def _top_entries(entries: np.ndarray, counts: np.ndarray, limit: int) -> List[Tuple[int, int]]:
+        """``(entry, count)`` of the most frequent distinct entries; ties go to the phrase seen first."""
+        # One sortable key per entry: count first, then the earlier position.
+        span = int(entries.max()) + 2 if entries.size else 1
+        keys = counts * span + (span - 1 - entries)
+        if keys.size > limit * 2:
+            # A phrase can sit in the slice more than once (one key per matching word suffix).
+            picked = np.argpartition(-keys, limit * 2 - 1)[: limit * 2]
+            entries, counts, keys = entries[picked], counts[picked], keys[picked]
+        order = np.argsort(-keys, kind="stable")
+        ranked = dict(zip(entries[order].tolist(), counts[order].tolist()))
+        return list(ranked.items())[:limit]
+
+    def _compile_locked(self) -> None:
+        # Drop phrases no live posting mentions any more before re-sorting.
+        live = [(key, position) for key, position in self._positions.items() if self._counts[position] > 0]
+        self._positions = {key: new for new, (key, _) in enumerate(live)}
+        self._texts = [self._texts[old] for _, old in live]
+        self._kinds = array("B", (self._kinds[old] for _, old in live))
+        counts = np.zeros(max(2 * len(live), 64), dtype=np.int64)
+        counts[: len(live)] = self._counts[[old for _, old in live]]
+        self._counts = counts
+
+        pairs: List[Tuple[str, int]] = []
+        for position, (_, normalized) in enumerate(key for key, _ in live):
+            words = normalized.split(" ")
+            for i in range(len(words)):
+                pairs.append((" ".join(words[i:]), position))
+        pairs.sort()
+        # Readers keep whatever snapshot they already hold; the new one is swapped in whole.
+        self._snapshot = _Snapshot(
+            keys=[key for key, _ in pairs],
+            entry_of=np.fromiter((position for _, position in pairs), dtype=np.int64, count=len(pairs)),
+            texts=self._texts,
+            kinds=np.frombuffer(self._kinds, dtype=np.uint8).copy(),
+            counts=self._counts,
+        )
+        self._dirty = False
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import bisect
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .text import tokenize
+
+FACET_FIELDS: tuple[str, ...] = ("industry", "experience_level", "job_type", "education_level", "work_mode")
+
+
+def bitmap_from_ids(ids: Iterable[int]) -> int:
+    """Pack document ids into an int bitmap (bit ``n`` set for id ``n``)."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buf = bytearray((max(ids) >> 3) + 1)
+    for doc_id in ids:
+        buf[doc_id >> 3] |= 1 << (doc_id & 7)
+    return int.from_bytes(buf, "little")
+
+
+def ids_from_bitmap(bitmap: int) -> List[int]:
+    """Unpack an int bitmap into ascending document ids."""
+    out: List[int] = []
+    if bitmap <= 0:
+        return out
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, "little")
+    for byte_index, byte in enumerate(data):
+        if not byte:
+            continue
+        base = byte_index << 3
+        while byte:
+            low = byte & -byte
+            out.append(base + low.bit_length() - 1)
+            byte ^= low
+    return out
+
+
+def _normalize(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip().casefold()
+    return text or None
+
+
+def posted_timestamp(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class SortedColumn:
+    """Ascending ``(value, doc_id)`` pairs answering range scans as bitmaps."""
+
+    def __init__(self) -> None:
+        self._entries: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, value: float, doc_id: int) -> None:
+        bisect.insort(self._entries, (value, doc_id))
+
+    def remove(self, value: float, doc_id: int) -> None:
+        pos = bisect.bisect_left(self._entries, (value, doc_id))
+        if pos < len(self._entries) and self._entries[pos] == (value, doc_id):
+            del self._entries[pos]
+
+    def range(self, low: float | None = None, high: float | None = None) -> int:
+        start = 0 if low is None else bisect.bisect_left(self._entries, (low, -1))
+        end = len(self._entries) if high is None else bisect.bisect_right(self._entries, (high, float("inf")))
+        return bitmap_from_ids(doc_id for _, doc_id in self._entries[start:end])
+
+
+class FacetIndex:
+    """Per-value bitmaps for categorical facets plus sorted salary/date columns."""
+
+    def __init__(self) -> None:
+        self.live = 0
+        self._bitmaps: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS}
+        self._labels: Dict[str, Dict[str, str]] = {field: {} for field in FACET_FIELDS}
+        self._locations: Dict[str, int] = {}
+        self.salary_low = SortedColumn()
+        self.salary_high = SortedColumn()
+        self.posted = SortedColumn()
+
+    def add(self, doc_id: int, job: Mapping[str, Any]) -> None:
+        bit = 1 << doc_id
+        self.live |= bit
+        for field in FACET_FIELDS:
+            value = _normalize(job.get(field))
+            if value is None:
+                continue
+            bitmaps = self._bitmaps[field]
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+            self._labels[field].setdefault(value, str(job.get(field)).strip())
+        for token in set(tokenize(job.get("location"))):
+            self._locations[token] = self._locations.get(token, 0) | bit
+
+        low, high = self._salary_bounds(job)
+        if low is not None:
+            self.salary_low.add(low, doc_id)
+        if high is not None:
+            self.salary_high.add(high, doc_id)
+        posted = posted_timestamp(job.get("posted_date"))
+        if posted is not None:
+            self.posted.add(posted, doc_id)
+
+    def remove(self, doc_id: int, job: Mapping[str, Any]) -> None:
+        mask = ~(1 << doc_id)
+        self.live &= mask
+        for field in FACET_FIELDS:
+            value = _normalize(job.get(field))
+            bitmaps = self._bitmaps[field]
+            if value in bitmaps:
+                bitmaps[value] &= mask
+                if not bitmaps[value]:
+                    del bitmaps[value]
+                    self._labels[field].pop(value, None)
+        for token in set(tokenize(job.get("location"))):
+            if token in self._locations:
+                self._locations[token] &= mask
+                if not self._locations[token]:
+                    del self._locations[token]
+
+        low, high = self._salary_bounds(job)
+        if low is not None:
+            self.salary_low.remove(low, doc_id)
+        if high is not None:
+            self.salary_high.remove(high, doc_id)
+        posted = posted_timestamp(job.get("posted_date"))
+        if posted is not None:
+            self.posted.remove(posted, doc_id)
+
+    @staticmethod
+    def _salary_bounds(job: Mapping[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+        low = _number(job.get("salary_low"))
+        high = _number(job.get("salary_high"))
+        return (low if low is not None else high), (high if high is not None else low)
+
+    def filter_bitmaps(self, filters: Mapping[str, Any]) -> Dict[str, int]:
+        """Return one bitmap per active filter; the result set is their intersection."""
+        active: Dict[str, int] = {}
+        for field in FACET_FIELDS:
+            value = _normalize(filters.get(field))
+            if value is not None:
+                active[field] = self._bitmaps[field].get(value, 0)
+
+        location_tokens = tokenize(filters.get("location"))
+        if location_tokens:
+            bitmap = self.live
+            for token in location_tokens:
+                bitmap &= self._locations.get(token, 0)
+            active["location"] = bitmap
+
+        salary_min = _number(filters.get("salary_min"))
+        if salary_min is not None:
+            active["salary_min"] = self.salary_high.range(low=salary_min)
+        salary_max = _number(filters.get("salary_max"))
+        if salary_max is not None:
+            active["salary_max"] = self.salary_low.range(high=salary_max)
+
+        days = filters.get("posted_within_days")
+        if days is not None:
+            cutoff = datetime.now(tz=timezone.utc) - timedelta(days=int(days))
+            active["posted_within_days"] = self.posted.range(low=cutoff.timestamp())
+        return active
+
+    def counts(self, base: int, active: Mapping[str, int]) -> Dict[str, Dict[str, int]]:
+        """Count matches per facet value.
+
+        Each facet is counted against the result of every *other* filter so the
+        UI can show how many jobs picking a different value would return.
+        """
+        result: Dict[str, Dict[str, int]] = {}
+        for field in FACET_FIELDS:
+            scope = base
+            for name, bitmap in active.items():
+                if name != field:
+                    scope &= bitmap
+            counts: Dict[str, int] = {}
+            for value, bitmap in self._bitmaps[field].items():
+                count = (bitmap & scope).bit_count()
+                if count:
+                    counts[self._labels[field][value]] = count
+            result[field] = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+        return result
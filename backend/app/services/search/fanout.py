@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Tuple
+
+from ...core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SourceStatus(str, Enum):
+    ok = "ok"
+    timeout = "timeout"
+    error = "error"
+    skipped = "skipped"
+
+
+@dataclass(slots=True)
+class SourceReport:
+    source: str
+    status: SourceStatus
+    elapsed_ms: float = 0.0
+    hedged: bool = False
+    cache: str | None = None
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe after ``reset_after``."""
+
+    def __init__(self, failure_threshold: int, reset_after: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Let another caller probe: the current probe ended without an outcome (e.g. it was cancelled)."""
+        self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def breaker_for(source: str) -> CircuitBreaker:
+    breaker = _breakers.get(source)
+    if breaker is None:
+        breaker = _breakers[source] = CircuitBreaker(
+            settings.ADAPTER_BREAKER_THRESHOLD,
+            settings.ADAPTER_BREAKER_RESET_SECONDS,
+        )
+    return breaker
+
+
+def reset_breakers() -> None:
+    _breakers.clear()
+
+
+def request_deadline() -> float:
+    """Return the event-loop time by which a fan-out must finish."""
+    return asyncio.get_running_loop().time() + settings.SEARCH_DEADLINE_MS / 1000
+
+
+async def fetch_adapter(
+    adapter: Any,
+    *,
+    query: str,
+    location: str,
+    deadline: float,
+) -> Tuple[List[Dict[str, Any]], SourceReport]:
+    """Call ``adapter.fetch`` under its timeout, the request deadline and its breaker.
+
+    If the first attempt has not answered after the hedge delay a second,
+    identical attempt is started and whichever succeeds first wins.
+    """
+    loop = asyncio.get_running_loop()
+    source = getattr(adapter, "source", "unknown")
+    started = loop.time()
+
+    breaker = breaker_for(source)
+    if not breaker.allow():
+        return [], SourceReport(source=source, status=SourceStatus.skipped)
+
+    timeout_s = getattr(adapter, "timeout_ms", None) or settings.ADAPTER_TIMEOUT_MS
+    expires = min(started + timeout_s / 1000, deadline)
+    hedge_delay = settings.ADAPTER_HEDGE_DELAY_MS / 1000
+    hedge_at = started + hedge_delay if hedge_delay > 0 and started + hedge_delay < expires else None
+
+    def _attempt() -> asyncio.Future:
+        return asyncio.ensure_future(adapter.fetch(query=query, location=location))
+
+    pending = {_attempt()}
+    hedged = False
+    error: BaseException | None = None
+    try:
+        while pending:
+            now = loop.time()
+            if now >= expires:
+                break
+            wake = min(expires, hedge_at) if hedge_at is not None else expires
+            done, pending = await asyncio.wait(pending, timeout=wake - now, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    breaker.record_success()
+                    report = SourceReport(
+                        source=source,
+                        status=SourceStatus.ok,
+                        elapsed_ms=round((loop.time() - started) * 1000, 1),
+                        hedged=hedged,
+                    )
+                    return list(task.result() or []), report
+                error = task.exception()
+            if hedge_at is not None and pending and loop.time() >= hedge_at:
+                pending.add(_attempt())
+                hedged = True
+                hedge_at = None
+    except BaseException:
+        # Cancelled by the caller (a finished or disconnected stream): no verdict on the source.
+        breaker.release_probe()
+        raise
+    finally:
+        for task in pending:
+            task.cancel()
+
+    breaker.record_failure()
+    status = SourceStatus.timeout if pending else SourceStatus.error
+    logger.warning(
+        "adapter_fetch_failed",
+        extra={"source": source, "status": status.value, "error": str(error) if error else None},
+    )
+    return [], SourceReport(
+        source=source,
+        status=status,
+        elapsed_ms=round((loop.time() - started) * 1000, 1),
+        hedged=hedged,
+    )
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from ..keywords import posting_keywords
+from .autocomplete import Autocomplete
+from .facets import FacetIndex, bitmap_from_ids, ids_from_bitmap, posted_timestamp
+from .text import tokenize
+from .vectors import JobVectors
+
+INDEXED_FIELDS: tuple[str, ...] = ("title", "company", "description")
+# Title occurrences count this many times towards a term's relevance frequency.
+TITLE_WEIGHT = 2
+_MAX_TF = 0xFFFF
+# What search serves of a posting. Re-upserting a posting equal on these (and its posted
+# date) is a no-op, whether it comes from an adapter or is read back from the jobs table.
+_SERVED_FIELDS: tuple[str, ...] = (
+    "source",
+    "title",
+    "company",
+    "apply_url",
+    "location",
+    "salary_low",
+    "salary_high",
+    "currency",
+    "job_type",
+    "experience_level",
+    "industry",
+    "education_level",
+    "work_mode",
+    "description",
+    "alternate_sources",
+)
+
+
+def job_key(job: Mapping[str, Any]) -> str:
+    """Return the identity of a posting inside the index."""
+    source = (job.get("source") or "").strip().lower()
+    identifier = job.get("id") or job.get("apply_url")
+    if identifier:
+        return f"{source}::{identifier}"
+    title = (job.get("title") or "").strip().lower()
+    company = (job.get("company") or "").strip().lower()
+    return f"{source}::{title}::{company}"
+
+
+def _fingerprint(job: Mapping[str, Any]) -> tuple:
+    values = (job.get(name) for name in _SERVED_FIELDS)
+    # Stored rows hold NULL where an adapter may have sent "" or no alternates.
+    blanks = ("", [], ())
+    return (*(None if value in blanks else value for value in values), posted_timestamp(job.get("posted_date")))
+
+
+def _intersect(left: array, right: array) -> array:
+    """Merge-intersect two ascending posting lists."""
+    out = array("I")
+    i = j = 0
+    len_left, len_right = len(left), len(right)
+    while i < len_left and j < len_right:
+        a, b = left[i], right[j]
+        if a == b:
+            out.append(a)
+            i += 1
+            j += 1
+        elif a < b:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+@dataclass(slots=True)
+class SearchResult:
+    ids: List[int]
+    facets: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return len(self.ids)
+
+
+class JobIndex:
+    """In-process inverted index over job postings.
+
+    Every posting gets a monotonically increasing document id, so posting lists
+    stay sorted by construction and can be merge-intersected. Re-indexing a
+    posting tombstones the previous document and appends a new one, unless the
+    posting is identical to the one already indexed. Each posting also keeps the
+    order it was first indexed in across re-indexing and compaction, which breaks
+    ranking ties so keyset cursors survive document ids changing.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._docs: List[Optional[Dict[str, Any]]] = []
+        self._ids_by_key: Dict[str, int] = {}
+        self._postings: Dict[str, array] = {}
+        # Parallel to each posting list: weighted title + description term frequency.
+        self._tfs: Dict[str, array] = {}
+        self._lengths = array("I")
+        self._posted = array("d")
+        # 1 for live documents, 0 for tombstoned slots.
+        self._alive = array("B")
+        self._order = array("Q")
+        self._order_by_key: Dict[str, int] = {}
+        self._next_order = 0
+        self._live = 0
+        self.facets = FacetIndex()
+        self.vectors = JobVectors()
+        self.suggestions = Autocomplete()
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __bool__(self) -> bool:
+        return self._live > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs = []
+            self._ids_by_key = {}
+            self._postings = {}
+            self._tfs = {}
+            self._lengths = array("I")
+            self._posted = array("d")
+            self._alive = array("B")
+            self._order = array("Q")
+            self._order_by_key = {}
+            self._next_order = 0
+            self._live = 0
+            self.facets = FacetIndex()
+            self.vectors = JobVectors()
+            self.suggestions = Autocomplete()
+
+    def upsert(self, job: Mapping[str, Any]) -> int:
+        """Index (or re-index) a posting and return its document id."""
+        doc_id = self._upsert(job)
+        self.suggestions.compile()
+        return doc_id
+
+    def upsert_many(self, jobs: Iterable[Mapping[str, Any]]) -> List[int]:
+        with self._lock:
+            doc_ids = [self._upsert(job) for job in jobs]
+            # New autocomplete phrases are sorted in once per batch, not on a reader's keystroke.
+            self.suggestions.compile()
+        return doc_ids
+
+    def _upsert(self, job: Mapping[str, Any]) -> int:
+        data = dict(job)
+        key = job_key(data)
+        with self._lock:
+            current = self._ids_by_key.get(key)
+            # Polls and syncs hand back mostly unchanged postings; those keep their document.
+            if current is not None and _fingerprint(self._docs[current]) == _fingerprint(data):
+                return current
+        title_tokens = tokenize(data.get("title"))
+        description_tokens = tokenize(data.get("description"))
+        frequencies: Dict[str, int] = {term: 0 for term in tokenize(data.get("company"))}
+        for term in title_tokens:
+            frequencies[term] = frequencies.get(term, 0) + TITLE_WEIGHT
+        for term in description_tokens:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        posted = posted_timestamp(data.get("posted_date"))
+        # Keywords the tailoring step would pick out of the description count once more.
+        vector_counts = dict(frequencies)
+        for keyword in posting_keywords(data):
+            for term in tokenize(keyword):
+                vector_counts[term] = vector_counts.get(term, 0) + 1
+
+        with self._lock:
+            self._remove_locked(key)
+            doc_id = len(self._docs)
+            self._docs.append(data)
+            self._ids_by_key[key] = doc_id
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = array("I")
+                    self._tfs[term] = array("H")
+                postings.append(doc_id)
+                self._tfs[term].append(min(frequency, _MAX_TF))
+            self._lengths.append(len(title_tokens) * TITLE_WEIGHT + len(description_tokens))
+            self._posted.append(posted if posted is not None else float("nan"))
+            self._alive.append(1)
+            order = self._order_by_key.get(key)
+            if order is None:
+                order = self._order_by_key[key] = self._next_order
+                self._next_order += 1
+            self._order.append(order)
+            self.facets.add(doc_id, data)
+            self.vectors.add(doc_id, vector_counts)
+            self.suggestions.add(data)
+            self._live += 1
+        return doc_id
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            self._order_by_key.pop(key, None)
+            return self._remove_locked(key)
+
+    def _remove_locked(self, key: str) -> bool:
+        doc_id = self._ids_by_key.pop(key, None)
+        if doc_id is None:
+            return False
+        # Posting lists keep the stale id; lookups skip tombstoned documents.
+        self.facets.remove(doc_id, self._docs[doc_id])
+        self.vectors.remove(doc_id)
+        self.suggestions.remove(self._docs[doc_id])
+        self._docs[doc_id] = None
+        self._alive[doc_id] = 0
+        self._live -= 1
+        return True
+
+    @property
+    def tombstones(self) -> int:
+        """Document slots still held by removed or re-indexed postings."""
+        return len(self._docs) - self._live
+
+    def compact(self) -> int:
+        """Re-index the live postings from scratch, dropping tombstoned ids from
+        every posting list, column and matrix row. Returns the slots reclaimed.
+        Document ids change, so callers must not hold on to them across this call.
+        """
+        with self._lock:
+            reclaimed = self.tombstones
+            if reclaimed:
+                live = [doc for doc in self._docs if doc is not None]
+                order_by_key, next_order = self._order_by_key, self._next_order
+                self.clear()
+                self._order_by_key, self._next_order = order_by_key, next_order
+                self.upsert_many(live)
+            return reclaimed
+
+    def get(self, doc_id: int) -> Optional[Dict[str, Any]]:
+        if 0 <= doc_id < len(self._docs):
+            return self._docs[doc_id]
+        return None
+
+    def order_of(self, key: str) -> Optional[int]:
+        """Return the first-indexed order of the posting with ``job_key`` ``key``."""
+        return self._order_by_key.get(key)
+
+    def search(self, query: str | None) -> List[int]:
+        """Return ascending ids of live documents matching every query token."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            docs = self._docs
+            if not terms:
+                return [doc_id for doc_id, doc in enumerate(docs) if doc is not None]
+
+            postings = []
+            for term in terms:
+                plist = self._postings.get(term)
+                if not plist:
+                    return []
+                postings.append(plist)
+            postings.sort(key=len)
+
+            result = postings[0]
+            for plist in postings[1:]:
+                result = _intersect(result, plist)
+                if not result:
+                    return []
+            return [doc_id for doc_id in result if docs[doc_id] is not None]
+
+    def query(self, text: str | None, filters: Mapping[str, Any] | None = None) -> SearchResult:
+        """Match ``text`` and narrow the result with facet and range filters."""
+        with self._lock:
+            if tokenize(text):
+                base = bitmap_from_ids(self.search(text))
+            else:
+                base = self.facets.live
+            active = self.facets.filter_bitmaps(filters or {})
+            matched = base
+            for bitmap in active.values():
+                matched &= bitmap
+            return SearchResult(ids=ids_from_bitmap(matched), facets=self.facets.counts(base, active))
+
+    def term_postings(self, term: str) -> Tuple[array, array]:
+        """Return copies of a term's ascending doc ids and their frequencies."""
+        with self._lock:
+            return array("I", self._postings.get(term, ())), array("H", self._tfs.get(term, ()))
+
+    def ranking_columns(self) -> Tuple[array, array]:
+        """Return copies of the per-document lengths and posted timestamps (NaN if unknown)."""
+        with self._lock:
+            return array("I", self._lengths), array("d", self._posted)
+
+    def length_columns(self) -> Tuple[array, array]:
+        """Return copies of the per-document lengths and liveness (1 live, 0 tombstoned), taken together."""
+        with self._lock:
+            return array("I", self._lengths), array("B", self._alive)
+
+    def order_column(self) -> array:
+        """Return a copy of each document's first-indexed order, the ranking tie-breaker."""
+        with self._lock:
+            return array("Q", self._order)
+
+    def iter_docs(self, doc_ids: Iterable[int]) -> Iterator[Dict[str, Any]]:
+        for doc_id in doc_ids:
+            doc = self.get(doc_id)
+            if doc is not None:
+                yield doc
+
+
+# A single index instance for the process
+job_index = JobIndex()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from ...core.config import settings
+from .index import JobIndex
+from .text import tokenize
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Freshness is measured against the start of the current hour so scores (and
+# therefore keyset cursors) stay stable while a user pages through results.
+_FRESHNESS_CLOCK_SECONDS = 3600
+_SCORE_DECIMALS = 6
+
+
+def _gather(candidates: np.ndarray, ids: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Return ``values`` for each candidate found in the ascending ``ids``, else 0."""
+    if ids.size == 0:
+        return np.zeros(candidates.size, dtype=np.float64)
+    pos = np.searchsorted(ids, candidates)
+    pos[pos >= ids.size] = ids.size - 1
+    found = ids[pos] == candidates
+    return np.where(found, values[pos], 0).astype(np.float64)
+
+
+def bm25_scores(index: JobIndex, candidates: np.ndarray, query: str | None) -> np.ndarray:
+    scores = np.zeros(candidates.size, dtype=np.float64)
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms or candidates.size == 0:
+        return scores
+
+    lengths, alive = index.length_columns()
+    doc_lengths = np.asarray(lengths, dtype=np.float64)
+    # Posting lists and columns keep tombstoned slots until compaction; collection
+    # statistics only count live documents, or re-indexing would skew the IDF.
+    live = np.asarray(alive, dtype=bool)
+    live_lengths = doc_lengths[live]
+    avg_length = float(live_lengths.mean()) if live_lengths.size else 1.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[candidates] / max(avg_length, 1.0))
+    total_docs = max(int(live.sum()), 1)
+
+    for term in terms:
+        raw_ids, raw_tfs = index.term_postings(term)
+        ids = np.asarray(raw_ids, dtype=np.int64)
+        tfs = np.asarray(raw_tfs, dtype=np.float64)
+        in_live = live[ids] if ids.size else np.zeros(0, dtype=bool)
+        doc_freq = int(np.count_nonzero(tfs[in_live]))
+        if doc_freq == 0:
+            continue
+        idf = math.log(1 + (total_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        tf = _gather(candidates, ids, tfs)
+        scores += idf * tf * (BM25_K1 + 1) / (tf + norm)
+    return scores
+
+
+def skill_overlap(index: JobIndex, candidates: np.ndarray, skills: Iterable[str] | None) -> np.ndarray:
+    """Fraction of the user's resume skills mentioned by each candidate."""
+    overlap = np.zeros(candidates.size, dtype=np.float64)
+    unique_skills = list(dict.fromkeys(" ".join(tokenize(skill)) for skill in skills or ()))
+    unique_skills = [skill for skill in unique_skills if skill]
+    if not unique_skills or candidates.size == 0:
+        return overlap
+    for skill in unique_skills:
+        matches = np.asarray(index.search(skill), dtype=np.int64)
+        if matches.size:
+            overlap += np.isin(candidates, matches, assume_unique=True)
+    return overlap / len(unique_skills)
+
+
+def freshness(index: JobIndex, candidates: np.ndarray, now: float | None = None) -> np.ndarray:
+    """Exponential decay on posting age; postings without a date score 0."""
+    if candidates.size == 0:
+        return np.zeros(0, dtype=np.float64)
+    now = now if now is not None else time.time()
+    now -= now % _FRESHNESS_CLOCK_SECONDS
+    _, posted = index.ranking_columns()
+    posted_at = np.asarray(posted, dtype=np.float64)[candidates]
+    age_days = np.clip((now - posted_at) / 86400.0, 0, None)
+    decay = np.exp2(-age_days / settings.RANK_FRESHNESS_HALF_LIFE_DAYS)
+    return np.nan_to_num(decay, nan=0.0)
+
+
+def rank_jobs(
+    index: JobIndex,
+    doc_ids: Sequence[int],
+    *,
+    query: str | None,
+    skills: Iterable[str] | None = None,
+    now: float | None = None,
+) -> List[Tuple[int, float]]:
+    """Score candidates and return ``(doc_id, score)`` ordered by score, then by the
+    order postings were first indexed in (stable across re-indexing, unlike doc ids).
+    """
+    candidates = np.asarray(doc_ids, dtype=np.int64)
+    if candidates.size == 0:
+        return []
+    scores = (
+        bm25_scores(index, candidates, query)
+        + settings.RANK_SKILL_WEIGHT * skill_overlap(index, candidates, skills)
+        + settings.RANK_FRESHNESS_WEIGHT * freshness(index, candidates, now)
+    )
+    scores = np.round(scores, _SCORE_DECIMALS)
+    first_indexed = np.asarray(index.order_column(), dtype=np.int64)[candidates]
+    order = np.lexsort((first_indexed, -scores))
+    return list(zip(candidates[order].tolist(), scores[order].tolist()))
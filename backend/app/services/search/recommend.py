@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from .index import JobIndex
+from .text import tokenize
+
+
+@dataclass(slots=True)
+class SkillMatch:
+    skill: str
+    weight: float
+
+
+@dataclass(slots=True)
+class Recommendation:
+    doc_id: int
+    score: float
+    matched: List[SkillMatch] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+
+def recommend_jobs(index: JobIndex, skills: Iterable[str], *, limit: int) -> List[Recommendation]:
+    """Score every indexed posting against ``skills`` with one sparse mat-vec.
+
+    The skills form a TF-IDF query vector in the same space as the posting
+    vectors; cosine similarity picks the top ``limit`` postings and each
+    skill's share of a posting's score explains the match.
+    """
+    skill_terms: Dict[str, List[str]] = {}
+    seen: set[str] = set()
+    for skill in skills:
+        terms = tokenize(skill)
+        if terms and " ".join(terms) not in seen:
+            seen.add(" ".join(terms))
+            skill_terms[skill.strip()] = terms
+    if not skill_terms or limit <= 0:
+        return []
+
+    matrix, idf = index.vectors.matrix()
+    columns = index.vectors.columns(term for terms in skill_terms.values() for term in terms)
+    if not columns or matrix.shape[0] == 0:
+        return []
+
+    query = np.zeros(matrix.shape[1], dtype=np.float64)
+    for terms in skill_terms.values():
+        for term in terms:
+            if term in columns:
+                query[columns[term]] += 1
+    query = np.log1p(query) * idf
+    query /= np.linalg.norm(query)
+
+    scores = matrix @ query
+    candidates = np.flatnonzero(scores > 0)
+    if candidates.size > limit:
+        candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+    top = candidates[np.lexsort((candidates, -scores[candidates]))]
+    if top.size == 0:
+        return []
+
+    # Each skill's share of the cosine score, for the chosen rows only.
+    rows = matrix[top]
+    contributions: Dict[str, np.ndarray] = {}
+    for skill, terms in skill_terms.items():
+        skill_columns = sorted({columns[term] for term in terms if term in columns})
+        if skill_columns:
+            contributions[skill] = np.asarray(rows[:, skill_columns] @ query[skill_columns]).ravel()
+        else:
+            contributions[skill] = np.zeros(top.size)
+
+    recommendations = []
+    for position, doc_id in enumerate(top.tolist()):
+        matched = [
+            SkillMatch(skill=skill, weight=round(float(values[position]), 6))
+            for skill, values in contributions.items()
+            if values[position] > 0
+        ]
+        matched.sort(key=lambda match: -match.weight)
+        missing = [skill for skill, values in contributions.items() if values[position] <= 0]
+        recommendations.append(
+            Recommendation(doc_id=doc_id, score=round(float(scores[doc_id]), 6), matched=matched, missing=missing)
+        )
+    return recommendations
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, func, or_, select
+from sqlalchemy.orm import Session
+
+from ...models import Application, ApplicationStatus
+from ...schemas import JobState
+
+_MAX_USERS = 10_000
+
+Fingerprint = Tuple[int, Optional[int], Optional[datetime]]
+
+
+def normalize_key(title: str | None, company: str | None) -> str:
+    return f"{(title or '').strip().lower()}::{(company or '').strip().lower()}"
+
+
+def _state_for(status: ApplicationStatus) -> JobState:
+    return JobState.saved if status == ApplicationStatus.draft else JobState.applied
+
+
+@dataclass(slots=True)
+class _Entry:
+    fingerprint: Fingerprint
+    states: Dict[str, JobState] = field(default_factory=dict)
+    # key -> id of the application that decided the state (the newest one wins)
+    owners: Dict[str, int] = field(default_factory=dict)
+    app_keys: Dict[int, str] = field(default_factory=dict)
+    dirty: bool = False
+
+    def apply(self, app_id: int, title: str | None, company: str | None, status: ApplicationStatus) -> None:
+        key = normalize_key(title, company)
+        self.app_keys[app_id] = key
+        if self.owners.get(key, -1) <= app_id:
+            self.owners[key] = app_id
+            self.states[key] = _state_for(status)
+
+
+class UserStateCache:
+    """Per-user map of normalized job key -> JobState.
+
+    Each entry remembers a cheap fingerprint of the user's applications
+    (count, max id, max updated_at). A search compares fingerprints with one
+    aggregate query and, when they differ, only loads the rows written since
+    the entry was built. Deletions and retitled applications rebuild the
+    entry from scratch. Writes made through this process' ORM session mark
+    entries dirty immediately.
+    """
+
+    def __init__(self, max_users: int = _MAX_USERS) -> None:
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def mark_dirty(self, user_id: int) -> None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                entry.dirty = True
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def get(self, db: Session, user_id: int) -> Dict[str, JobState]:
+        fingerprint = self._fingerprint(db, user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+                if entry.fingerprint == fingerprint and not entry.dirty:
+                    return entry.states
+
+        if entry is not None and fingerprint[0] >= entry.fingerprint[0]:
+            entry = self._apply_delta(db, user_id, entry, fingerprint)
+        else:
+            entry = None
+        if entry is None:
+            entry = self._build(db, user_id, fingerprint)
+
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return entry.states
+
+    @staticmethod
+    def _fingerprint(db: Session, user_id: int) -> Fingerprint:
+        count, max_id, max_updated = db.execute(
+            select(func.count(Application.id), func.max(Application.id), func.max(Application.updated_at)).where(
+                Application.user_id == user_id
+            )
+        ).one()
+        return int(count or 0), max_id, max_updated
+
+    @staticmethod
+    def _build(db: Session, user_id: int, fingerprint: Fingerprint) -> _Entry:
+        entry = _Entry(fingerprint=fingerprint)
+        rows = db.execute(
+            select(Application.id, Application.title, Application.company, Application.status)
+            .where(Application.user_id == user_id)
+            .order_by(Application.id)
+        )
+        for app_id, title, company, status in rows:
+            entry.apply(app_id, title, company, status)
+        return entry
+
+    @staticmethod
+    def _apply_delta(db: Session, user_id: int, entry: _Entry, fingerprint: Fingerprint) -> Optional[_Entry]:
+        _, old_max_id, old_max_updated = entry.fingerprint
+        conditions = []
+        if old_max_id is not None:
+            conditions.append(Application.id > old_max_id)
+        if old_max_updated is not None:
+            # Re-applying a row is idempotent, so widen the window past timestamp rounding
+            # (SQLite's CURRENT_TIMESTAMP has whole-second resolution).
+            conditions.append(Application.updated_at >= old_max_updated - timedelta(seconds=1))
+        if not conditions:
+            return None
+
+        rows = db.execute(
+            select(Application.id, Application.title, Application.company, Application.status)
+            .where(Application.user_id == user_id, or_(*conditions))
+            .order_by(Application.id)
+        ).all()
+        new_rows = sum(1 for app_id, *_ in rows if old_max_id is None or app_id > old_max_id)
+        if entry.fingerprint[0] + new_rows != fingerprint[0]:
+            # Something was deleted (or renamed away); a partial update could keep stale keys.
+            return None
+
+        for app_id, title, company, _ in rows:
+            previous_key = entry.app_keys.get(app_id)
+            if previous_key is not None and previous_key != normalize_key(title, company):
+                # An existing application moved to another job; its old key may now be stale.
+                return None
+        for app_id, title, company, status in rows:
+            entry.apply(app_id, title, company, status)
+        entry.fingerprint = fingerprint
+        entry.dirty = False
+        return entry
+
+
+# A single cache instance for the process
+user_state_cache = UserStateCache()
+
+
+@event.listens_for(Application, "after_insert")
+@event.listens_for(Application, "after_update")
+def _application_written(mapper, connection, target: Application) -> None:
+    user_state_cache.mark_dirty(target.user_id)
+
+
+@event.listens_for(Application, "after_delete")
+def _application_deleted(mapper, connection, target: Application) -> None:
+    user_state_cache.invalidate(target.user_id)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import List
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Arabic diacritics (tashkeel), superscript alef and tatweel carry no meaning for matching.
+_ARABIC_MARKS_RE = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u0640]")
+_ARABIC_LETTERS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه"})
+
+
+def tokenize(text: str | None) -> List[str]:
+    """Split free text into casefolded word tokens (Latin and Arabic alike)."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def normalize_text(text: str | None) -> str:
+    """Fold case, Unicode forms and Arabic spelling variants into one matching key."""
+    if not text:
+        return ""
+    folded = unicodedata.normalize("NFKC", text).casefold()
+    folded = _ARABIC_MARKS_RE.sub("", folded).translate(_ARABIC_LETTERS)
+    return " ".join(_TOKEN_RE.findall(folded))
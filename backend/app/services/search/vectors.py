@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from typing import Dict, Iterable, Mapping, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+class JobVectors:
+    """TF-IDF vectors of indexed postings stored as one CSR matrix.
+
+    Rows are appended in document-id order while postings are indexed, so the
+    raw term counts are a CSR matrix from the start. IDF weighting and row
+    normalization depend on the whole corpus and are applied in one vectorized
+    pass the first time the matrix is needed after a change.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._vocab: Dict[str, int] = {}
+        self._indptr = array("q", [0])
+        self._indices = array("I")
+        self._counts = array("f")
+        self._live = array("B")
+        self._matrix: sparse.csr_matrix | None = None
+        self._idf: np.ndarray | None = None
+
+    def add(self, doc_id: int, counts: Mapping[str, float]) -> None:
+        """Append the row for ``doc_id``; ids must arrive in ascending order."""
+        with self._lock:
+            while len(self._live) < doc_id:
+                # Rows for ids that were never vectorized stay empty.
+                self._indptr.append(len(self._indices))
+                self._live.append(0)
+            for term, count in counts.items():
+                if count <= 0:
+                    continue
+                column = self._vocab.get(term)
+                if column is None:
+                    column = self._vocab[term] = len(self._vocab)
+                self._indices.append(column)
+                self._counts.append(count)
+            self._indptr.append(len(self._indices))
+            self._live.append(1)
+            self._matrix = None
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            if doc_id < len(self._live) and self._live[doc_id]:
+                self._live[doc_id] = 0
+                self._matrix = None
+
+    def columns(self, terms: Iterable[str]) -> Dict[str, int]:
+        with self._lock:
+            return {term: self._vocab[term] for term in terms if term in self._vocab}
+
+    def matrix(self) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        """Return the L2-normalized TF-IDF matrix (docs x terms) and the IDF vector."""
+        with self._lock:
+            if self._matrix is None:
+                self._matrix, self._idf = self._compile_locked()
+            return self._matrix, self._idf
+
+    def _compile_locked(self) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        shape = (len(self._live), len(self._vocab))
+        counts = sparse.csr_matrix(
+            (
+                np.array(self._counts, dtype=np.float64),
+                np.array(self._indices, dtype=np.int64),
+                np.array(self._indptr, dtype=np.int64),
+            ),
+            shape=shape,
+        )
+        live = np.array(self._live, dtype=np.float64)
+        counts = sparse.csr_matrix(sparse.diags(live) @ counts)
+        counts.eliminate_zeros()
+
+        total_docs = float(live.sum())
+        doc_freq = np.bincount(counts.indices, minlength=shape[1])
+        idf = np.log((1 + total_docs) / (1 + doc_freq)) + 1
+
+        weights = counts.copy()
+        weights.data = np.log1p(weights.data) * idf[weights.indices]
+        norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.csr_matrix(sparse.diags(1 / norms) @ weights), idf
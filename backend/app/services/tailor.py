@@ -1,7 +1,6 @@
 # stdlib
 import hashlib
 import os
-import re
 import time
 from pathlib import Path
 from typing import Dict, List, Tuple  # removed unused Any
@@ -11,6 +10,8 @@ from dotenv import load_dotenv
 from fastapi import HTTPException
 from openai import OpenAI
 
+from .keywords import extract_keywords
+
 # === Load .env and allow it to override any OS env vars ===
 load_dotenv(override=True)
 root_env = Path(__file__).resolve().parents[2] / ".env"
@@ -89,41 +90,6 @@ def _cache_key(resume_text: str, job_text: str, language: str, style: str, model
 # --------------------------------------------------------------------------------------
 #                                     Utilities
 # --------------------------------------------------------------------------------------
-def extract_keywords(job_text: str) -> List[str]:
-    tokens = re.findall(r"[A-Za-z][A-Za-z0-9+\-#\.]{2,}", job_text)
-    seen, out = set(), []
-    signals = [
-        "sql",
-        "python",
-        "snowflake",
-        "azure",
-        "aws",
-        "gcp",
-        "power",
-        "tableau",
-        "dbt",
-        "spark",
-        "bi",
-        "etl",
-        "api",
-        "databricks",
-        "fabric",
-        "airflow",
-        "kafka",
-    ]
-    for t in tokens:
-        k = t.strip(",.;:()[]{}").strip()
-        kl = k.lower()
-        if kl in seen:
-            continue
-        if k.isupper() or any(s in kl for s in signals):
-            out.append(k)
-            seen.add(kl)
-        if len(out) >= 40:
-            break
-    return out
-
-
 def _mock_tailor(resume_text: str, job_text: str, kws: List[str]) -> str:
     bullets = [
         f"Aligned experience to JD focus areas ({', '.join(kws[:8])})",
@@ -0,0 +1,99 @@
+"""
+Usage:
+  python crawler/bench_parsers.py [--repeat 50] [--parsers selectolax,lxml] [--corpus crawler/corpus] [--verbose]
+Parses every saved page in the corpus with each installed HTML backend and reports pages/sec, MB/sec and
+extraction parity against the bs4 html.parser reference (same links, same JD title and text).
+
+Corpus files are named <source>-<kind>-<name>.html, kind being "board" or "job"; the first line is the browser's
+"saved from url=" comment, which gives the URL that relative links are resolved against.
+"""
+
+# --- stdlib
+import argparse
+import re
+import time
+from pathlib import Path
+
+# --- local
+from parsers import BOARD_LINKS, PARSERS, available_parsers
+
+CORPUS = Path(__file__).resolve().parent / "corpus"
+REFERENCE = "bs4"
+_SAVED_FROM = re.compile(r"saved from url=\(\d+\)(\S+)")
+
+
+def load_corpus(path):
+    pages = []
+    for file in sorted(Path(path).glob("*.html")):
+        source, kind, _ = file.stem.split("-", 2)
+        html = file.read_text(encoding="utf-8")
+        match = _SAVED_FROM.search(html[:500])
+        url = match.group(1) if match else ""
+        pages.append({"name": file.name, "source": source, "kind": kind, "url": url, "html": html})
+    return pages
+
+
+def extract(parser, page):
+    if page["kind"] == "board":
+        return parser.links(page["url"], page["html"], BOARD_LINKS[page["source"]])
+    return parser.jd(page["html"])
+
+
+def normalized(result):
+    # Backends disagree on whitespace inside text nodes (e.g. &nbsp;), which does not matter for the JD.
+    if isinstance(result, tuple):
+        return tuple(" ".join(part.split()) for part in result)
+    return result
+
+
+def bench(parser, pages, repeat):
+    extract(parser, pages[0])  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            extract(parser, page)
+    return time.perf_counter() - started
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--corpus", default=str(CORPUS))
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--parsers", default="", help="comma-separated backends (default: all installed)")
+    ap.add_argument("--verbose", action="store_true", help="show the pages that differ from the reference")
+    args = ap.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        raise SystemExit(f"no pages in {args.corpus}")
+    names = [name for name in args.parsers.split(",") if name] or available_parsers()
+    missing = [name for name in names if name not in PARSERS or not PARSERS[name].available]
+    if missing:
+        raise SystemExit(f"not installed or unknown: {', '.join(missing)}; installed: {', '.join(available_parsers())}")
+
+    reference = None
+    if PARSERS[REFERENCE].available:
+        reference = [normalized(extract(PARSERS[REFERENCE](), page)) for page in pages]
+    else:
+        print(f"{REFERENCE} is not installed; parity is not checked")
+
+    megabytes = sum(len(page["html"].encode("utf-8")) for page in pages) * args.repeat / 1e6
+    print(f"{len(pages)} pages x {args.repeat} rounds")
+    print(f"{'parser':<12}{'pages/sec':>12}{'MB/sec':>10}{'parity':>10}")
+    for name in names:
+        parser = PARSERS[name]()
+        elapsed = bench(parser, pages, args.repeat)
+        parity, differing = "-", []
+        if reference is not None:
+            differing = [
+                page["name"] for page, expected in zip(pages, reference) if normalized(extract(parser, page)) != expected
+            ]
+            parity = f"{len(pages) - len(differing)}/{len(pages)}"
+        print(f"{name:<12}{len(pages) * args.repeat / elapsed:>12.0f}{megabytes / elapsed:>10.1f}{parity:>10}")
+        if args.verbose:
+            for page in differing:
+                print(f"  differs: {page}")
+
+
+if __name__ == "__main__":
+    main()
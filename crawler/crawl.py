@@ -1,112 +1,435 @@
 """
 Usage:
   python crawler/crawl.py https://boards.greenhouse.io/<company> https://jobs.lever.co/<company>
-This script fetches job links and JDs from provided Greenhouse/Lever boards and POSTs them to the backend /jobs/ingest.
+This script fetches job links and JDs from provided Greenhouse/Lever boards and POSTs them in NDJSON batches
+to the backend /jobs/ingest/bulk (authorized with WAZFINI_INGEST_TOKEN, the backend's INGEST_API_TOKEN).
+
+Pages are fetched concurrently over one pooled HTTP/2 client (needs `h2`, from httpx[http2] in backend/requirements.txt;
+without it the crawl falls back to HTTP/1.1 and says so).
+CRAWL_CONCURRENCY caps requests in flight overall; CRAWL_HOST_RATE / CRAWL_HOST_BURST rate-limit each host.
+
+Progress lives in the CRAWL_FRONTIER SQLite file: a crawl that dies resumes where it stopped when run again, and
+several crawler processes can drain one frontier together (run further workers without board arguments).
+URLs a dead crawler had leased wait out their lease before others take them, unless the restarted worker reclaims
+them: give each worker a stable CRAWL_WORKER_ID and it takes back its own leases on start, or pass `--reclaim` to
+release every lease when no other crawler is running.
+`--recrawl` sends every job page fetched before back through the crawl. The frontier keeps each page's ETag,
+Last-Modified and body hash, so re-fetches are conditional GETs, and pages that come back 304 or with the same body
+are neither parsed nor re-ingested.
+
+HTML is parsed with the fastest installed backend (selectolax, then lxml, then BeautifulSoup); CRAWL_HTML_PARSER
+forces one. See parsers.py and bench_parsers.py. Parsing runs on CRAWL_PARSE_WORKERS processes (default: one per
+core, 0 parses on the event loop) so it does not hold up the network side of the crawl.
+
+CRAWL_HTTP_ARCHIVE_MODE=record writes every page fetch to the CRAWL_HTTP_ARCHIVE .warc.gz file; =replay serves the
+pages from it with no network (run it against a fresh CRAWL_FRONTIER). CRAWL_REPLAY_LATENCY_MS adds a fixed delay to
+each replayed response, or "recorded" replays the original timings.
+
+CRAWL_SINK=ndjson or =parquet writes postings to rotating compressed files in CRAWL_SINK_DIR instead of the API
+(a new file every CRAWL_SINK_ROTATE_ROWS postings; see sink.py). Load them into the jobs table in bulk with
+  python scripts/load_postings.py <CRAWL_SINK_DIR>
 """
 
 # --- stdlib
 import asyncio
+import importlib.util
+import json
 import os
 import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
 
 # --- third-party
 import httpx
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+# --- local
+from frontier import Frontier
+from parsers import BOARD_LINKS, content_hash, get_parser, init_worker, parse_batch
+from sink import PostingSink
+
 # load .env if present (optional, but avoids F401 since it's used)
 load_dotenv()
 
+
+def _load_http_archive():
+    # Shared with the backend; loaded from its file so the crawler does not import the backend app.
+    path = Path(__file__).resolve().parents[1] / "backend" / "app" / "core" / "http_archive.py"
+    spec = importlib.util.spec_from_file_location("http_archive", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+http_archive = _load_http_archive()
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2 = False
+else:
+    HTTP2 = True
+
 API = os.getenv("WAZFINI_API", "http://127.0.0.1:8000")
+CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "64"))
+HOST_RATE = float(os.getenv("CRAWL_HOST_RATE", "50"))  # requests per second per host
+HOST_BURST = int(os.getenv("CRAWL_HOST_BURST", "100"))
+INGEST_TOKEN = os.getenv("WAZFINI_INGEST_TOKEN", "")
+BATCH_SIZE = int(os.getenv("CRAWL_BATCH_SIZE", "500"))
+FRONTIER_PATH = os.getenv("CRAWL_FRONTIER", "crawl_frontier.sqlite3")
+WORKER_ID = os.getenv("CRAWL_WORKER_ID")  # stable lease owner across restarts; a fresh one per run when unset
+PARSER = get_parser()
+PARSE_WORKERS = int(os.getenv("CRAWL_PARSE_WORKERS", str(os.cpu_count() or 1)))
+PARSE_BATCH = int(os.getenv("CRAWL_PARSE_BATCH", "16"))  # pages per worker task
+PARSE_WAIT = float(os.getenv("CRAWL_PARSE_WAIT", "0.02"))  # seconds a page may wait for its batch to fill
+ARCHIVE_MODE = os.getenv("CRAWL_HTTP_ARCHIVE_MODE", "off")  # off, record or replay
+ARCHIVE_PATH = os.getenv("CRAWL_HTTP_ARCHIVE", "crawl.warc.gz")
+REPLAY_LATENCY_MS = os.getenv("CRAWL_REPLAY_LATENCY_MS", "0")  # milliseconds, or "recorded"
+SINK = os.getenv("CRAWL_SINK", "api")  # api, ndjson or parquet
+SINK_DIR = os.getenv("CRAWL_SINK_DIR", "crawl_out")
+SINK_ROTATE_ROWS = int(os.getenv("CRAWL_SINK_ROTATE_ROWS", "100000"))
+
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens go out in arrival order.
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 
+class Limiter:
+    """Global cap on requests in flight plus one token bucket per host."""
 
-async def fetch(url, client):
-    r = await client.get(
-        url,
+    def __init__(self, concurrency=CONCURRENCY, rate=HOST_RATE, burst=HOST_BURST):
+        self.slots = asyncio.Semaphore(concurrency)
+        self.buckets = defaultdict(lambda: TokenBucket(rate, burst))
+
+    @asynccontextmanager
+    async def request(self, url):
+        # Wait for the host's token first so rate-limited hosts don't hold global slots.
+        await self.buckets[urlsplit(url).netloc].acquire()
+        async with self.slots:
+            yield
+
+
+class ParsePool:
+    """Parses fetched pages on worker processes, so the event loop only waits on the network.
+
+    Pages queue up and go to a worker as one batch once PARSE_BATCH are waiting or the oldest has waited
+    PARSE_WAIT seconds. With no workers, pages are parsed inline on the event loop.
+    """
+
+    def __init__(self, workers=PARSE_WORKERS, batch_size=PARSE_BATCH, wait=PARSE_WAIT):
+        self.executor = None
+        if workers > 0:
+            self.executor = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(PARSER.name,))
+        self.batch_size = max(batch_size, 1)
+        self.wait = wait
+        self.queue = []
+        self.timer = None
+        self.running = set()
+
+    async def parse(self, url, html, needle=None):
+        """Returns the result described in parsers.parse_batch; raises if the page failed to parse."""
+        if self.executor is None:
+            error, result = parse_batch([(url, html, needle)], PARSER)[0]
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self.queue.append(((url, html, needle), future))
+            if len(self.queue) >= self.batch_size:
+                self._flush()
+            elif self.timer is None:
+                self.timer = asyncio.get_running_loop().call_later(self.wait, self._flush)
+            error, result = await future
+        if error:
+            raise RuntimeError(f"parse failed: {error}")
+        return result
+
+    def _flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.queue = self.queue, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            # The loop only keeps weak references to tasks.
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def _run(self, batch):
+        # Stays the result if close() cancels the batch before a worker picks it up.
+        results = [("parse pool closed", None)] * len(batch)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, parse_batch, [page for page, _ in batch]
+            )
+        except Exception as exc:  # e.g. a worker was killed and the pool is broken
+            results = [(f"{type(exc).__name__}: {exc}", None)] * len(batch)
+        finally:
+            _resolve(batch, results)
+
+    def close(self):
+        """Stop the workers; pages still waiting for one fail instead of leaving their callers hanging."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.queue = self.queue, []
+        _resolve(batch, [("parse pool closed", None)] * len(batch))
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+
+def _resolve(batch, results):
+    for (_, future), result in zip(batch, results):
+        if not future.done():
+            future.set_result(result)
+
+
+def make_client(concurrency=CONCURRENCY):
+    """One keep-alive connection pool shared by every page request of the crawl."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    recorded = REPLAY_LATENCY_MS == "recorded"
+    transport = http_archive.archive_transport(
+        ARCHIVE_MODE,
+        ARCHIVE_PATH,
+        latency_ms=0.0 if recorded else float(REPLAY_LATENCY_MS),
+        recorded_latency=recorded,
+        http2=HTTP2,
+        limits=limits,
+    )
+    return httpx.AsyncClient(
+        http2=HTTP2,
         timeout=30,
         follow_redirects=True,
         headers={"User-Agent": "Mozilla/5.0"},
+        limits=limits,
+        transport=transport,
     )
+
+
+def make_api_client():
+    """Client for the backend API, kept out of the page archive."""
+    return httpx.AsyncClient(timeout=60)
+
+
+async def fetch(url, client, limiter, entry=None):
+    """GET `url`, conditionally when `entry` carries validators from an earlier successful fetch.
+
+    Returns `(html, etag, last_modified)`; html is None when the server answered 304 Not Modified.
+    """
+    headers = {}
+    if entry is not None and entry.content_hash:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+    async with limiter.request(url):
+        r = await client.get(url, headers=headers)
+    if r.status_code == 304 and headers:
+        # A 304 may carry fresh validators; keep the old ones otherwise.
+        return None, r.headers.get("ETag") or entry.etag, r.headers.get("Last-Modified") or entry.last_modified
     r.raise_for_status()
-    return r.text
-
-
-async def parse_greenhouse(board_url, client):
-    html = await fetch(board_url, client)
-    soup = BeautifulSoup(html, "html.parser")
-    links = []
-    for a in soup.select("a[href*='/jobs/']"):
-        href = a.get("href")
-        if href and "/jobs/" in href:
-            if href.startswith("http"):
-                links.append(href)
-            else:
-                links.append(board_url.rstrip("/") + "/" + href.lstrip("/"))
-    return list(dict.fromkeys(links))
-
-
-async def parse_lever(board_url, client):
-    html = await fetch(board_url, client)
-    soup = BeautifulSoup(html, "html.parser")
-    links = []
-    for a in soup.select("a[href*='jobs/']"):
-        href = a.get("href")
-        if href and "jobs/" in href:
-            if href.startswith("http"):
-                links.append(href)
+    return r.text, r.headers.get("ETag"), r.headers.get("Last-Modified")
+
+
+async def fetch_changed(entry, client, limiter):
+    """Fetch an entry's page; returns `(html, (content_hash, etag, last_modified))`.
+
+    html is None when the page is the one fetched last time, either by a 304 or by an identical body.
+    """
+    html, etag, last_modified = await fetch(entry.url, client, limiter, entry)
+    page_hash = entry.content_hash if html is None else content_hash(html)
+    if page_hash == entry.content_hash:
+        html = None
+    return html, (page_hash, etag, last_modified)
+
+
+def board_source(board_url):
+    if "greenhouse.io" in board_url:
+        return "greenhouse"
+    if "lever.co" in board_url:
+        return "lever"
+    return None
+
+
+def board_company(board_url):
+    # boards.greenhouse.io/<company> and jobs.lever.co/<company>
+    parts = [part for part in urlsplit(board_url).path.split("/") if part]
+    return parts[0] if parts else ""
+
+
+async def send_postings(client, postings):
+    """POST postings to /jobs/ingest/bulk as one NDJSON batch.
+
+    Returns {index: error} for the rejected postings, or None when the request itself failed.
+    """
+    body = "\n".join(json.dumps(posting) for posting in postings).encode("utf-8")
+    r = await client.post(
+        f"{API}/jobs/ingest/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson", "Authorization": f"Bearer {INGEST_TOKEN}"},
+    )
+    if r.status_code != 200:
+        print("ingest error:", r.status_code, r.text[:200])
+        return None
+    result = r.json()
+    print(
+        f"ingested batch of {result['received']}: "
+        f"{result['accepted']} accepted, {result['skipped']} skipped, {result['rejected']} rejected"
+    )
+    return {line["line"] - 1: line.get("error") for line in result["results"] if line["status"] == "rejected"}
+
+
+async def crawl_board(entry, client, limiter, frontier, pool):
+    html, validators = await fetch_changed(entry, client, limiter)
+    if html is None:
+        # Same page as last time, so no new links on it.
+        print(f"[{entry.source}] {entry.url} unchanged")
+        return validators
+    job_links = await pool.parse(entry.url, html, BOARD_LINKS[entry.source])
+    added = await asyncio.to_thread(frontier.add, job_links, kind="job", source=entry.source, company=entry.company)
+    print(f"[{entry.source}] Found {len(job_links)} jobs on {entry.url} ({added} new)")
+    return validators
+
+
+async def crawl_job(entry, client, limiter, pool):
+    """Returns `(posting, validators)`; posting is None when the page has not changed since it was ingested."""
+    html, validators = await fetch_changed(entry, client, limiter)
+    if html is None:
+        return None, validators
+    title, jd_text = await pool.parse(entry.url, html)
+    posting = {
+        "source": entry.source,
+        "title": title,
+        "company": entry.company,
+        "apply_url": entry.url,
+        "description": jd_text,
+    }
+    return posting, validators
+
+
+async def crawl_round(entries, client, api, limiter, frontier, pool, sink=None):
+    """Fetch one lease of URLs, send the job postings as one batch, then record the outcome of every URL.
+
+    With a `sink` the batch is written to its files instead of being sent to the API.
+    """
+    boards = [entry for entry in entries if entry.kind == "board"]
+    jobs = [entry for entry in entries if entry.kind == "job"]
+    board_results = await asyncio.gather(
+        *(crawl_board(entry, client, limiter, frontier, pool) for entry in boards), return_exceptions=True
+    )
+    job_results = await asyncio.gather(
+        *(crawl_job(entry, client, limiter, pool) for entry in jobs), return_exceptions=True
+    )
+
+    fetched, failed = [], []
+    for entry, result in zip(boards, board_results):
+        if isinstance(result, Exception):
+            print("board error:", entry.url, result)
+            failed.append((entry.url, result))
+        else:
+            fetched.append((entry.url, *result))
+
+    crawled, unchanged = [], 0
+    for entry, result in zip(jobs, job_results):
+        if isinstance(result, Exception):
+            print("job error:", entry.url, result)
+            failed.append((entry.url, result))
+        elif result[0] is None:
+            unchanged += 1
+            fetched.append((entry.url, *result[1]))
+        else:
+            crawled.append((entry, *result))
+    if unchanged:
+        print(f"{unchanged} job pages unchanged since the last crawl")
+    if crawled and sink is not None:
+        # Flushed to disk before the frontier marks the pages fetched.
+        await asyncio.to_thread(sink.write, [posting for _, posting, _ in crawled])
+        fetched.extend((entry.url, *validators) for entry, _, validators in crawled)
+    elif crawled:
+        # A job page only counts as fetched once the backend has its posting.
+        rejected = await send_postings(api, [posting for _, posting, _ in crawled])
+        for index, (entry, _, validators) in enumerate(crawled):
+            if rejected is None:
+                failed.append((entry.url, "ingest request failed"))
+            elif index in rejected:
+                print("  rejected", entry.url, rejected[index])
+                failed.append((entry.url, rejected[index]))
             else:
-                links.append(board_url.rstrip("/") + "/" + href.lstrip("/"))
-    return list(dict.fromkeys(links))
-
-
-async def fetch_jd(url, client):
-    html = await fetch(url, client)
-    soup = BeautifulSoup(html, "html.parser")
-    title = soup.select_one("h1") or soup.select_one("h2")
-    title = title.get_text(strip=True) if title else "Job"
-    container = soup.select_one("#content") or soup.select_one("#job") or soup.select_one("section") or soup
-    jd_text = container.get_text("\n", strip=True)[:200000]
-    return title, jd_text
-
-
-async def main(urls):
-    async with httpx.AsyncClient() as client:
-        for board in urls:
-            try:
-                if "greenhouse.io" in board:
-                    job_links = await parse_greenhouse(board, client)
-                    source = "greenhouse"
-                elif "lever.co" in board:
-                    job_links = await parse_lever(board, client)
-                    source = "lever"
-                else:
-                    print(f"Unknown source for board: {board}")
-                    continue
+                fetched.append((entry.url, *validators))
 
-                print(f"[{source}] Found {len(job_links)} jobs on {board}")
-
-                for link in job_links[:100]:
-                    try:
-                        title, jd_text = await fetch_jd(link, client)
-                        payload = {
-                            "source": source,
-                            "title": title,
-                            "company": "",
-                            "location": "",
-                            "remote": False,
-                            "canonical_url": link,
-                            "raw_jd": jd_text,
-                        }
-                        r = await client.post(f"{API}/jobs/ingest", json=payload)
-                        print(link, r.status_code, r.text[:80])
-                    except Exception as e:
-                        print("job error:", e)
-            except Exception as e:
-                print("board error:", e)
+    await asyncio.to_thread(frontier.mark_fetched, fetched)
+    await asyncio.to_thread(frontier.mark_failed, failed)
+
+
+async def main(boards, recrawl=False, reclaim=False):
+    frontier = Frontier(FRONTIER_PATH, owner=WORKER_ID)
+    if reclaim:
+        print("leases released:", frontier.reclaim())
+    elif WORKER_ID:
+        # Whatever this worker leased before it last stopped is not being crawled by anyone.
+        print("leases reclaimed:", frontier.reclaim(WORKER_ID))
+    if recrawl:
+        print("requeued for recrawl:", frontier.requeue_fetched(kind="job"))
+    for board in boards:
+        source = board_source(board)
+        if source is None:
+            print(f"Unknown source for board: {board}")
+            continue
+        frontier.add([board], kind="board", source=source, company=board_company(board))
+        # Boards are re-read on every run for new links; job pages already fetched are not.
+        frontier.requeue([board])
+
+    if not HTTP2:
+        print('h2 is not installed, crawling over HTTP/1.1: pip install "httpx[http2]"')
+    limiter = Limiter()
+    pool = ParsePool()
+    sink = None if SINK == "api" else PostingSink(SINK_DIR, SINK, SINK_ROTATE_ROWS)
+    try:
+        async with make_client() as client, make_api_client() as api:
+            while True:
+                entries = await asyncio.to_thread(frontier.lease, BATCH_SIZE)
+                if not entries:
+                    wait = frontier.next_ready_in()
+                    if wait is None:
+                        break
+                    # Others hold the remaining URLs, or they wait out a retry backoff.
+                    await asyncio.sleep(min(wait, 5))
+                    continue
+                await crawl_round(entries, client, api, limiter, frontier, pool, sink)
+        print("frontier:", frontier.counts())
+    finally:
+        if sink is not None:
+            sink.close()
+        pool.close()
+        frontier.close()
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python crawler/crawl.py <board1> <board2> ...")
+    flags = {"--recrawl", "--reclaim"}
+    args = [arg for arg in sys.argv[1:] if arg not in flags]
+    if not args and not os.path.exists(FRONTIER_PATH):
+        print("Usage: python crawler/crawl.py [--recrawl] [--reclaim] <board1> <board2> ...")
         sys.exit(1)
-    asyncio.run(main(sys.argv[1:]))
+    asyncio.run(main(args, recrawl="--recrawl" in sys.argv[1:], reclaim="--reclaim" in sys.argv[1:]))
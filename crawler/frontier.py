@@ -0,0 +1,198 @@
+"""
+Persistent crawl frontier in a local SQLite file.
+
+Every URL the crawler knows about is a row with a state (pending, fetched or failed), a retry count, the hash of
+the last body fetched with its ETag / Last-Modified validators (for conditional re-fetches) and the last error.
+Workers lease pending URLs for LEASE seconds, so several crawler processes can share one frontier file, and a crawl
+that dies leaves its unfinished URLs pending for the next run. A restarted worker with a stable owner id, or a run
+that knows no other worker is alive, can reclaim those leases instead of waiting for them to expire.
+"""
+
+# --- stdlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+PENDING = "pending"
+FETCHED = "fetched"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    source TEXT,
+    company TEXT,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    last_error TEXT,
+    lease_owner TEXT,
+    lease_until REAL NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_urls_ready ON urls (state, lease_until);
+"""
+# Columns added after the first release; frontier files from older crawls get them on open.
+_ADDED_COLUMNS = {"etag": "TEXT", "last_modified": "TEXT"}
+
+
+@dataclass(frozen=True)
+class Entry:
+    url: str
+    kind: str
+    source: str
+    company: str
+    content_hash: str = None
+    etag: str = None
+    last_modified: str = None
+
+
+class Frontier:
+    """URL queue shared through a SQLite file; every method is safe to call from worker threads."""
+
+    def __init__(self, path, *, lease_seconds=300, max_attempts=3, retry_delay=30, owner=None):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.owner = owner or f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE.
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(urls)")}
+        for name, kind in _ADDED_COLUMNS.items():
+            if name not in columns:
+                self._db.execute(f"ALTER TABLE urls ADD COLUMN {name} {kind}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _transaction(self, work):
+        with self._lock:
+            # Takes the write lock up front so two processes cannot lease the same rows.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._db)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return result
+
+    def add(self, urls, *, kind, source="", company=""):
+        """Queue URLs that are not in the frontier yet; known URLs keep their state."""
+        now = time.time()
+        rows = [(url, kind, source, company, now) for url in urls]
+        return self._transaction(
+            lambda db: db.executemany(
+                "INSERT OR IGNORE INTO urls (url, kind, source, company, updated_at) VALUES (?, ?, ?, ?, ?)", rows
+            ).rowcount
+        )
+
+    def requeue(self, urls):
+        """Send URLs back to pending, e.g. board pages that should be crawled again for new links."""
+        now = time.time()
+        return self._transaction(
+            lambda db: db.executemany(
+                "UPDATE urls SET state = ?, attempts = 0, lease_owner = NULL, lease_until = 0, updated_at = ? "
+                "WHERE url = ?",
+                [(PENDING, now, url) for url in urls],
+            ).rowcount
+        )
+
+    def requeue_fetched(self, *, kind=None):
+        """Send every fetched URL back to pending for a recrawl; their validators make the re-fetch conditional."""
+        query = (
+            "UPDATE urls SET state = ?, attempts = 0, lease_owner = NULL, lease_until = 0, updated_at = ? "
+            "WHERE state = ?"
+        )
+        params = [PENDING, time.time(), FETCHED]
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        return self._transaction(lambda db: db.execute(query, params).rowcount)
+
+    def reclaim(self, owner=None):
+        """Release the leases `owner` (every worker when None) still holds, making those URLs ready again.
+
+        Retry backoffs are not leases and stay in place.
+        """
+        query = "UPDATE urls SET lease_owner = NULL, lease_until = 0 WHERE state = ? AND lease_owner IS NOT NULL"
+        params = [PENDING]
+        if owner is not None:
+            query += " AND lease_owner = ?"
+            params.append(owner)
+        return self._transaction(lambda db: db.execute(query, params).rowcount)
+
+    def lease(self, limit, *, kind=None):
+        """Claim up to `limit` pending URLs that nobody holds, boards before job pages."""
+
+        def _lease(db):
+            now = time.time()
+            query = (
+                "SELECT url, kind, source, company, content_hash, etag, last_modified FROM urls "
+                "WHERE state = ? AND lease_until <= ?"
+            )
+            params = [PENDING, now]
+            if kind is not None:
+                query += " AND kind = ?"
+                params.append(kind)
+            query += " ORDER BY kind = 'job', updated_at LIMIT ?"
+            entries = [Entry(*row) for row in db.execute(query, [*params, limit])]
+            db.executemany(
+                "UPDATE urls SET lease_owner = ?, lease_until = ? WHERE url = ?",
+                [(self.owner, now + self.lease_seconds, entry.url) for entry in entries],
+            )
+            return entries
+
+        return self._transaction(_lease)
+
+    def mark_fetched(self, results):
+        """Record `(url, content_hash, etag, last_modified)` tuples as fetched."""
+        now = time.time()
+        return self._transaction(
+            lambda db: db.executemany(
+                "UPDATE urls SET state = ?, content_hash = ?, etag = ?, last_modified = ?, last_error = NULL, "
+                "lease_owner = NULL, lease_until = 0, updated_at = ? WHERE url = ?",
+                [(FETCHED, *validators, now, url) for url, *validators in results],
+            ).rowcount
+        )
+
+    def mark_failed(self, failures):
+        """Record `(url, error)` pairs; URLs are retried with backoff until `max_attempts`, then fail for good."""
+        now = time.time()
+
+        def _fail(db):
+            for url, error in failures:
+                row = db.execute("SELECT attempts FROM urls WHERE url = ?", (url,)).fetchone()
+                attempts = (row[0] if row else 0) + 1
+                state = FAILED if attempts >= self.max_attempts else PENDING
+                db.execute(
+                    "UPDATE urls SET state = ?, attempts = ?, last_error = ?, lease_owner = NULL, lease_until = ?, "
+                    "updated_at = ? WHERE url = ?",
+                    (state, attempts, str(error)[:500], now + self.retry_delay * 2 ** (attempts - 1), now, url),
+                )
+
+        self._transaction(_fail)
+
+    def counts(self):
+        with self._lock:
+            counts = dict(self._db.execute("SELECT state, COUNT(*) FROM urls GROUP BY state"))
+        return {state: counts.get(state, 0) for state in (PENDING, FETCHED, FAILED)}
+
+    def next_ready_in(self):
+        """Seconds until some pending URL can be leased, or None when nothing is pending."""
+        with self._lock:
+            row = self._db.execute("SELECT MIN(lease_until) FROM urls WHERE state = ?", (PENDING,)).fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0.0)
@@ -0,0 +1,199 @@
+"""
+HTML parsing backends for the crawler.
+
+Board link and JD extraction go through a `Parser`, so the HTML engine can be swapped without touching crawl.py:
+  selectolax  lexbor C parser (pip install selectolax), the fastest
+  lxml        libxml2 through lxml.html (pip install lxml)
+  bs4-lxml    BeautifulSoup on the lxml tree builder
+  bs4         BeautifulSoup with the pure-Python html.parser, the reference the others are checked against
+CRAWL_HTML_PARSER picks a backend by name; by default the fastest installed one is used.
+`python crawler/bench_parsers.py` measures speed and parity on the saved pages in crawler/corpus.
+"""
+
+# --- stdlib
+import hashlib
+import os
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:  # pragma: no cover - optional dependency
+    BeautifulSoup = None
+
+try:
+    import lxml.html
+except ImportError:  # pragma: no cover - optional dependency
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
+# Job links on a board page are the hrefs that contain these.
+BOARD_LINKS = {"greenhouse": "/jobs/", "lever": "jobs/"}
+MAX_JD_CHARS = 200000
+# First match wins; the whole page is used when none of them exists.
+JD_CONTAINERS = ("#content", "#job", "section")
+_SKIPPED_TAGS = ["script", "style", "noscript", "template"]
+
+
+def absolute_link(board_url, href):
+    if href.startswith("http"):
+        return href
+    return board_url.rstrip("/") + "/" + href.lstrip("/")
+
+
+class Parser:
+    """Extraction the crawler needs from a page; subclasses implement `hrefs` and `jd`."""
+
+    name = None
+    available = False
+
+    def hrefs(self, html, needle):
+        """hrefs of the page's links that contain `needle`, in document order."""
+        raise NotImplementedError
+
+    def jd(self, html):
+        """(title, text) of a job page: the first h1 (else h2) and the text of the JD container."""
+        raise NotImplementedError
+
+    def links(self, board_url, html, needle):
+        return list(dict.fromkeys(absolute_link(board_url, href) for href in self.hrefs(html, needle)))
+
+
+class SoupParser(Parser):
+    name = "bs4"
+    features = "html.parser"
+    available = BeautifulSoup is not None
+
+    def _soup(self, html):
+        soup = BeautifulSoup(html, self.features)
+        for tag in soup(_SKIPPED_TAGS):
+            tag.decompose()
+        return soup
+
+    def hrefs(self, html, needle):
+        soup = BeautifulSoup(html, self.features)
+        return [a["href"] for a in soup.find_all("a", href=True) if needle in a["href"]]
+
+    def jd(self, html):
+        soup = self._soup(html)
+        title = soup.find("h1") or soup.find("h2")
+        title = title.get_text(strip=True) if title else "Job"
+        container = next((node for node in map(soup.select_one, JD_CONTAINERS) if node is not None), soup)
+        return title, container.get_text("\n", strip=True)[:MAX_JD_CHARS]
+
+
+class SoupLxmlParser(SoupParser):
+    name = "bs4-lxml"
+    features = "lxml"
+    available = BeautifulSoup is not None and lxml is not None
+
+
+class LxmlParser(Parser):
+    name = "lxml"
+    available = lxml is not None
+    # CSS selectors as XPath, so the cssselect package is not needed.
+    _containers = tuple(
+        f"//*[@id='{selector[1:]}']" if selector.startswith("#") else f"//{selector}" for selector in JD_CONTAINERS
+    )
+    _text = ".//text()[not(" + " or ".join(f"ancestor::{tag}" for tag in _SKIPPED_TAGS) + ")]"
+
+    def _document(self, html):
+        # lxml refuses str input that carries an encoding declaration, so hand it UTF-8 bytes instead.
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+        return lxml.html.document_fromstring(html.encode("utf-8"), parser=parser)
+
+    def _strings(self, node):
+        return [text.strip() for text in node.xpath(self._text) if text.strip()]
+
+    def hrefs(self, html, needle):
+        if not html.strip():
+            return []
+        return [str(href) for href in self._document(html).xpath("//a/@href") if needle in href]
+
+    def jd(self, html):
+        if not html.strip():
+            return "Job", ""
+        doc = self._document(html)
+        title = (doc.xpath("//h1") or doc.xpath("//h2") or [None])[0]
+        title = "".join(self._strings(title)) if title is not None else "Job"
+        container = next((found[0] for found in map(doc.xpath, self._containers) if found), doc)
+        return title, "\n".join(self._strings(container))[:MAX_JD_CHARS]
+
+
+class SelectolaxParser(Parser):
+    name = "selectolax"
+    available = LexborHTMLParser is not None
+
+    def hrefs(self, html, needle):
+        links = (a.attributes.get("href") for a in LexborHTMLParser(html).css("a[href]"))
+        return [href for href in links if href and needle in href]
+
+    def jd(self, html):
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(_SKIPPED_TAGS)
+        title = tree.css_first("h1") or tree.css_first("h2")
+        title = title.text(strip=True) if title is not None else "Job"
+        container = next((node for node in map(tree.css_first, JD_CONTAINERS) if node is not None), tree.root)
+        if container is None:
+            return title, ""
+        # Whitespace-only text nodes come back as empty lines; the other backends drop them.
+        text = container.text(separator="\n", strip=True)
+        return title, "\n".join(line for line in text.split("\n") if line)[:MAX_JD_CHARS]
+
+
+# Fastest first.
+PARSERS = {parser.name: parser for parser in (SelectolaxParser, LxmlParser, SoupLxmlParser, SoupParser)}
+
+
+def available_parsers():
+    return [name for name, parser in PARSERS.items() if parser.available]
+
+
+def get_parser(name=None):
+    """The named backend, or the fastest installed one when `name` is empty."""
+    name = name or os.getenv("CRAWL_HTML_PARSER", "")
+    if name:
+        if name not in PARSERS:
+            raise ValueError(f"unknown HTML parser {name!r}; choose from {', '.join(PARSERS)}")
+        if not PARSERS[name].available:
+            raise ValueError(f"HTML parser {name!r} is not installed")
+        return PARSERS[name]()
+    for parser in PARSERS.values():
+        if parser.available:
+            return parser()
+    raise RuntimeError("no HTML parser installed: pip install selectolax, lxml or beautifulsoup4")
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+_worker_parser = None
+
+
+def init_worker(name):
+    """ProcessPoolExecutor initializer: every worker parses with the parent's backend."""
+    global _worker_parser
+    _worker_parser = get_parser(name)
+
+
+def parse_batch(pages, parser=None):
+    """Parse `(url, html, needle)` pages, each into an `(error, result)` tuple.
+
+    `result` is the tuple of job links for a board page (`needle` set) or `(title, text)` for a job page. A page
+    that fails to parse gets an error message instead, so one bad page does not lose the rest of the batch.
+    """
+    global _worker_parser
+    if parser is None:
+        _worker_parser = parser = _worker_parser or get_parser()
+    results = []
+    for url, html, needle in pages:
+        try:
+            result = tuple(parser.links(url, html, needle)) if needle else parser.jd(html)
+        except Exception as exc:
+            results.append((f"{type(exc).__name__}: {exc}", None))
+        else:
+            results.append((None, result))
+    return results
@@ -0,0 +1,106 @@
+"""
+Local output for crawled postings, as an alternative to POSTing them to the API.
+
+Postings go to rotating files in a directory, ready for a bulk load with scripts/load_postings.py:
+
+  postings-<UTC start>-<pid>-<seq>.ndjson.gz
+
+Each crawl round is appended as its own gzip member and flushed, so a crawl that dies leaves every finished round
+readable (the loader skips a truncated last member). A file is closed once it holds CRAWL_SINK_ROTATE_ROWS postings.
+In parquet mode each closed file is then rewritten as a zstd-compressed .parquet file next to it; a crash before that
+leaves the .ndjson.gz, which loads the same way. Parquet needs pyarrow (pip install pyarrow).
+"""
+
+# --- stdlib
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+
+FORMATS = ("ndjson", "parquet")
+# Every posting has these keys; a fixed column order keeps Parquet files of one crawl on one schema.
+COLUMNS = ("source", "title", "company", "apply_url", "description")
+ROW_GROUP_ROWS = 10_000
+
+
+def _parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("the parquet sink needs pyarrow: pip install pyarrow") from None
+    return pyarrow, pyarrow.parquet
+
+
+def ndjson_to_parquet(path):
+    """Rewrite a finished .ndjson.gz file as .parquet and remove it; returns the new path.
+
+    Streams the file, one row group of ROW_GROUP_ROWS postings at a time.
+    """
+    pa, pq = _parquet()
+    schema = pa.schema([(name, pa.string()) for name in COLUMNS])
+    target = path.with_name(path.name[: -len(".ndjson.gz")] + ".parquet")
+    partial = target.with_name(target.name + ".tmp")
+
+    def write(writer, rows):
+        columns = [pa.array([row.get(name) for row in rows], pa.string()) for name in COLUMNS]
+        writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+    with gzip.open(path, "rb") as fh, pq.ParquetWriter(partial, schema, compression="zstd") as writer:
+        rows = []
+        for line in fh:
+            if line.strip():
+                rows.append(json.loads(line))
+            if len(rows) >= ROW_GROUP_ROWS:
+                write(writer, rows)
+                rows = []
+        if rows:
+            write(writer, rows)
+    os.replace(partial, target)
+    path.unlink()
+    return target
+
+
+class PostingSink:
+    def __init__(self, directory, fmt="ndjson", rotate_rows=100_000):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown sink format {fmt!r}; choose from {', '.join(FORMATS)}")
+        if fmt == "parquet":
+            _parquet()  # fail before crawling, not at the first rotation
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.rotate_rows = rotate_rows
+        self._prefix = f"postings-{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{os.getpid()}"
+        self._seq = 0
+        self._fh = None
+        self._path = None
+        self._rows = 0
+
+    def write(self, postings):
+        """Append one round of postings as a gzip member and flush it to disk."""
+        if not postings:
+            return
+        if self._fh is None:
+            self._seq += 1
+            self._path = self.directory / f"{self._prefix}-{self._seq:05d}.ndjson.gz"
+            self._fh = open(self._path, "ab")
+            self._rows = 0
+        body = "".join(json.dumps(posting, ensure_ascii=False) + "\n" for posting in postings)
+        self._fh.write(gzip.compress(body.encode("utf-8")))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._rows += len(postings)
+        if self._rows >= self.rotate_rows:
+            self._finish()
+
+    def _finish(self):
+        self._fh.close()
+        self._fh = None
+        path = ndjson_to_parquet(self._path) if self.fmt == "parquet" else self._path
+        print(f"sink: wrote {self._rows} postings to {path}")
+
+    def close(self):
+        if self._fh is not None:
+            self._finish()
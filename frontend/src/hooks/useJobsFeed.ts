@@ -25,6 +25,12 @@ export type JobSummary = {
   state?: "recommended" | "saved" | "applied";
 };
 
+export type JobSearchResponse = {
+  items: JobSummary[];
+  total: number;
+  facets: Record<string, Record<string, number>>;
+};
+
 export function useJobsFeed() {
   const { token, logout } = useAuth();
 
@@ -37,7 +43,7 @@ export function useJobsFeed() {
         throw new Error("API Error 401");
       }
 
-      return apiPostAuthorized<JobSummary[]>("/jobs/search", {}, token);
+      return apiPostAuthorized<JobSearchResponse>("/jobs/search", {}, token).then((page) => page.items);
     },
   });
 
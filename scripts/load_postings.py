@@ -0,0 +1,58 @@
+# ruff: noqa: E402
+"""Bulk-load crawler sink files (CRAWL_SINK=ndjson|parquet) into the jobs table.
+
+Usage:
+  python scripts/load_postings.py crawl_out/ [more files or directories] [--batch-size N]
+
+Runs against DATABASE_URL directly, not the API: COPY on Postgres, batched
+executemany elsewhere. Loading a file twice is harmless (rows upsert on
+content_hash). Running API processes pick the new rows up in their search
+index on the next index sync.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_PATH = ROOT / "backend"
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.core.db import Base, SessionLocal, engine
+from app.services.ingest.bulk_load import load_postings
+
+logging.basicConfig(level=logging.INFO)
+LOGGER = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help=".ndjson.gz / .parquet files, or directories of them")
+    parser.add_argument("--batch-size", type=int, default=None, help="rows per COPY/commit (INGEST_BATCH_SIZE)")
+    parser.add_argument("--source", default="crawler", help="source recorded for postings without one")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    started = time.perf_counter()
+    try:
+        result = load_postings(session, args.paths, batch_size=args.batch_size, source=args.source)
+    finally:
+        session.close()
+    elapsed = time.perf_counter() - started
+    LOGGER.info(
+        "Loaded %d of %d postings from %d files in %.1fs (%.0f rows/s)",
+        result.loaded,
+        result.read,
+        result.files,
+        elapsed,
+        result.read / elapsed if elapsed else 0,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -15,8 +15,11 @@ from sqlalchemy.pool import StaticPool
 
 ROOT = Path(__file__).resolve().parents[1]
 BACKEND_PATH = ROOT / "backend"
-if str(BACKEND_PATH) not in sys.path:
-    sys.path.insert(0, str(BACKEND_PATH))
+# The crawler is a set of standalone scripts importing each other as top-level modules.
+CRAWLER_PATH = ROOT / "crawler"
+for path in (BACKEND_PATH, CRAWLER_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
 
 from app.api.deps import require_db  # noqa: E402
 from app.core.cache import get_redis  # noqa: E402
@@ -151,9 +154,14 @@ class InMemoryRedis:
             return slice_items
         return [member for member, _ in slice_items]
 
-    async def set(self, key: str, value: Any) -> bool:
+    async def set(self, key: str, value: Any, *, ex: int | None = None, nx: bool = False) -> bool | None:
+        self._purge()
+        if nx and (key in self._store or key in self._zsets):
+            return None
         self._store[key] = value
         self._expiry.pop(key, None)
+        if ex is not None:
+            await self.expire(key, ex)
         return True
 
     async def get(self, key: str) -> Any:
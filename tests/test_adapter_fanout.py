@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes_jobs
+from app.core.config import settings
+from app.services.search import job_index
+from app.services.search import adapter_cache
+from app.services.search.adapter_cache import AdapterResultCache
+from app.services.search.fanout import SourceStatus, breaker_for, fetch_adapter, reset_breakers
+
+
+class FakeAdapter:
+    def __init__(self, source: str, delays: list[float], fail: bool = False) -> None:
+        self.source = source
+        self.delays = list(delays)
+        self.fail = fail
+        self.calls = 0
+
+    async def fetch(self, query: str = "", location: str = "Dubai"):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return [{"title": f"{self.source} role", "company": "Acme", "apply_url": f"https://{self.source}.example/1"}]
+
+
+@pytest.fixture(autouse=True)
+def fast_budget(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    monkeypatch.setattr(settings, "SEARCH_DEADLINE_MS", 300)
+    monkeypatch.setattr(settings, "ADAPTER_TIMEOUT_MS", 200)
+    monkeypatch.setattr(settings, "ADAPTER_HEDGE_DELAY_MS", 50)
+    monkeypatch.setattr(settings, "ADAPTER_BREAKER_THRESHOLD", 2)
+    reset_breakers()
+    job_index.clear()
+    yield
+    reset_breakers()
+    job_index.clear()
+
+
+async def _fetch(adapter: FakeAdapter):
+    deadline = asyncio.get_running_loop().time() + settings.SEARCH_DEADLINE_MS / 1000
+    return await fetch_adapter(adapter, query="", location="Dubai", deadline=deadline)
+
+
+def test_hedged_attempt_answers_for_slow_first_call() -> None:
+    adapter = FakeAdapter("slowfirst", delays=[1.0, 0.01])
+    items, report = asyncio.run(_fetch(adapter))
+    assert report.status == SourceStatus.ok
+    assert report.hedged is True
+    assert len(items) == 1
+    assert adapter.calls == 2
+
+
+def test_hung_adapter_times_out_and_trips_breaker() -> None:
+    adapter = FakeAdapter("hung", delays=[5.0])
+    for _ in range(2):
+        items, report = asyncio.run(_fetch(adapter))
+        assert items == []
+        assert report.status == SourceStatus.timeout
+    assert breaker_for("hung").state == "open"
+
+    _, report = asyncio.run(_fetch(adapter))
+    assert report.status == SourceStatus.skipped
+
+
+def test_cancelled_half_open_probe_lets_the_next_call_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ADAPTER_BREAKER_RESET_SECONDS", 0.0)
+    breaker = breaker_for("flaky")
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+
+    async def _cancel_probe() -> None:
+        task = asyncio.ensure_future(_fetch(FakeAdapter("flaky", delays=[5.0])))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_cancel_probe())
+    items, report = asyncio.run(_fetch(FakeAdapter("flaky", delays=[0.0])))
+    assert report.status == SourceStatus.ok
+    assert len(items) == 1
+    assert breaker.state == "closed"
+
+
+def test_search_reports_partial_sources(
+    client: TestClient, create_user, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    adapters = [FakeAdapter("fast", delays=[0.0]), FakeAdapter("broken", delays=[0.0], fail=True)]
+    monkeypatch.setattr(routes_jobs, "ADAPTERS", adapters)
+    create_user(email="fanout@example.com", password="StrongPass!123")
+    token = client.post("/auth/login", json={"email": "fanout@example.com", "password": "StrongPass!123"})
+    headers = {"Authorization": f"Bearer {token.json()['access_token']}"}
+
+    body = client.post("/jobs/search", json={}, headers=headers).json()
+    assert body["partial"] is True
+    assert {source["source"]: source["status"] for source in body["sources"]} == {"fast": "ok", "broken": "error"}
+    assert [job["title"] for job in body["items"]] == ["fast role"]
+
+
+def test_cache_coalesces_concurrent_misses(redis_client) -> None:
+    adapter = FakeAdapter("shared", delays=[0.02])
+    cache = AdapterResultCache(redis_client, ttl=60, stale_ttl=60)
+
+    async def _burst():
+        deadline = asyncio.get_running_loop().time() + 1
+        return await asyncio.gather(
+            *(cache.fetch(adapter, query="Data  Engineer", location="dubai", deadline=deadline) for _ in range(5))
+        )
+
+    results = asyncio.run(_burst())
+    assert adapter.calls == 1
+    assert all(len(items) == 1 for items, _ in results)
+    assert sorted(report.cache for _, report in results) == ["coalesced"] * 4 + ["miss"]
+
+    async def _again():
+        deadline = asyncio.get_running_loop().time() + 1
+        return await cache.fetch(adapter, query="data engineer", location="Dubai", deadline=deadline)
+
+    _, report = asyncio.run(_again())
+    assert report.cache == "hit"
+    assert adapter.calls == 1
+
+
+def test_cancelled_caller_does_not_fail_coalesced_callers(redis_client) -> None:
+    adapter = FakeAdapter("cancelled", delays=[0.03])
+    cache = AdapterResultCache(redis_client, ttl=60, stale_ttl=60)
+
+    async def _run():
+        deadline = asyncio.get_running_loop().time() + 1
+        leader = asyncio.ensure_future(cache.fetch(adapter, query="", location="", deadline=deadline))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(cache.fetch(adapter, query="", location="", deadline=deadline))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        items, report = await follower
+        return leader.cancelled(), items, report
+
+    leader_cancelled, items, report = asyncio.run(_run())
+    assert leader_cancelled
+    assert len(items) == 1
+    assert (report.status, report.cache) == (SourceStatus.ok, "coalesced")
+    assert adapter.calls == 1
+
+
+def test_miss_locked_by_another_worker_times_out_without_tripping_breaker(redis_client) -> None:
+    adapter = FakeAdapter("locked", delays=[0.0])
+    cache = AdapterResultCache(redis_client, ttl=60, stale_ttl=60)
+
+    async def _run():
+        assert await cache._acquire_lock("locked", adapter_cache._digest("", ""))
+        deadline = asyncio.get_running_loop().time() + 0.12
+        return await cache.fetch(adapter, query="", location="", deadline=deadline)
+
+    items, report = asyncio.run(_run())
+    assert items == []
+    assert report.status == SourceStatus.timeout
+    assert adapter.calls == 0
+    assert breaker_for("locked").failures == 0
+
+
+def test_interrupted_miss_releases_its_lock(redis_client) -> None:
+    adapter = FakeAdapter("interrupted", delays=[5.0])
+    cache = AdapterResultCache(redis_client, ttl=60, stale_ttl=60)
+    digest = adapter_cache._digest("", "")
+
+    async def _run():
+        deadline = asyncio.get_running_loop().time() + 1
+        caller = asyncio.ensure_future(cache.fetch(adapter, query="", location="", deadline=deadline))
+        await asyncio.sleep(0.01)
+        (load,) = adapter_cache._inflight.values()
+        load.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        return await cache._acquire_lock("interrupted", digest)
+
+    assert asyncio.run(_run()) is True
+    assert adapter_cache._inflight == {}
+
+
+def test_cache_serves_stale_while_refreshing(redis_client) -> None:
+    adapter = FakeAdapter("stale", delays=[0.0])
+    cache = AdapterResultCache(redis_client, ttl=0, stale_ttl=60)
+
+    async def _run():
+        deadline = asyncio.get_running_loop().time() + 1
+        await cache.fetch(adapter, query="", location="", deadline=deadline)
+        await asyncio.sleep(0.01)
+        _, report = await cache.fetch(adapter, query="", location="", deadline=deadline)
+        await asyncio.sleep(0.05)
+        return report
+
+    report = asyncio.run(_run())
+    assert report.cache == "stale"
+    assert adapter.calls == 2
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import csv
+import io
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.models import Job
+from app.services.ingest import bulk_load
+from app.services.ingest.bulk_load import copy_payload, load_postings
+from app.services.ingest.store import content_hash, job_row
+
+import sink as posting_sink
+from sink import PostingSink
+
+
+def _posting(n: int, description: str = "Build batch and streaming pipelines.") -> dict:
+    return {
+        "source": "greenhouse",
+        "title": f"Data Engineer {n}",
+        "company": "acmeco",
+        "apply_url": f"https://boards.greenhouse.io/acmeco/jobs/{n}",
+        "description": description,
+    }
+
+
+def _crawl(directory: Path, fmt: str) -> None:
+    sink = PostingSink(directory, fmt, rotate_rows=40)
+    for start in range(0, 100, 25):
+        sink.write([_posting(n) for n in range(start, start + 25)])
+    # Recrawled pages come back in a later file; the newest copy wins.
+    sink.write([_posting(0, "Build streaming pipelines.")])
+    sink.close()
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "parquet"])
+def test_sink_files_bulk_load_into_jobs(db_session, tmp_path: Path, fmt: str) -> None:
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    _crawl(tmp_path, fmt)
+    suffix = ".parquet" if fmt == "parquet" else ".ndjson.gz"
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert len(files) == 3 and all(name.endswith(suffix) for name in files)
+
+    try:
+        result = load_postings(db_session, [tmp_path], batch_size=30)
+        assert (result.files, result.read) == (3, 101)
+        assert db_session.scalar(select(func.count(Job.id))) == 100
+        job = db_session.scalar(select(Job).where(Job.content_hash == content_hash(_posting(0))))
+        assert job.description == "Build streaming pipelines."
+
+        # Loading again only rewrites the same rows.
+        load_postings(db_session, [tmp_path], batch_size=30)
+        assert db_session.scalar(select(func.count(Job.id))) == 100
+    finally:
+        db_session.execute(delete(Job))
+        db_session.commit()
+
+
+def test_truncated_round_is_skipped(db_session, tmp_path: Path) -> None:
+    sink = PostingSink(tmp_path, rotate_rows=1000)
+    sink.write([_posting(n) for n in range(10)])
+    sink.write([_posting(n) for n in range(10, 20)])
+    sink.close()
+    (path,) = tmp_path.iterdir()
+    # A crash in the middle of the second round.
+    path.write_bytes(path.read_bytes()[:-20])
+
+    try:
+        result = load_postings(db_session, [path])
+        assert (result.read, result.loaded) == (10, 10)
+        stored = set(db_session.scalars(select(Job.content_hash)))
+        assert stored == {content_hash(_posting(n)) for n in range(10)}
+    finally:
+        db_session.execute(delete(Job))
+        db_session.commit()
+
+
+def test_copy_payload_writes_null_fields_unquoted() -> None:
+    posting = _posting(1, 'Build "real-time" pipelines,\nin Python.')
+    posting.update(salary_low=12000.5, location="", posted_date=datetime(2026, 10, 1, tzinfo=timezone.utc))
+    row = job_row(posting)
+    payload = copy_payload([row, job_row(_posting(2))])
+
+    first, second = csv.reader(io.StringIO(payload))
+    values = dict(zip(bulk_load._COLUMNS, first))
+    assert values["salary_low"] == "12000.5"
+    assert values["posted_date"] == "2026-10-01T00:00:00+00:00"
+    assert values["description"] == posting["description"]
+    assert values["alternate_sources"] == "[]"
+    assert len(second) == len(bulk_load._COLUMNS)
+
+    # Postgres reads an unquoted empty field as NULL and a quoted one as an empty string.
+    raw = dict(zip(bulk_load._COLUMNS, payload.splitlines()[-1].split(",")))
+    assert raw["salary_high"] == raw["posted_date"] == raw["location"] == ""
+    assert raw["company"] == '"acmeco"'
+    assert ',"",' in payload.split("\n")[0]
+
+
+def test_parquet_sink_writes_row_groups(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(posting_sink, "ROW_GROUP_ROWS", 10)
+    sink = PostingSink(tmp_path, "parquet", rotate_rows=1000)
+    sink.write([_posting(n) for n in range(25)])
+    sink.close()
+
+    (path,) = tmp_path.iterdir()
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().column("title").to_pylist() == [f"Data Engineer {n}" for n in range(25)]
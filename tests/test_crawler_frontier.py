@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from frontier import FAILED, FETCHED, PENDING, Frontier
+
+URLS = [f"https://boards.greenhouse.io/acmeco/jobs/{n}" for n in range(10)]
+
+
+@pytest.fixture()
+def frontier_path(tmp_path: Path) -> Path:
+    path = tmp_path / "frontier.sqlite3"
+    seed = Frontier(path)
+    seed.add(URLS, kind="job", source="greenhouse", company="acmeco")
+    seed.close()
+    return path
+
+
+def test_workers_never_lease_the_same_url(frontier_path: Path) -> None:
+    first, second = Frontier(frontier_path, owner="a"), Frontier(frontier_path, owner="b")
+    try:
+        leased_a = first.lease(6)
+        leased_b = second.lease(10)
+        assert len(leased_a) == 6 and len(leased_b) == 4
+        assert {entry.url for entry in leased_a}.isdisjoint(entry.url for entry in leased_b)
+        assert first.lease(10) == [] and second.lease(10) == []
+    finally:
+        first.close()
+        second.close()
+
+
+def test_expired_lease_is_handed_to_the_next_worker(frontier_path: Path) -> None:
+    crashed = Frontier(frontier_path, lease_seconds=0.05, owner="crashed")
+    leased = crashed.lease(3)
+    crashed.close()  # dies without marking anything
+
+    resumed = Frontier(frontier_path, owner="resumed")
+    try:
+        assert {entry.url for entry in resumed.lease(10)} == set(URLS) - {entry.url for entry in leased}
+        time.sleep(0.1)
+        assert {entry.url for entry in resumed.lease(10)} == {entry.url for entry in leased}
+        resumed.mark_fetched([(entry.url, "hash", None, None) for entry in leased])
+        assert resumed.counts() == {PENDING: 7, FETCHED: 3, FAILED: 0}
+    finally:
+        resumed.close()
+
+
+def test_restarted_worker_reclaims_its_own_leases(frontier_path: Path) -> None:
+    crashed = Frontier(frontier_path, owner="worker-1")
+    mine = {entry.url for entry in crashed.lease(3)}
+    crashed.close()
+    other = Frontier(frontier_path, owner="worker-2")
+    theirs = {entry.url for entry in other.lease(2)}
+    backing_off = next(url for url in URLS if url not in mine | theirs)
+    other.mark_failed([(backing_off, "HTTP 503")])  # a retry backoff, not a lease
+
+    restarted = Frontier(frontier_path, owner="worker-1")
+    try:
+        assert restarted.reclaim("worker-1") == 3
+        leased = {entry.url for entry in restarted.lease(10)}
+        assert mine <= leased and leased.isdisjoint(theirs) and backing_off not in leased
+
+        # With no other crawler alive, every lease can go.
+        assert restarted.reclaim() == len(leased) + len(theirs)
+        assert {entry.url for entry in restarted.lease(10)} == leased | theirs
+    finally:
+        restarted.close()
+        other.close()
+
+
+def _ready_in(frontier: Frontier, url: str) -> float:
+    (until,) = frontier._db.execute("SELECT lease_until FROM urls WHERE url = ?", (url,)).fetchone()
+    return until - time.time()
+
+
+def test_failed_urls_back_off_exponentially(frontier_path: Path) -> None:
+    frontier = Frontier(frontier_path, retry_delay=10, max_attempts=5)
+    try:
+        (entry,) = frontier.lease(1)
+        frontier.mark_failed([(entry.url, "HTTP 503")])
+        assert _ready_in(frontier, entry.url) == pytest.approx(10, abs=1)
+        assert entry.url not in {leased.url for leased in frontier.lease(10)}
+
+        frontier.mark_failed([(entry.url, "HTTP 503")])
+        assert _ready_in(frontier, entry.url) == pytest.approx(20, abs=1)
+        frontier.mark_failed([(entry.url, "HTTP 503")])
+        assert _ready_in(frontier, entry.url) == pytest.approx(40, abs=1)
+        assert frontier.counts()[PENDING] == 10
+    finally:
+        frontier.close()
+
+
+def test_urls_fail_for_good_after_max_attempts(frontier_path: Path) -> None:
+    frontier = Frontier(frontier_path, retry_delay=0, max_attempts=2)
+    try:
+        url = URLS[0]
+        frontier.mark_failed([(url, "HTTP 500")])
+        assert url in {entry.url for entry in frontier.lease(10)}
+        frontier.mark_failed([(url, "HTTP 500")])
+        assert frontier.counts() == {PENDING: 9, FETCHED: 0, FAILED: 1}
+        (state, attempts, error) = frontier._db.execute(
+            "SELECT state, attempts, last_error FROM urls WHERE url = ?", (url,)
+        ).fetchone()
+        assert (state, attempts, error) == (FAILED, 2, "HTTP 500")
+    finally:
+        frontier.close()
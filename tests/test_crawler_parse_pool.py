@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import bench_parsers
+from crawl import PARSER, ParsePool
+from parsers import BOARD_LINKS, parse_batch
+
+PAGES = [
+    (page["url"], page["html"], BOARD_LINKS[page["source"]] if page["kind"] == "board" else None)
+    for page in bench_parsers.load_corpus(bench_parsers.CORPUS)
+]
+
+
+def _parse_all(pool: ParsePool) -> list:
+    async def _run() -> list:
+        return await asyncio.gather(*(pool.parse(*page) for page in PAGES))
+
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_pool_results_match_in_process_parsing(workers: int) -> None:
+    expected = [result for _, result in parse_batch(PAGES, PARSER)]
+    pool = ParsePool(workers=workers, batch_size=3, wait=0.01)
+    try:
+        assert _parse_all(pool) == expected
+    finally:
+        pool.close()
+
+
+def test_close_fails_waiting_pages_instead_of_hanging() -> None:
+    pool = ParsePool(workers=1, batch_size=2, wait=0.01)
+
+    async def _run() -> list:
+        tasks = [asyncio.ensure_future(pool.parse(*page)) for page in PAGES * 50]
+        # Let the first batches reach the executor, then shut down with most of them still queued.
+        await asyncio.sleep(0.011)
+        pool.close()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=10)
+
+    results = asyncio.run(_run())
+    failed = [result for result in results if isinstance(result, Exception)]
+    assert failed and all(str(error) == "parse failed: parse pool closed" for error in failed)
+    assert all(isinstance(result, tuple) for result in results if not isinstance(result, Exception))
+
+    async def _after_close() -> None:
+        await asyncio.wait_for(pool.parse(*PAGES[0]), timeout=5)
+
+    with pytest.raises(RuntimeError, match="parse failed: RuntimeError"):
+        asyncio.run(_after_close())
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+import bench_parsers
+import parsers
+
+BACKENDS = parsers.available_parsers()
+JOB_PAGE = """
+<html><head><title>Acme careers</title><script>var tracking = "do not index";</script></head>
+<body>
+  <nav>All jobs</nav>
+  <div id="content">
+    <h1>  Data Engineer  </h1>
+    <style>.x { color: red }</style>
+    <p>Build batch and streaming pipelines.</p>
+    <ul><li>Python</li><li>SQL &amp; Airflow</li></ul>
+  </div>
+</body></html>
+"""
+BOARD_PAGE = """
+<html><body>
+  <a href="https://boards.greenhouse.io/acmeco/jobs/1">Data Engineer</a>
+  <a href="https://boards.greenhouse.io/acmeco/jobs/2?gh_src=board">SRE</a>
+  <a href="https://boards.greenhouse.io/acmeco/jobs/1">Data Engineer (again)</a>
+  <a href="https://acme.example/about">About</a>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backend_extracts_job_page_fields(name: str) -> None:
+    title, text = parsers.get_parser(name).jd(JOB_PAGE)
+    assert title == "Data Engineer"
+    assert text.split() == "Data Engineer Build batch and streaming pipelines. Python SQL & Airflow".split()
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backend_extracts_board_links(name: str) -> None:
+    links = parsers.get_parser(name).links("https://boards.greenhouse.io/acmeco", BOARD_PAGE, "/jobs/")
+    assert links == [
+        "https://boards.greenhouse.io/acmeco/jobs/1",
+        "https://boards.greenhouse.io/acmeco/jobs/2?gh_src=board",
+    ]
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backend_matches_reference_on_corpus(name: str) -> None:
+    reference = parsers.get_parser(bench_parsers.REFERENCE)
+    parser = parsers.get_parser(name)
+    for page in bench_parsers.load_corpus(bench_parsers.CORPUS):
+        expected = bench_parsers.normalized(bench_parsers.extract(reference, page))
+        assert bench_parsers.normalized(bench_parsers.extract(parser, page)) == expected, page["name"]
+
+
+def test_fastest_installed_backend_is_the_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("CRAWL_HTML_PARSER", raising=False)
+    monkeypatch.setattr(parsers.SelectolaxParser, "available", False)
+    monkeypatch.setattr(parsers.LxmlParser, "available", False)
+    assert parsers.get_parser().name == "bs4-lxml"
+    assert "selectolax" not in parsers.available_parsers()
+
+    monkeypatch.setenv("CRAWL_HTML_PARSER", "selectolax")
+    with pytest.raises(ValueError, match="not installed"):
+        parsers.get_parser()
+    with pytest.raises(ValueError, match="unknown HTML parser"):
+        parsers.get_parser("html5lib")
+
+    monkeypatch.delenv("CRAWL_HTML_PARSER")
+    for parser in parsers.PARSERS.values():
+        monkeypatch.setattr(parser, "available", False)
+    with pytest.raises(RuntimeError, match="no HTML parser installed"):
+        parsers.get_parser()
@@ -12,4 +12,9 @@ def test_healthz(client: TestClient) -> None:
 def test_readyz(client: TestClient) -> None:
     response = client.get("/readyz")
     assert response.status_code == 200
-    assert response.json() == {"ok": True}
+    body = response.json()
+    assert body["ok"] is True
+    assert body["ingest"]["role"] == "disabled"
+    assert body["ingest"]["leader"] is None
+    assert body["ingest"]["last_run"] is None
+    assert body["ingest"]["seen_filter"]["bytes"] > 0
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import time
+from pathlib import Path
+from typing import List
+
+import httpx
+import pytest
+
+from app.core.http_archive import ArchiveWriter, RecordingTransport, ReplayArchive, ReplayTransport, iter_records
+
+PAGE = "<html><body><h1>Data Engineer</h1><p>Build pipelines.</p></body></html>"
+
+
+def _origin(calls: List[str]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(f"{request.method} {request.url}")
+        if request.method == "POST":
+            return httpx.Response(201, json={"received": request.content.decode()})
+        version = sum(call.startswith("GET") for call in calls)
+        body = gzip.compress(PAGE.replace("pipelines", f"pipelines v{version}").encode())
+        return httpx.Response(200, content=body, headers={"Content-Encoding": "gzip", "ETag": f'"{version}"'})
+
+    return httpx.MockTransport(handler)
+
+
+def test_replay_serves_recorded_exchanges_in_order(tmp_path: Path) -> None:
+    path = tmp_path / "crawl.warc.gz"
+    calls: List[str] = []
+
+    async def _record() -> List[httpx.Response]:
+        transport = RecordingTransport(ArchiveWriter(path), _origin(calls))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [
+                await client.get("https://jobs.example.com/1"),
+                await client.get("https://jobs.example.com/1"),
+                await client.post("https://api.example.com/ingest", content=b'{"title": "x"}'),
+            ]
+
+    recorded = asyncio.run(_record())
+    assert [r.text for r in recorded[:2]] == [PAGE.replace("pipelines", f"pipelines v{n}") for n in (1, 2)]
+    assert [headers["WARC-Type"] for headers, _ in iter_records(path)] == ["request", "response"] * 3
+
+    archive = ReplayArchive(path)
+    assert len(archive) == 3
+
+    async def _replay(latency_ms: float = 0.0) -> List[httpx.Response]:
+        async with httpx.AsyncClient(transport=ReplayTransport(archive, latency_ms=latency_ms)) as client:
+            return [
+                await client.get("https://jobs.example.com/1"),
+                await client.get("https://jobs.example.com/1"),
+                await client.get("https://jobs.example.com/1"),
+                await client.post("https://api.example.com/ingest", content=b'{"title": "x"}'),
+            ]
+
+    replayed = asyncio.run(_replay())
+    assert len(calls) == 3
+    assert [r.text for r in replayed[:2]] == [r.text for r in recorded[:2]]
+    # Used-up keys keep serving their last response.
+    assert replayed[2].text == recorded[1].text
+    assert replayed[1].headers["ETag"] == '"2"'
+    assert replayed[3].status_code == 201 and replayed[3].json() == recorded[2].json()
+
+    started = time.perf_counter()
+    asyncio.run(_replay(latency_ms=20))
+    assert time.perf_counter() - started >= 0.08
+
+    async def _unknown() -> None:
+        async with httpx.AsyncClient(transport=ReplayTransport(archive)) as client:
+            await client.get("https://jobs.example.com/2")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(_unknown())
@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import fakeredis.aioredis
+import pytest
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models import IngestWatermark, Job, JobArchive
+from app.services.ingest import pipeline as ingest_pipeline
+from app.services.ingest import scheduler as ingest_scheduler
+from app.services.ingest.base import BaseAdapter
+from app.services.ingest.bloom import BloomFilter, seen_postings
+from app.services.ingest.dedupe import JobDeduplicator, job_deduplicator
+from app.services.ingest.leader import LeaderLease
+from app.services.ingest.lifecycle import run_lifecycle
+from app.services.ingest.polling import AdaptivePollPolicy, poll_policy
+from app.core.config import settings
+from app.services.ingest.store import content_hash, jobs_snapshot, upsert_jobs
+from app.services.search import JobIndex, job_index
+
+DESCRIPTION = (
+    "We are hiring a data engineer to build batch and streaming pipelines on Snowflake and Airflow. "
+    "You will model warehouse tables, own data quality checks and mentor two junior engineers. "
+    "Five years of Python and SQL experience required; Arabic is a plus."
+)
+
+
+def _posting(source: str, title: str, description: str = DESCRIPTION, company: str = "Acme") -> dict:
+    return {
+        "title": title,
+        "company": company,
+        "description": description,
+        "apply_url": f"https://{source}.example.com/jobs/{title.replace(' ', '-').lower()}",
+        "source": source,
+    }
+
+
+def test_near_duplicates_collapse_into_canonical_posting() -> None:
+    deduper = JobDeduplicator(threshold=0.6)
+    index = JobIndex()
+
+    first = deduper.collapse([_posting("bayt", "Senior Data Engineer")])
+    index.upsert_many(first)
+    later = deduper.collapse(
+        [
+            _posting("linkedin", "Sr. Data Engineer", DESCRIPTION.replace("two junior", "2 junior")),
+            _posting("indeed", "Backend Engineer", "Build payment APIs in Go and Kafka for a fintech scale-up."),
+        ]
+    )
+    index.upsert_many(later)
+
+    assert len(index) == 2
+    canonical = later[0]
+    assert canonical["source"] == "bayt"
+    assert canonical["alternate_sources"] == [
+        {"source": "linkedin", "apply_url": "https://linkedin.example.com/jobs/sr.-data-engineer"}
+    ]
+    assert later[1]["alternate_sources"] == []
+
+
+def test_refetching_keeps_alternate_sources_and_same_source_postings() -> None:
+    deduper = JobDeduplicator(threshold=0.6)
+    batch = [_posting("bayt", "Senior Data Engineer"), _posting("linkedin", "Senior Data Engineer")]
+    deduper.collapse(batch)
+
+    refreshed = deduper.collapse(batch)
+    assert len(refreshed) == 1
+    assert [alt["source"] for alt in refreshed[0]["alternate_sources"]] == ["linkedin"]
+
+    # Two listings from the same source are kept apart even when they read alike.
+    same_source = deduper.collapse([_posting("bayt", "Senior Data Engineer II")])
+    assert same_source[0]["alternate_sources"] == []
+    assert len(deduper) == 2
+
+
+def test_bulk_upsert_writes_batches_keyed_on_content_hash(db_session) -> None:
+    postings = [_posting("bayt", f"Engineer {n}") for n in range(2500)]
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", _count)
+    try:
+        assert upsert_jobs(db_session, postings, batch_size=1000) == 2500
+        db_session.commit()
+        inserts = [statement for statement in statements if statement.startswith("INSERT INTO jobs")]
+        assert len(inserts) == 3
+
+        # Same identity, new details: rows are updated in place, not duplicated.
+        changed = [{**posting, "description": "Updated", "salary_low": 1000} for posting in postings[:10]]
+        upsert_jobs(db_session, changed + changed)
+        db_session.commit()
+    finally:
+        event.remove(bind, "before_cursor_execute", _count)
+
+    assert db_session.scalar(select(func.count(Job.id))) == 2500
+    job = db_session.scalar(select(Job).where(Job.content_hash == content_hash(postings[0])))
+    assert (job.description, job.salary_low) == ("Updated", 1000)
+
+    db_session.execute(delete(Job))
+    db_session.commit()
+
+
+class FeedAdapter(BaseAdapter):
+    """Serves a fixed feed after ``delay`` seconds and remembers the ``since`` it was asked for."""
+
+    def __init__(self, source: str, postings: list[dict], delay: float = 0.0) -> None:
+        self.source = source
+        self.postings = postings
+        self.delay = delay
+        self.calls: list[datetime | None] = []
+
+    async def fetch(self, query: str = "", location: str = "Dubai", since: datetime | None = None):
+        self.calls.append(since)
+        await asyncio.sleep(self.delay)
+        return list(self.postings)
+
+
+class SerializedSession(Session):
+    """The in-memory test database is one shared connection; ingest threads take turns on it."""
+
+    _lock = threading.RLock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        return super().__enter__()
+
+    def __exit__(self, *exc_info):
+        try:
+            return super().__exit__(*exc_info)
+        finally:
+            self._lock.release()
+
+
+@pytest.fixture()
+def ingest_db(db_session, monkeypatch, tmp_path):
+    session_factory = sessionmaker(bind=db_session.get_bind(), class_=SerializedSession)
+    monkeypatch.setattr(ingest_scheduler, "SessionLocal", session_factory)
+    monkeypatch.setattr(ingest_scheduler, "_source_limits", {})
+    monkeypatch.setattr(ingest_scheduler, "_overall", None)
+    monkeypatch.setattr(settings, "INGEST_SEEN_FILTER_PATH", str(tmp_path / "seen.bloom"))
+    seen_postings.reset()
+    poll_policy.clear()
+    job_index.clear()
+    job_deduplicator.clear()
+    yield db_session
+    poll_policy.clear()
+    seen_postings.reset()
+    job_index.clear()
+    job_deduplicator.clear()
+    db_session.execute(delete(Job))
+    db_session.execute(delete(JobArchive))
+    db_session.execute(delete(IngestWatermark))
+    db_session.commit()
+
+
+def test_ingest_fetches_sources_concurrently_and_keeps_watermarks(ingest_db, monkeypatch) -> None:
+    now = datetime.now(tz=timezone.utc).replace(microsecond=0)
+    old = {**_posting("bayt", "Data Engineer"), "posted_date": now - timedelta(days=3)}
+    new = {**_posting("bayt", "Backend Engineer", "Go services."), "posted_date": now}
+    bayt = FeedAdapter("bayt", [old, new], delay=0.2)
+    indeed = FeedAdapter("indeed", [_posting("indeed", "Nurse", "Patient care on night shifts.")], delay=0.2)
+    monkeypatch.setattr(ingest_scheduler, "ADAPTERS", [bayt, indeed])
+
+    started = time.perf_counter()
+    asyncio.run(ingest_scheduler.ingest_once())
+    assert time.perf_counter() - started < 0.35
+    assert ingest_db.scalar(select(func.count(Job.id))) == 3
+    watermark = ingest_db.get(IngestWatermark, "bayt")
+    assert watermark.last_posted_at.replace(tzinfo=timezone.utc) == now
+    # A source without dated postings has nothing to resume from.
+    assert ingest_db.get(IngestWatermark, "indeed") is None
+
+    # The next run asks for newer postings and drops what the adapter resends anyway.
+    bayt.postings = [old, {**new, "description": "Go and Kafka services."}]
+    asyncio.run(ingest_scheduler.ingest_once())
+    assert bayt.calls[-1] == now
+    assert indeed.calls[-1] is None
+    ingest_db.expire_all()
+    titles = ingest_db.scalars(select(Job.title).where(Job.description == "Go and Kafka services.")).all()
+    assert titles == ["Backend Engineer"]
+
+
+def test_ingest_source_failure_does_not_block_others(ingest_db, monkeypatch) -> None:
+    class BrokenAdapter(BaseAdapter):
+        source = "broken"
+
+        async def fetch(self, query: str = "", location: str = "Dubai", since: datetime | None = None):
+            raise RuntimeError("upstream down")
+
+    healthy = FeedAdapter("indeed", [_posting("indeed", "Nurse", "Patient care on night shifts.")])
+    monkeypatch.setattr(ingest_scheduler, "ADAPTERS", [BrokenAdapter(), healthy])
+
+    asyncio.run(ingest_scheduler.ingest_once())
+    assert ingest_db.scalar(select(func.count(Job.id))) == 1
+    assert len(job_index) == 1
+
+
+def test_pipeline_applies_backpressure_to_large_feeds(ingest_db, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "INGEST_CHUNK_SIZE", 10)
+    monkeypatch.setattr(settings, "INGEST_QUEUE_SIZE", 1)
+    monkeypatch.setattr(settings, "INGEST_BATCH_SIZE", 10)
+    progress = {"fetched": 0, "written": 0, "lead": 0}
+
+    class PagedAdapter(BaseAdapter):
+        source = "paged"
+
+        async def stream(self, query: str = "", location: str = "Dubai", since: datetime | None = None):
+            for page in range(50):
+                progress["fetched"] += 10
+                progress["lead"] = max(progress["lead"], progress["fetched"] - progress["written"])
+                yield [_posting("paged", f"Role {page}-{n}", f"Role {page} {n} duties") for n in range(10)]
+
+    write_batch = ingest_pipeline._write_batch
+
+    def slow_write(session_factory, batch):
+        time.sleep(0.005)
+        written = write_batch(session_factory, batch)
+        progress["written"] += written
+        return written
+
+    monkeypatch.setattr(ingest_pipeline, "_write_batch", slow_write)
+    monkeypatch.setattr(ingest_scheduler, "ADAPTERS", [PagedAdapter()])
+
+    asyncio.run(ingest_scheduler.ingest_once())
+    assert ingest_db.scalar(select(func.count(Job.id))) == 500
+    # The fetcher stays within the pipeline's bounded capacity (~one chunk per queue and stage) of the writer.
+    assert progress["lead"] <= 120
+    assert len(job_index) == 500
+
+
+def test_only_the_lease_holder_ingests_and_a_follower_takes_over(ingest_db, monkeypatch) -> None:
+    feed = FeedAdapter("bayt", [_posting("bayt", "Data Engineer")])
+    monkeypatch.setattr(ingest_scheduler, "ADAPTERS", [feed])
+    monkeypatch.setattr(ingest_scheduler, "_synced_until", None)
+
+    async def scenario() -> dict:
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        leader = LeaderLease(redis, ingest_scheduler.LEADER_KEY, ttl=1, token="replica-a")
+        follower = LeaderLease(redis, ingest_scheduler.LEADER_KEY, ttl=1, token="replica-b")
+
+        monkeypatch.setattr(ingest_scheduler, "_lease", leader)
+        assert await ingest_scheduler.poll_source("bayt")
+        monkeypatch.setattr(ingest_scheduler, "_lease", follower)
+        assert not await ingest_scheduler.poll_source("bayt")
+        assert len(feed.calls) == 1
+
+        # The follower serves what the leader wrote from its own index.
+        job_index.clear()
+        await ingest_scheduler.sync_index()
+        assert len(job_index) == 1
+
+        # The leader stops renewing; once its lease expires the follower takes over.
+        await asyncio.sleep(1.1)
+        assert await ingest_scheduler.poll_source("bayt")
+        assert len(feed.calls) == 2
+        assert not await leader.release()
+        return await ingest_scheduler.ingest_status(redis)
+
+    status = asyncio.run(scenario())
+    assert status["leader"] == "replica-b"
+    assert status["last_run"]["sources"]["bayt"]["leader"] == "replica-b"
+    # The new leader synced the filter as a follower, so the re-sent posting is not rewritten.
+    assert status["last_run"]["sources"]["bayt"]["written"] == 0
+    assert status["last_run"]["sources"]["bayt"]["last_error"] is None
+
+
+def test_leader_sync_indexes_rows_written_elsewhere_and_compacts(ingest_db, monkeypatch) -> None:
+    posted = datetime.now(tz=timezone.utc).replace(microsecond=0)
+    feed = FeedAdapter("bayt", [{**_posting("bayt", "Data Engineer"), "posted_date": posted}])
+    monkeypatch.setattr(ingest_scheduler, "ADAPTERS", [feed])
+    monkeypatch.setattr(ingest_scheduler, "_synced_until", None)
+    monkeypatch.setattr(ingest_scheduler, "_archived_until", None)
+    monkeypatch.setattr(settings, "JOB_INDEX_COMPACT_RATIO", 0.5)
+
+    async def scenario() -> None:
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        lease = LeaderLease(redis, ingest_scheduler.LEADER_KEY, ttl=5, token="a")
+        monkeypatch.setattr(ingest_scheduler, "_lease", lease)
+        await ingest_scheduler.sync_index()
+        assert await ingest_scheduler.poll_source("bayt")
+
+        # A bulk load on another worker adds a posting; the leader's own rows are read back unchanged.
+        upsert_jobs(ingest_db, [_posting("indeed", "Nurse", "Patient care on night shifts.")])
+        ingest_db.commit()
+        await ingest_scheduler.sync_index()
+        assert (len(job_index), job_index.tombstones) == (2, 0)
+
+        # Then rewrites both: the tombstones re-indexing leaves behind are compacted away.
+        nurse = _posting("indeed", "Nurse", "Patient care on day shifts.")
+        upsert_jobs(ingest_db, [{**feed.postings[0], "description": "Streaming pipelines on Kafka."}, nurse])
+        ingest_db.commit()
+        await ingest_scheduler.sync_index()
+
+    asyncio.run(scenario())
+    assert (len(job_index), job_index.tombstones) == (2, 0)
+    assert [doc["title"] for doc in job_index.iter_docs(job_index.search("kafka"))] == ["Data Engineer"]
+
+
+def test_poll_intervals_follow_each_source_change_rate(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "INGEST_INTERVAL_MINUTES", 10)
+    monkeypatch.setattr(settings, "INGEST_MIN_INTERVAL_MINUTES", 2)
+    monkeypatch.setattr(settings, "INGEST_MAX_INTERVAL_MINUTES", 120)
+    monkeypatch.setattr(settings, "INGEST_POLL_TARGET_NEW", 25)
+    policy = AdaptivePollPolicy()
+
+    assert policy.interval("busy") == 600
+    for _ in range(5):
+        busy = policy.observe("busy", 200)
+        quiet = policy.observe("quiet", 0)
+    assert busy == 120
+    assert quiet == 120 * 60
+    # Steady sources settle where a poll brings in about the target number of postings.
+    for _ in range(10):
+        steady = policy.observe("steady", 25)
+    assert steady == 600
+    # A failing source backs off instead of being retried at its busy rate.
+    assert policy.failed("busy") == 240
+    assert policy.snapshot("busy")["failures"] == 1
+
+
+def test_bloom_filter_has_no_false_negatives_and_round_trips(tmp_path) -> None:
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    members = [f"posting-{n}" for n in range(10_000)]
+    bloom.add_many(members)
+    assert bloom.might_contain_many(members).all()
+    false_positives = bloom.might_contain_many(f"other-{n}" for n in range(10_000)).mean()
+    assert false_positives < 0.02
+    assert bloom.stats()["bytes"] < 15_000
+
+    bloom.save(tmp_path / "seen.bloom", rows=3)
+    restored, meta = BloomFilter.load(tmp_path / "seen.bloom")
+    assert meta["rows"] == 3
+    assert restored.entries == 10_000
+    assert restored.might_contain_many(members).all()
+
+
+def test_seen_filter_skips_unchanged_postings_and_lookups_for_new_ones(ingest_db, monkeypatch) -> None:
+    feed = FeedAdapter("bayt", [_posting("bayt", f"Engineer {n}", f"Builds system {n}.") for n in range(20)])
+    monkeypatch.setattr(ingest_scheduler, "ADAPTERS", [feed])
+    lookups: list[str] = []
+
+    def _count_lookups(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT") and "row_hash" in statement:
+            lookups.append(statement)
+
+    event.listen(ingest_db.get_bind(), "before_cursor_execute", _count_lookups)
+    try:
+        # Nothing seen yet: every posting is written without a lookup.
+        assert asyncio.run(ingest_scheduler.ingest_once()) == {"bayt": 20}
+        assert lookups == []
+        # Re-sent postings hit the filter, are confirmed in one query per batch and skipped.
+        assert asyncio.run(ingest_scheduler.ingest_once()) == {"bayt": 0}
+        assert len(lookups) == 1
+        assert job_index.tombstones == 0
+        feed.postings[0] = {**feed.postings[0], "description": "Builds system 0 in Rust."}
+        assert asyncio.run(ingest_scheduler.ingest_once()) == {"bayt": 1}
+        assert (len(job_index), job_index.tombstones) == (20, 1)
+    finally:
+        event.remove(ingest_db.get_bind(), "before_cursor_execute", _count_lookups)
+    assert ingest_db.scalar(select(func.count(Job.id))) == 20
+
+    # A restart restores the saved filter, or rebuilds it when the table has moved on.
+    ingest_scheduler._save_seen()
+    seen_postings.reset()
+    assert seen_postings.restore(**jobs_snapshot(ingest_db))
+    assert seen_postings.stats()["entries"] > 0
+    ingest_db.execute(delete(Job).where(Job.title == "Engineer 1"))
+    ingest_db.commit()
+    seen_postings.reset()
+    assert not seen_postings.restore(**jobs_snapshot(ingest_db))
+    ingest_scheduler._rebuild_seen(ingest_db)
+    assert seen_postings.might_contain([row.row_hash for row in ingest_db.scalars(select(Job))]).all()
+
+
+def test_lifecycle_archives_stale_postings_and_compacts_the_index(ingest_db, monkeypatch) -> None:
+    now = datetime.now(tz=timezone.utc).replace(microsecond=0)
+    fresh = [{**_posting("bayt", f"Engineer {n}", f"Builds system {n}."), "posted_date": now} for n in range(3)]
+    old = {**_posting("bayt", "Archivist", "Keeps records."), "posted_date": now - timedelta(days=90)}
+
+    class ListingAdapter(FeedAdapter):
+        async def removed(self, apply_urls):
+            return {url for url in apply_urls if url == fresh[0]["apply_url"]}
+
+    feed = ListingAdapter("bayt", fresh + [old])
+    monkeypatch.setattr(ingest_scheduler, "ADAPTERS", [feed])
+    monkeypatch.setattr(settings, "JOB_ARCHIVE_BATCH_SIZE", 2)
+    # Postings already past the max age are not ingested at all.
+    asyncio.run(ingest_scheduler.ingest_once())
+    assert ingest_db.scalar(select(func.count(Job.id))) == 3
+    upsert_jobs(ingest_db, [old])
+    ingest_db.commit()
+    job_index.upsert(old)
+
+    session_factory = ingest_scheduler.SessionLocal
+    result = asyncio.run(run_lifecycle(session_factory, [feed], now=now))
+    assert (result.expired, result.removed) == (1, 1)
+    assert result.compacted == 2
+    ingest_db.expire_all()
+    assert sorted(ingest_db.scalars(select(Job.title))) == ["Engineer 1", "Engineer 2"]
+    archived = dict(ingest_db.execute(select(JobArchive.title, JobArchive.archive_reason)).all())
+    assert archived == {"Archivist": "expired", "Engineer 0": "removed"}
+    # The index holds only live postings, with no tombstones left behind.
+    assert len(job_index) == 2 and job_index.tombstones == 0
+    assert [doc["title"] for doc in job_index.iter_docs(job_index.search("system"))] == ["Engineer 1", "Engineer 2"]
+    assert len(job_deduplicator) == 2
+
+    # A follower that indexed the postings before they were archived drops them on its next sync.
+    job_index.clear()
+    job_deduplicator.clear()
+    monkeypatch.setattr(ingest_scheduler, "_synced_until", now - timedelta(days=1))
+    monkeypatch.setattr(ingest_scheduler, "_archived_until", now - timedelta(days=1))
+    job_index.upsert_many([fresh[0], old])
+    asyncio.run(ingest_scheduler.sync_index())
+    assert sorted(doc["title"] for doc in job_index.iter_docs(job_index.search(None))) == ["Engineer 1", "Engineer 2"]
+
+
+def test_bulk_ingest_endpoint_validates_lines_and_writes_batches(client, ingest_db, monkeypatch) -> None:
+    body = b"\n".join([b'{"source": "greenhouse"}'])
+    assert client.post("/jobs/ingest/bulk", content=body).status_code == 503
+
+    monkeypatch.setattr(settings, "INGEST_API_TOKEN", "crawler-secret")
+    monkeypatch.setattr(settings, "INGEST_CHUNK_SIZE", 2)
+    assert client.post("/jobs/ingest/bulk", content=body, headers={"Authorization": "Bearer nope"}).status_code == 401
+
+    old = (datetime.now(tz=timezone.utc) - timedelta(days=365)).isoformat()
+    lines = [
+        json.dumps(_posting("greenhouse", "Data Engineer")),
+        "{not json",
+        json.dumps({"source": "greenhouse", "company": "Acme"}),
+        "",
+        json.dumps({**_posting("greenhouse", "Archivist", "Keeps records."), "posted_date": old}),
+        json.dumps(_posting("lever", "Backend Engineer", "Go services.")),
+        json.dumps(_posting("lever", "Nurse", "Patient care on night shifts.")),
+    ]
+    response = client.post(
+        "/jobs/ingest/bulk",
+        content="\n".join(lines).encode(),
+        headers={"Authorization": "Bearer crawler-secret", "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert (payload["received"], payload["accepted"], payload["skipped"], payload["rejected"]) == (6, 3, 1, 2)
+    assert payload["written"] == 3
+    statuses = {result["line"]: result["status"] for result in payload["results"]}
+    assert statuses == {1: "accepted", 2: "rejected", 3: "rejected", 5: "skipped", 6: "accepted", 7: "accepted"}
+    assert payload["results"][2]["error"].startswith("title")
+    assert ingest_db.scalar(select(func.count(Job.id))) == 3
+    assert len(job_index) == 3
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import fakeredis.aioredis
+import httpx
+
+from app.services import jd_parser
+
+PAGE = (
+    "<html><body><nav>Jobs home</nav><div id='content'><h1>Data Engineer</h1><p>"
+    + "Build batch and streaming pipelines on Snowflake and Airflow. " * 5
+    + "</p></div></body></html>"
+)
+ETAG = '"v1"'
+
+
+def _server(requests: List[httpx.Request], *, send_etag: bool = True) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if send_etag and request.headers.get("If-None-Match") == ETAG:
+            return httpx.Response(304, headers={"ETag": ETAG})
+        headers = {"ETag": ETAG} if send_etag else {}
+        return httpx.Response(200, text=PAGE, headers=headers)
+
+    return httpx.MockTransport(handler)
+
+
+def _fetch_twice(transport: httpx.MockTransport) -> List[str]:
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def _run() -> List[str]:
+        texts = []
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(2):
+                texts.append(await jd_parser.fetch_and_parse_jd("https://jobs.example.com/1", client=client, redis=redis))
+        return texts
+
+    return asyncio.run(_run())
+
+
+def test_unchanged_page_is_not_parsed_again(monkeypatch) -> None:
+    parsed: List[str] = []
+    extract = jd_parser.extract_jd_text
+    monkeypatch.setattr(jd_parser, "extract_jd_text", lambda html: parsed.append(html) or extract(html))
+
+    requests: List[httpx.Request] = []
+    first, second = _fetch_twice(_server(requests))
+    assert first == second
+    assert first.startswith("Data Engineer\nBuild batch")
+    assert "Jobs home" not in first
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == ETAG
+    assert len(parsed) == 1
+
+    # Without validators the page is downloaded again, but an identical body is still not re-parsed.
+    parsed.clear()
+    requests.clear()
+    first, second = _fetch_twice(_server(requests, send_etag=False))
+    assert first == second
+    assert "If-None-Match" not in requests[1].headers
+    assert len(parsed) == 1
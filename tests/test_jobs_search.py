@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.api import routes_jobs
+from app.models import Application, ApplicationStatus, User
+from app.services.ingest.dedupe import job_deduplicator
+from app.services.search import JobIndex, job_index
+from app.services.search.autocomplete import Autocomplete
+from app.services.search.ranking import rank_jobs
+from app.services.search.recommend import recommend_jobs
+from app.services.search.state_map import user_state_cache
+
+INDEX_IS_FED = routes_jobs._index_is_fed
+
+
+@pytest.fixture(autouse=True)
+def clean_index(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    # Search as if ingest kept the index filled; a cold index still fans out to the adapters.
+    monkeypatch.setattr(routes_jobs, "_index_is_fed", lambda: bool(job_index))
+    job_index.clear()
+    job_deduplicator.clear()
+    user_state_cache.clear()
+    yield
+    job_index.clear()
+    job_deduplicator.clear()
+    user_state_cache.clear()
+
+
+def _auth_headers(client: TestClient, create_user, email: str) -> dict[str, str]:
+    password = "StrongPass!123"
+    create_user(email=email, password=password)
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _posting(title: str, company: str, description: str = "", **extra) -> dict:
+    return {
+        "title": title,
+        "company": company,
+        "description": description,
+        "apply_url": f"https://jobs.example.com/{title.replace(' ', '-').lower()}-{company.lower()}",
+        "source": "test",
+        **extra,
+    }
+
+
+def test_index_intersects_posting_lists() -> None:
+    index = JobIndex()
+    index.upsert(_posting("Data Engineer", "Acme", "Python, SQL and Airflow"))
+    index.upsert(_posting("Data Analyst", "Acme", "SQL and Tableau"))
+    index.upsert(_posting("مهندس بيانات", "Globex", "Python"))
+
+    assert [index.get(i)["title"] for i in index.search("sql data")] == ["Data Engineer", "Data Analyst"]
+    assert [index.get(i)["title"] for i in index.search("python engineer")] == ["Data Engineer"]
+    assert [index.get(i)["company"] for i in index.search("بيانات")] == ["Globex"]
+    assert index.search("kotlin") == []
+
+
+def test_index_upsert_replaces_previous_document() -> None:
+    index = JobIndex()
+    index.upsert(_posting("Data Engineer", "Acme", "Spark"))
+    index.upsert(_posting("Data Engineer", "Acme", "Snowflake"))
+
+    assert len(index) == 1
+    assert index.search("spark") == []
+    assert len(index.search("snowflake")) == 1
+
+
+def test_index_upsert_of_identical_posting_is_a_no_op() -> None:
+    index = JobIndex()
+    posting = _posting("Data Engineer", "Acme", "Spark")
+    doc_id = index.upsert(posting)
+
+    assert index.upsert(dict(posting)) == doc_id
+    assert index.upsert_many([posting]) == [doc_id]
+    assert (len(index), index.tombstones) == (1, 0)
+    assert index.upsert({**posting, "description": "Snowflake"}) != doc_id
+    assert index.tombstones == 1
+
+
+def test_index_applies_facet_and_range_filters() -> None:
+    index = JobIndex()
+    now = datetime.now(tz=timezone.utc)
+    index.upsert(
+        _posting("Data Engineer", "Acme", industry="Tech", work_mode="Remote", salary_low=10000, salary_high=15000, posted_date=now)
+    )
+    index.upsert(
+        _posting(
+            "Data Analyst",
+            "Acme",
+            industry="Tech",
+            work_mode="Onsite",
+            salary_low=20000,
+            salary_high=30000,
+            posted_date=now - timedelta(days=20),
+        )
+    )
+    index.upsert(
+        _posting("Data Scientist", "Umbrella", industry="Health", work_mode="Remote", salary_low=25000, posted_date=now)
+    )
+
+    result = index.query("data", {"industry": "tech"})
+    assert [index.get(i)["title"] for i in result.ids] == ["Data Engineer", "Data Analyst"]
+    # Counts for a facet ignore that facet's own filter.
+    assert result.facets["industry"] == {"Tech": 2, "Health": 1}
+    assert result.facets["work_mode"] == {"Onsite": 1, "Remote": 1}
+
+    result = index.query(None, {"salary_min": 20000, "posted_within_days": 7})
+    assert [index.get(i)["title"] for i in result.ids] == ["Data Scientist"]
+
+    result = index.query(None, {"salary_max": 12000})
+    assert [index.get(i)["title"] for i in result.ids] == ["Data Engineer"]
+
+
+def test_ranking_combines_bm25_skills_and_freshness() -> None:
+    index = JobIndex()
+    now = datetime.now(tz=timezone.utc)
+    old = now - timedelta(days=60)
+    mention = index.upsert(_posting("Analyst", "Acme", "Some python scripting", posted_date=old))
+    title = index.upsert(_posting("Python Developer", "Acme", "Python services", posted_date=old))
+    skills = index.upsert(_posting("Developer", "Globex", "python with snowflake and dbt", posted_date=old))
+    fresh = index.upsert(_posting("Developer", "Initech", "python", posted_date=now))
+
+    ranked = rank_jobs(index, [mention, title, skills], query="python")
+    assert ranked[0][0] == title
+
+    ranked = rank_jobs(index, [mention, skills], query=None, skills=["Snowflake", "DBT"])
+    assert [doc_id for doc_id, _ in ranked] == [skills, mention]
+
+    ranked = rank_jobs(index, [skills, fresh], query=None)
+    assert [doc_id for doc_id, _ in ranked] == [fresh, skills]
+
+
+def test_reindexing_postings_keeps_bm25_ranking() -> None:
+    index = JobIndex()
+    postings = [
+        _posting("Python Developer", "Acme", "Python services and python tooling"),
+        _posting("Backend Engineer", "Globex", "Python and Go"),
+        _posting("Data Analyst", "Initech", "SQL, some python"),
+        _posting("Frontend Engineer", "Hooli", "React"),
+        _posting("SRE", "Umbrella", "Kubernetes and Terraform"),
+    ]
+
+    def _ranked() -> list[tuple[str, float]]:
+        ids = index.query("python").ids
+        return [(index.get(doc_id)["title"], score) for doc_id, score in rank_jobs(index, ids, query="python")]
+
+    index.upsert_many(postings)
+    before = _ranked()
+    assert before[0][0] == "Python Developer" and all(score > 0 for _, score in before)
+    # Every ingest poll re-upserts what it fetched; tombstoned slots must not count towards df or avgdl.
+    for _ in range(3):
+        index.upsert_many([{**posting, "description": posting["description"] + " "} for posting in postings])
+    assert _ranked() == before
+
+
+def test_recommendations_score_skills_against_job_vectors() -> None:
+    index = JobIndex()
+    warehouse = index.upsert(_posting("Data Engineer", "Acme", "Snowflake, dbt and Python pipelines"))
+    reporting = index.upsert(_posting("BI Analyst", "Acme", "Power BI dashboards on SQL"))
+    index.upsert(_posting("Nurse", "Clinic", "Patient care"))
+    retired = index.upsert(_posting("Snowflake Admin", "Globex", "Snowflake"))
+    index.remove(f"test::{index.get(retired)['apply_url']}")
+
+    matches = {match.doc_id: match for match in recommend_jobs(index, ["Snowflake", "Python", "Power BI"], limit=5)}
+    assert set(matches) == {warehouse, reporting}
+    assert {skill.skill for skill in matches[warehouse].matched} == {"Snowflake", "Python"}
+    assert matches[warehouse].missing == ["Power BI"]
+    assert [skill.skill for skill in matches[reporting].matched] == ["Power BI"]
+    assert recommend_jobs(index, ["Snowflake", "Python", "Power BI"], limit=1)[0].doc_id in matches
+    assert recommend_jobs(index, ["Kotlin"], limit=5) == []
+
+
+def test_recommendations_endpoint_uses_resume_text(client: TestClient, create_user) -> None:
+    headers = _auth_headers(client, create_user, "recommend@example.com")
+    job_index.upsert_many(
+        [
+            _posting("Data Engineer", "Acme", "Spark and Databricks lakehouse"),
+            _posting("Frontend Engineer", "Initech", "React"),
+        ]
+    )
+
+    response = client.post(
+        "/jobs/recommendations",
+        json={"resume_text": "Built Spark jobs on Databricks.", "limit": 3},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["job"]["title"] for item in body] == ["Data Engineer"]
+    assert {skill["skill"] for skill in body[0]["matched_skills"]} >= {"Spark", "Databricks"}
+
+
+def test_autocomplete_ranks_prefix_matches_by_frequency() -> None:
+    index = JobIndex()
+    index.upsert(_posting("Data Engineer", "Acme", "Python and SQL"))
+    index.upsert(_posting("Data Engineer", "Globex", "Python"))
+    index.upsert(_posting("Data Analyst", "Datadog", "SQL"))
+    index.upsert(_posting("مهندس بيانات", "أرامكو", "Python"))
+
+    suggestions = index.suggestions.suggest("data", limit=3)
+    assert [(s.text, s.kind, s.count) for s in suggestions] == [
+        ("Data Engineer", "title", 2),
+        ("Data Analyst", "title", 1),
+        ("Datadog", "company", 1),
+    ]
+    assert [s.text for s in index.suggestions.suggest("eng")] == ["Data Engineer"]
+    assert [s.text for s in index.suggestions.suggest("py", kinds=["skill"])] == ["Python"]
+    # Hamza and diacritics are folded, so a plain-alef prefix still matches.
+    assert [s.text for s in index.suggestions.suggest("ارام")] == ["أرامكو"]
+    assert [s.text for s in index.suggestions.suggest("بيان")] == ["مهندس بيانات"]
+
+    index.remove(f"test::{_posting('Data Analyst', 'Datadog')['apply_url']}")
+    assert [s.text for s in index.suggestions.suggest("data")] == ["Data Engineer"]
+
+
+def test_autocomplete_reads_compiled_snapshot_without_copying() -> None:
+    suggestions = Autocomplete()
+    suggestions.add(_posting("Data Engineer", "Acme"))
+    # New phrases are published by compile, not sorted in on a reader's keystroke.
+    assert suggestions.suggest("data") == []
+    suggestions.compile()
+    snapshot = suggestions._snapshot
+    assert [(s.text, s.count) for s in suggestions.suggest("data")] == [("Data Engineer", 1)]
+
+    # Counts of known phrases change in place; the snapshot is only replaced for new phrases.
+    suggestions.add(_posting("Data Engineer", "Acme"))
+    suggestions.compile()
+    assert suggestions._snapshot is snapshot
+    assert [s.count for s in suggestions.suggest("data")] == [2]
+    suggestions.remove(_posting("Data Engineer", "Acme"))
+    suggestions.remove(_posting("Data Engineer", "Acme"))
+    assert suggestions.suggest("data") == []
+
+
+def test_autocomplete_endpoint(client: TestClient, create_user) -> None:
+    headers = _auth_headers(client, create_user, "autocomplete@example.com")
+    job_index.upsert_many([_posting("Backend Engineer", "Initech", "Kafka"), _posting("Backend Lead", "Initech")])
+
+    response = client.get("/jobs/autocomplete", params={"q": "back", "limit": 1}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == [{"text": "Backend Engineer", "kind": "title", "count": 1}]
+
+    response = client.get("/jobs/autocomplete", params={"q": "init", "kind": "location"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_search_is_served_from_index(client: TestClient, create_user) -> None:
+    headers = _auth_headers(client, create_user, "search-index@example.com")
+    job_index.upsert_many(
+        [
+            _posting("Backend Engineer", "Initech", "FastAPI and Postgres", location="Dubai"),
+            _posting("Frontend Engineer", "Initech", "React", location="Riyadh"),
+        ]
+    )
+
+    response = client.post("/jobs/search", json={"q": "engineer", "location": "dubai"}, headers=headers)
+    assert response.status_code == 200
+    titles = [job["title"] for job in response.json()["items"]]
+    assert titles == ["Backend Engineer"]
+    assert response.json()["total"] == 1
+
+
+def test_search_seeds_cold_index_from_adapters(client: TestClient, create_user) -> None:
+    headers = _auth_headers(client, create_user, "search-cold@example.com")
+
+    response = client.post("/jobs/search", json={}, headers=headers)
+    assert response.status_code == 200
+    assert [job["source"] for job in response.json()["items"]] == ["mock"]
+    assert len(job_index) == 1
+
+
+def test_search_fans_out_per_query_until_ingest_fills_the_index(
+    client: TestClient, create_user, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class QueryAdapter:
+        source = "feed"
+
+        async def fetch(self, query: str = "", location: str = "Dubai"):
+            return [_posting(f"{query.title()} Specialist", "Acme", f"{query} work", source=self.source)]
+
+    monkeypatch.setattr(routes_jobs, "ADAPTERS", [QueryAdapter()])
+    # The ingest scheduler is off by default.
+    monkeypatch.setattr(routes_jobs, "_index_is_fed", INDEX_IS_FED)
+    headers = _auth_headers(client, create_user, "search-per-query@example.com")
+
+    for query in ("python", "nurse"):
+        response = client.post("/jobs/search", json={"q": query}, headers=headers)
+        assert [job["title"] for job in response.json()["items"]] == [f"{query.title()} Specialist"]
+    assert len(job_index) == 2
+
+
+def test_search_paginates_with_cursor(client: TestClient, create_user) -> None:
+    headers = _auth_headers(client, create_user, "search-pages@example.com")
+    job_index.upsert_many(_posting(f"Engineer {n}", "Initech") for n in range(5))
+
+    first = client.post("/jobs/search?limit=2", json={}, headers=headers).json()
+    assert [job["title"] for job in first["items"]] == ["Engineer 0", "Engineer 1"]
+    assert first["total"] == 5
+
+    second = client.post(f"/jobs/search?limit=2&cursor={first['next_cursor']}", json={}, headers=headers).json()
+    assert [job["title"] for job in second["items"]] == ["Engineer 2", "Engineer 3"]
+
+    last = client.post(f"/jobs/search?limit=2&cursor={second['next_cursor']}", json={}, headers=headers).json()
+    assert [job["title"] for job in last["items"]] == ["Engineer 4"]
+    assert last["next_cursor"] is None
+
+    bad = client.post("/jobs/search?cursor=not-a-cursor", json={}, headers=headers)
+    assert bad.status_code == 400
+
+
+def test_cursor_survives_reindexing_and_compaction(client: TestClient, create_user) -> None:
+    headers = _auth_headers(client, create_user, "search-pages-stable@example.com")
+    postings = [_posting(f"Engineer {n}", "Initech") for n in range(5)]
+    job_index.upsert_many(postings)
+
+    first = client.post("/jobs/search?limit=2", json={}, headers=headers).json()
+    assert [job["title"] for job in first["items"]] == ["Engineer 0", "Engineer 1"]
+
+    # The last posting served and an earlier one change, then compaction renumbers every document.
+    job_index.upsert({**postings[1], "description": "Now remote."})
+    job_index.upsert({**postings[0], "description": "Now hybrid."})
+    assert job_index.compact() == 2
+
+    second = client.post(f"/jobs/search?limit=2&cursor={first['next_cursor']}", json={}, headers=headers).json()
+    assert [job["title"] for job in second["items"]] == ["Engineer 2", "Engineer 3"]
+    last = client.post(f"/jobs/search?limit=2&cursor={second['next_cursor']}", json={}, headers=headers).json()
+    assert [job["title"] for job in last["items"]] == ["Engineer 4"]
+
+
+def test_limited_stream_ends_with_next_cursor(client: TestClient, create_user) -> None:
+    headers = _auth_headers(client, create_user, "search-stream-pages@example.com")
+    headers["Accept"] = "application/x-ndjson"
+    job_index.upsert_many(_posting(f"Engineer {n}", "Initech") for n in range(3))
+
+    response = client.post("/jobs/search?limit=2", json={}, headers=headers)
+    *jobs, trailer = [json.loads(line) for line in response.text.splitlines()]
+    assert [job["title"] for job in jobs] == ["Engineer 0", "Engineer 1"]
+
+    response = client.post(f"/jobs/search?limit=2&cursor={trailer['next_cursor']}", json={}, headers=headers)
+    assert [json.loads(line)["title"] for line in response.text.splitlines()] == ["Engineer 2"]
+
+
+def test_search_streams_ndjson(client: TestClient, create_user) -> None:
+    headers = _auth_headers(client, create_user, "search-stream@example.com")
+    headers["Accept"] = "application/x-ndjson"
+    job_index.upsert_many(_posting(f"Engineer {n}", "Initech") for n in range(3))
+
+    response = client.post("/jobs/search", json={"q": "engineer"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [job["title"] for job in lines] == ["Engineer 0", "Engineer 1", "Engineer 2"]
+
+
+def test_resumed_stream_on_cold_index_starts_after_cursor(client: TestClient, create_user) -> None:
+    headers = _auth_headers(client, create_user, "search-stream-cold@example.com")
+    headers["Accept"] = "application/x-ndjson"
+
+    past_everything = routes_jobs._encode_cursor(10**9, -1e9)
+    response = client.post(f"/jobs/search?cursor={past_everything}", json={}, headers=headers)
+    assert response.status_code == 200
+    assert response.text == ""
+    assert len(job_index) == 1
+
+    job_index.clear()
+    before_everything = routes_jobs._encode_cursor(-1, 1e9)
+    response = client.post(f"/jobs/search?cursor={before_everything}", json={}, headers=headers)
+    assert [json.loads(line)["source"] for line in response.text.splitlines()] == ["mock"]
+
+
+def test_search_marks_saved_and_applied_jobs(client: TestClient, create_user, db_session) -> None:
+    headers = _auth_headers(client, create_user, "search-state@example.com")
+    user = db_session.scalar(select(User).where(User.email == "search-state@example.com"))
+    job_index.upsert_many([_posting("Data Engineer", "Acme"), _posting("Data Analyst", "Acme")])
+
+    draft = Application(user_id=user.id, title="Data Engineer", company="Acme", status=ApplicationStatus.draft)
+    db_session.add(draft)
+    db_session.commit()
+
+    def _states() -> dict[str, str]:
+        items = client.post("/jobs/search", json={"q": "data"}, headers=headers).json()["items"]
+        return {job["title"]: job["state"] for job in items}
+
+    assert _states() == {"Data Engineer": "saved", "Data Analyst": "recommended"}
+
+    draft.status = ApplicationStatus.applied
+    db_session.add(Application(user_id=user.id, title="data analyst ", company="ACME"))
+    db_session.commit()
+    assert _states() == {"Data Engineer": "applied", "Data Analyst": "saved"}
+
+    db_session.delete(draft)
+    db_session.commit()
+    assert _states() == {"Data Engineer": "recommended", "Data Analyst": "saved"}